@@ -28,7 +28,7 @@
 # =====================================================
 import numpy as np
 from scipy import integrate
-from pymeigo import *
+from ess import ess
 import sys
 sys.path.insert(0, 'src')
 
@@ -38,6 +38,7 @@ sys.path.insert(0, 'src')
 # Import differential equations model------------------
 # Import parameters
 from equations import eqs
+from jacobian import jac
 from plotSim import plotSimulation
 from readData import *
 
@@ -104,7 +105,7 @@ initial_cond = [0.185,  # cdhap
 t = np.arange(-50, 0, 0.1)
 
 # integrate
-ds = integrate.odeint(eqs, initial_cond, t, args = (initialPar,))
+ds = integrate.odeint(eqs, initial_cond, t, args = (initialPar,), Dfun=jac)
 
 # plot the simulated time-courses of the different metabolites
 plotSimulation(ds, t)
@@ -170,7 +171,7 @@ plotSimulation(ds, t, experimentalData = experimentData)
 # 
 # **Meigo** is a global optimization toolbox (see [Egea et al, 2013](http://bmcbioinformatics.biomedcentral.com/articles/10.1186/1471-2105-15-136)). It has been specifically designed to solve global optimization problems in biology and bioinformatics. It offers different methods that can be used for parameter estimation. One of them (the one that will be used here) is called **enhanced Scatter Search (eSS)**. You can find more about the eSS algorithm [here](http://pubs.acs.org/doi/abs/10.1021/ie801717t).
 # 
-# Meigo runs in R, but it offers a Python interface called **PyMeigo**. 
+# Meigo runs in R, but it offers a Python interface called **PyMeigo**. Here we use **`ess`**, a Python implementation of the same eSS algorithm (file **`ess.py`**), so that the objective function does not need to be called from R.
 # 
 # -----
 # 
@@ -208,8 +209,8 @@ plotSimulation(ds, t, experimentalData = experimentData)
 
 # In[ ]:
 
-# Import the master function
-from objectiveFun import objFun  
+# Import the master function, and its version for many parameter sets at once
+from objectiveFun import objFun, objFun_batch
 
 
 # Run the optimization with PyMeigo. First, define the upper and lower bounds for the parameters to optimize. Here, the bounds defined are not far from the original values (as they are already pretty optimized), to make the search faster. In real cases, a good choice without prior knowledge would be to multiply the initial values by 0.1 for the lower bound and by 10 for the upper bound.
@@ -220,11 +221,10 @@ from objectiveFun import objFun
 upperBound = [x*1.5 for x in initialPar]
 lowerBound = [x*0.75 for x in initialPar]
 
-# Now, convert the master function to R so that Meigo can run
-objfun_for_r=pyfunc2R(objFun)
-
-# Run PyMeigo. It requires only the objective function, and the upper and lower bounds for the parameters to optimize
-result_pymeigo = essR(f=objfun_for_r, x_U=upperBound, x_L=lowerBound)
+# Run eSS. It requires the objective function, and the upper and lower bounds for the parameters to optimize. As in
+# the original MEIGO call, the search is limited to 1000 evaluations or 60 seconds, and the candidates of every
+# iteration are evaluated in parallel with objFun_batch
+result_ess = ess(f=objFun, x_U=upperBound, x_L=lowerBound, maxEval=1000, maxTime=60, fBatch=objFun_batch)
 
 
 # ### Exercise 2.4. Extract the new set of parameters obtained with either solver and plot the time courses of the 9 metabolites. Add the experimental data points and evaluate the simulations.
@@ -233,8 +233,8 @@ result_pymeigo = essR(f=objfun_for_r, x_U=upperBound, x_L=lowerBound)
 
 # In[ ]:
 
-# First, we extract the results of PyMeigo as a list
-newPar = list(result_pymeigo.xbest)
+# First, we extract the results of eSS as a list
+newPar = list(result_ess.xbest)
 
 # Run the simulation of the perturbation, as in exercise 2.2, from t0=0 to t=350s, with the same initial conditions
 # (including the glucose pulse)
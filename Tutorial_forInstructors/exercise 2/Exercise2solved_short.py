@@ -28,7 +28,7 @@
 # =====================================================
 import numpy as np
 from scipy import integrate
-from pymeigo import *
+from ess import ess
 import sys
 sys.path.insert(0, 'src')
 
@@ -38,6 +38,7 @@ sys.path.insert(0, 'src')
 # Import differential equations model------------------
 # Import parameters
 from equations import eqs
+from jacobian import jac
 from plotSim import plotSimulation
 from readData import *
 
@@ -104,7 +105,7 @@ initial_cond = [0.185,  # cdhap
 t = np.arange(-50, 0, 0.1)
 
 # integrate
-ds = integrate.odeint(eqs, initial_cond, t, args = (initialPar,))
+ds = integrate.odeint(eqs, initial_cond, t, args = (initialPar,), Dfun=jac)
 
 # plot the simulated time-courses of the different metabolites
 plotSimulation(ds, t)
@@ -0,0 +1,137 @@
+#!/usr/bin/python
+########################################################
+# cofactorTable.py
+# Author: Veronica Llorens-Rico
+# Version: 1.2
+# Date: October 2026
+# Description: Tabulated profiles of the cofactors (ATP,
+#   ADP, AMP, NAD(P)(H)) after the glucose pulse, built
+#   once from the analytical expressions or from
+#   measured data, and read in constant time
+# Reference: Chassagnole et al, 2002
+########################################################
+import math
+import warnings
+
+import numpy as np
+from scipy import interpolate
+
+from equations import COFACTORS, pulseCofactors
+
+
+# COFACTOR TABLE
+# =======================================================
+class CofactorTable(object):
+    """
+    Cofactor concentrations after the pulse as cubic splines on a grid of times that is uniform in sqrt(t): the
+    profiles change fast right after the pulse and slowly later (and some terms, such as t ** 1.58, are only smooth
+    in sqrt(t)), so a thousand intervals are enough for the whole tutorial. The interval of a time is found with a
+    square root and a division instead of a search, and only one cubic per cofactor is evaluated. The table is passed
+    to equations.setCofactorProfile to drive the rate laws with other profiles, e.g. measured ones (fromData),
+    without touching them. It is not a speedup: in CPython a lookup costs about as much as the analytical
+    expressions, which remain the default. Beyond the last time of the grid, the concentrations are given by the
+    function beyond if there is one; otherwise the values at that time are kept, with a warning the first time
+    """
+
+    def __init__(self, profile, tEnd, intervals=1000, beyond=None):
+        """
+        :param profile: function of an array of times returning the seven cofactor concentrations (in the order of
+        equations.COFACTORS) at those times
+        :param tEnd: last time of the table
+        :param intervals: number of intervals of the grid
+        :param beyond: function with the same arguments and results as profile, used after tEnd (e.g. the analytical
+        expressions that were tabulated). None to keep the values at tEnd
+        """
+        self.beyond = beyond
+        self._warned = False
+        self.tEnd = float(tEnd)
+        # step of the grid in sqrt(t)
+        self.du = np.sqrt(self.tEnd) / intervals
+        self.times = (self.du * np.arange(intervals + 1)) ** 2
+        self.times[-1] = self.tEnd
+        values = np.array(profile(self.times), dtype=float)
+
+        # coefficients of the cubic of every interval, from the highest power: shape (4, 7, intervals)
+        spline = interpolate.CubicSpline(self.times, values, axis=1)
+        self.coefficients = np.ascontiguousarray(np.transpose(spline.c, (0, 2, 1)))
+        self._last = intervals - 1
+
+        # the interpolation error is largest between the nodes: check it at the middle of every interval
+        middle = (self.times[:-1] + self.times[1:]) / 2.0
+        error = np.abs(self.evaluate(middle) - np.array(profile(middle), dtype=float))
+        self.maxError = dict(zip(COFACTORS, np.max(error, axis=1)))
+
+    @classmethod
+    def fromData(cls, times, values, intervals=1000):
+        """
+        Builds a table from measured cofactor profiles
+        :param times: times of the measurements, starting at the pulse (t=0)
+        :param values: array of shape (7, len(times)), rows in the order of equations.COFACTORS
+        :param intervals: number of intervals of the grid
+        :return: CofactorTable; maxError is the deviation from the cubic spline through the measurements
+        """
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if values.shape != (len(COFACTORS), len(times)):
+            raise ValueError('values must have shape ({0}, {1}), got {2}'.format(len(COFACTORS), len(times),
+                                                                               values.shape))
+        if times[0] > 0.0:
+            raise ValueError('the measurements must start at the pulse, t=0')
+        return cls(interpolate.CubicSpline(times, values, axis=1), times[-1], intervals)
+
+    def _outside(self, t):
+        # a time beyond the table without a function to continue it: the values at tEnd are kept, with a warning
+        if not self._warned:
+            self._warned = True
+            warnings.warn('the cofactor table ends at t={0}, the values there are kept up to t={1}'.format(
+                self.tEnd, t), RuntimeWarning)
+
+    def evaluate(self, times):
+        """
+        Cofactor concentrations at many times at once
+        :param times: array of times after the pulse
+        :return: array of shape (7, len(times)), rows in the order of equations.COFACTORS
+        """
+        times = np.asarray(times, dtype=float)
+        clipped = np.clip(times, 0.0, self.tEnd)
+        i = np.minimum((np.sqrt(clipped) / self.du).astype(int), self._last)
+        d = clipped - self.times[i]
+        c = self.coefficients[:, :, i]
+        values = ((c[0] * d + c[1]) * d + c[2]) * d + c[3]
+        outside = times > self.tEnd
+        if np.any(outside):
+            if self.beyond is None:
+                self._outside(np.max(times))
+            else:
+                values[:, outside] = np.array(self.beyond(times[outside]), dtype=float)
+        return values
+
+    def __call__(self, t):
+        """
+        :param t: time after the pulse, or array of times
+        :return: cadp, camp, catp, cnad, cnadh, cnadp, cnadph
+        """
+        if not isinstance(t, (int, float)):
+            return tuple(self.evaluate(np.ravel(t)).reshape((len(COFACTORS),) + np.shape(t)))
+        if t > self.tEnd:
+            if self.beyond is not None:
+                return list(self.beyond(t))
+            self._outside(t)
+            t = self.tEnd
+        i = min(int(math.sqrt(t) / self.du), self._last)
+        c = self.coefficients[:, :, i]
+        d = t - self.times[i]
+        return (((c[0] * d + c[1]) * d + c[2]) * d + c[3]).tolist()
+    # =======================================================
+
+
+def pulseTable(tEnd=1000.0, intervals=1000):
+    """
+    Tabulates the analytical expressions of equations.pulseCofactors (maximum error about 1e-6 with the defaults).
+    After tEnd they are evaluated directly, so the results stay right; the default covers the longest simulation of
+    the tutorial (t=1000 in exercise 3), and should be raised with it
+    :param tEnd: last time of the table
+    :param intervals: number of intervals of the grid
+    :return: CofactorTable
+    """
+    return CofactorTable(pulseCofactors, tEnd, intervals, beyond=pulseCofactors)
@@ -0,0 +1,194 @@
+#!/usr/bin/python
+########################################################
+# ensemble.py
+# Author: Veronica Llorens-Rico
+# Version: 1.1
+# Date: October 2026
+# Description: Integrates the model for many parameter
+#   sets at once (e.g. samples around parameters.txt for
+#   uncertainty propagation), advancing all of them
+#   together with vectorized NumPy operations
+# Reference: Chassagnole et al, 2002
+# Reference: Shampine and Reichelt, 1997
+########################################################
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from equations import SPECIES, eqs_batch
+from jacobian import jac_batch
+
+
+EnsembleResult = namedtuple('EnsembleResult', ['t', 'y', 'stats'])
+
+# first time after the pulse: the cofactors follow their post-pulse expressions for any t > 0
+_AFTER_PULSE = np.nextafter(0.0, 1.0)
+
+
+def _factor(W):
+    # one LU factorization of every stacked matrix W[i] (LAPACK getrf, inside np.linalg.inv), shared by the three
+    # stages of the step. A handwritten batched LU with the loops in NumPy is slower than LAPACK for 18 x 18 matrices
+    return np.linalg.inv(W)
+
+
+def _solve(factors, b):
+    # stacked linear systems W[i] x[i] = b[i], from the factors of _factor
+    return np.matmul(factors, b[:, :, np.newaxis])[:, :, 0]
+
+
+# ENSEMBLE INTEGRATOR
+# =======================================================
+def integrate_ensemble(par, y0, times, rhs=eqs_batch, jacobian=jac_batch, rtol=1e-5, atol=1e-8, first_step=None,
+                       max_step=np.inf, max_steps=100000):
+    """
+    Integrates N copies of the model in lockstep with the Rosenbrock method of simulation.rosenbrock (order 2, error
+    estimate of order 3). Every member has its own time and step size, controlled by its own error, but all the
+    members that are still running are advanced by the same vectorized operations: one call of rhs and of jacobian
+    for the whole block, and one factorization of the stacked matrices I - h d J per step, reused by the three
+    stages. Members that finish or fail are masked out of the following steps
+    :param par: parameters, array of shape (N, 116) or a single parameter set shared by all the members
+    :param y0: initial conditions, array of shape (N, 18) or a single state shared by all the members
+    :param times: increasing times at which the states are reported, shared by all the members
+    :param rhs: batched right hand side, with the arguments of equations.eqs_batch (the time may be an array)
+    :param jacobian: batched Jacobian of rhs, with the same arguments, returning an array of shape (N, 18, 18)
+    :param rtol: relative tolerance. With the default tolerances, the trajectories after the glucose pulse stay within
+    about 0.1% of a reference solution; the method is of low order, so much tighter tolerances cost many steps
+    :param atol: absolute tolerance
+    :param first_step: initial step (default 1e-3 times the length of the integration)
+    :param max_step: maximum step
+    :param max_steps: maximum number of accepted steps of every member
+    :return: EnsembleResult(t, y, stats): the times, the states as an array of shape (N, len(times), 18) (NaN
+    after a failure) and a dictionary with the accepted and rejected steps and the success of every member,
+    the number of batched calls of rhs and jacobian and the wall time
+    """
+    start = time.time()
+    par = np.asarray(par, dtype=float)
+    times = np.asarray(times, dtype=float)
+    n = par.shape[0] if par.ndim == 2 else np.atleast_2d(y0).shape[0]
+    Y = np.array(np.broadcast_to(np.asarray(y0, dtype=float), (n, len(SPECIES))))
+    nt = len(times)
+    tEnd = times[-1]
+    d = 1.0 / (2.0 + np.sqrt(2.0))
+    e32 = 6.0 + np.sqrt(2.0)
+    identity = np.eye(Y.shape[1])
+    calls = {'rhs': 0, 'jacobian': 0}
+
+    def f(y, t, p):
+        calls['rhs'] += 1
+        return rhs(y, t, p)
+
+    out = np.full((n, nt, Y.shape[1]), np.nan)
+    out[:, 0] = Y
+    t = np.full(n, times[0])
+    h = np.full(n, first_step if first_step is not None else min(max_step, 1e-3 * max(tEnd - times[0], 1.0)))
+    k = np.ones(n, dtype=int)
+    steps = np.zeros(n, dtype=int)
+    rejected = np.zeros(n, dtype=int)
+    failed = np.zeros(n, dtype=bool)
+
+    # stages that leave the positive concentrations give NaN rates: the step is then rejected and shortened
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        F = f(Y, t, par)
+        failed |= ~np.all(np.isfinite(F), axis=1)
+
+        while True:
+            active = np.where((t < tEnd) & ~failed)[0]
+            if not len(active):
+                break
+            tA, yA, FA = t[active], Y[active], F[active]
+            pA = par[active] if par.ndim == 2 else par
+            hA = np.minimum(np.minimum(h[active], max_step), tEnd - tA)
+
+            J = jacobian(yA, tA, pA)
+            calls['jacobian'] += 1
+            # the model depends on time through the cofactors
+            delta = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(tA), 1.0)
+            T = (f(yA, tA + delta, pA) - FA) / delta[:, np.newaxis]
+
+            hd = (hA * d)[:, np.newaxis]
+            W = identity - hd[:, :, np.newaxis] * J
+            tNew = np.where(hA >= tEnd - tA, tEnd, tA + hA)
+            try:
+                factors = _factor(W)
+                k1 = _solve(factors, FA + hd * T)
+                F1 = f(yA + 0.5 * hA[:, np.newaxis] * k1, tA + 0.5 * hA, pA)
+                k2 = _solve(factors, F1 - k1) + k1
+                yNew = yA + hA[:, np.newaxis] * k2
+                FNew = f(yNew, tNew, pA)
+                k3 = _solve(factors, FNew - e32 * (k2 - F1) - 2.0 * (k1 - FA) + hd * T)
+                scale = atol + rtol * np.maximum(np.abs(yA), np.abs(yNew))
+                err = np.max(np.abs(hA[:, np.newaxis] / 6.0 * (k1 - 2.0 * k2 + k3)) / scale, axis=1)
+            except np.linalg.LinAlgError:
+                # a singular matrix somewhere in the block: no member takes a step (yNew and FNew are not valid), all
+                # the steps are shortened and tried again
+                err = np.full(len(active), np.nan)
+            ok = err <= 1.0
+
+            # cubic Hermite interpolation of the requested times inside the accepted steps
+            pending = ok & (k[active] < nt)
+            while np.any(pending):
+                local = np.where(pending)[0]
+                local = local[times[k[active[local]]] <= tNew[local]]
+                if not len(local):
+                    break
+                members = active[local]
+                s = ((times[k[members]] - tA[local]) / hA[local])[:, np.newaxis]
+                hl = hA[local][:, np.newaxis]
+                out[members, k[members]] = ((1 + 2 * s) * (1 - s) ** 2 * yA[local] +
+                                            s * (1 - s) ** 2 * hl * FA[local] +
+                                            s ** 2 * (3 - 2 * s) * yNew[local] +
+                                            s ** 2 * (s - 1) * hl * FNew[local])
+                k[members] += 1
+                pending[:] = False
+                pending[local] = k[members] < nt
+
+            accepted = active[ok]
+            if len(accepted):
+                t[accepted], Y[accepted], F[accepted] = tNew[ok], yNew[ok], FNew[ok]
+            steps[accepted] += 1
+            rejected[active[~ok]] += 1
+
+            growth = np.where(ok, np.minimum(5.0, 0.8 * np.maximum(err, 1e-10) ** (-1.0 / 3.0)),
+                              np.where(np.isfinite(err), np.maximum(0.2, 0.8 * err ** (-1.0 / 3.0)), 0.1))
+            h[active] = hA * growth
+            failed[active] |= (h[active] < 1e-14 * np.maximum(np.abs(t[active]), 1.0)) | (steps[active] >= max_steps)
+
+    failed |= t < tEnd
+    stats = {'steps': steps, 'rejected': rejected, 'success': ~failed, 'rhsCalls': calls['rhs'],
+             'jacobianCalls': calls['jacobian'], 'time': time.time() - start}
+    return EnsembleResult(times, out, stats)
+    # =======================================================
+
+
+# GLUCOSE PULSE
+# =======================================================
+def pulse_ensemble(par, ic, t_post=None, pulse=None, **options):
+    """
+    Response to the glucose pulse of many parameter sets at once. The initial conditions are taken as the steady
+    state before the pulse, the pulse is applied to them and the integration starts just after t=0, on the
+    post-pulse side of the discontinuity of the cofactors
+    :param par: parameters, array of shape (N, 116)
+    :param ic: steady state before the pulse, a single state or one per parameter set
+    :param t_post: increasing times >= 0 at which the states are reported (default 0 to 350 s, every 5 s: the
+    result has N * len(t_post) * 18 values)
+    :param pulse: concentrations set at t=0, as a dictionary species -> value (default {'cglcex': 2})
+    :param options: other arguments of integrate_ensemble (rtol, atol...)
+    :return: EnsembleResult(t, y, stats), see integrate_ensemble
+    """
+    if pulse is None:
+        pulse = {'cglcex': 2}
+    t_post = np.arange(0, 351, 5.0) if t_post is None else np.asarray(t_post, dtype=float)
+    if len(t_post) == 0 or t_post[0] < 0 or np.any(np.diff(t_post) <= 0):
+        raise ValueError('t_post must be a non-empty increasing array of times >= 0')
+
+    par = np.atleast_2d(np.asarray(par, dtype=float))
+    y0 = np.array(np.broadcast_to(np.asarray(ic, dtype=float), (len(par), len(SPECIES))))
+    for name, value in pulse.items():
+        y0[:, SPECIES.index(name)] = value
+
+    skip = 0 if t_post[0] == 0 else 1
+    times = np.concatenate([[_AFTER_PULSE], t_post[1 - skip:]])
+    result = integrate_ensemble(par, y0, times, **options)
+    return EnsembleResult(t_post, result.y[:, skip:], result.stats)
+    # =======================================================
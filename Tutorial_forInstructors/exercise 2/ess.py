@@ -0,0 +1,279 @@
+#!/usr/bin/python
+########################################################
+# ess.py
+# Author: Veronica Llorens-Rico
+# Version: 1.1
+# Date: October 2026
+# Description: enhanced Scatter Search (eSS) for bound
+#   constrained global optimization, written in Python
+#   so that the objective function does not need to be
+#   called from R through rpy2 and MEIGO
+# Reference: Egea et al, 2009
+# Reference: Egea et al, 2014 (MEIGO)
+########################################################
+import time
+
+import numpy as np
+from scipy import optimize
+
+
+class _StopSearch(Exception):
+    """
+    Raised by the evaluator when the budget of evaluations or time is exhausted
+    """
+    pass
+
+
+# BOOKKEEPING OF THE OBJECTIVE FUNCTION EVALUATIONS
+# =======================================================
+class _Evaluator(object):
+    """
+    Calls the objective function, one point at a time or a whole population at once, counts the evaluations and
+    keeps the best point found so far
+    """
+
+    def __init__(self, f, fBatch, maxEval, maxTime, start):
+        self.f = f
+        self.fBatch = fBatch
+        self.maxEval = maxEval
+        self.maxTime = maxTime
+        self.start = start
+        self.limit = maxEval
+        self.nfev = 0
+        self.xbest = None
+        self.fbest = np.inf
+        self.history = []
+
+    def exhausted(self):
+        return self.nfev >= self.limit or time.time() - self.start >= self.maxTime
+
+    def _update(self, X, F):
+        F = np.where(np.isnan(F), np.inf, F)
+        k = int(np.argmin(F))
+        if F[k] < self.fbest:
+            self.fbest = float(F[k])
+            self.xbest = np.array(X[k], dtype=float)
+            self.history.append((self.nfev, time.time() - self.start, self.fbest))
+        return F
+
+    def single(self, x):
+        if self.exhausted():
+            raise _StopSearch()
+        x = np.asarray(x, dtype=float)
+        self.nfev += 1
+        return self._update(x[np.newaxis, :], np.array([self.f(x)], dtype=float))[0]
+
+    def batch(self, X, threshold=None):
+        """
+        Evaluates the rows of X with the batch hook. Rows beyond the remaining budget are not evaluated and get an
+        infinite value. With a threshold, the hook may abandon the rows whose value exceeds it
+        """
+        F = np.full(len(X), np.inf)
+        n = max(0, min(len(X), self.limit - self.nfev))
+        if n == 0 or time.time() - self.start >= self.maxTime:
+            return F
+        self.nfev += n
+        # by keyword: the second argument of objectiveFun.objFun_batch is the number of processes
+        values = self.fBatch(X[:n]) if threshold is None else self.fBatch(X[:n], threshold=threshold)
+        F[:n] = self._update(X[:n], np.asarray(values, dtype=float))
+        return F
+    # =======================================================
+
+
+# INITIAL SAMPLING
+# =======================================================
+def diverseSample(x_L, x_U, n, rng):
+    """
+    Latin hypercube sample of the box [x_L, x_U]: every variable takes a value in each of n equal intervals
+    :param x_L: lower bounds
+    :param x_U: upper bounds
+    :param n: number of points
+    :param rng: numpy random generator
+    :return: array of shape (n, nvar)
+    """
+    nvar = len(x_L)
+    strata = np.array([rng.permutation(n) for _ in range(nvar)]).T
+    u = (strata + rng.uniform(size=(n, nvar))) / n
+    return x_L + u * (x_U - x_L)
+    # =======================================================
+
+
+def _refsetSize(nvar):
+    # smallest even b with b * (b - 1) combinations >= 10 * nvar, as in MEIGO
+    b = int(np.ceil((1 + np.sqrt(1 + 40.0 * nvar)) / 2))
+    return b + b % 2
+
+
+# ENHANCED SCATTER SEARCH
+# =======================================================
+def ess(f, x_L, x_U, fBatch=None, x0=None, maxEval=None, maxTime=np.inf, vtr=None, ndiverse=None, dimRefset=None,
+        localSolver='L-BFGS-B', localGradient=None, localN1=1, localN2=10, localMaxEval=None, nStuck=20, seed=None,
+        prune=False, verbose=False):
+    """
+    Minimizes f within the bounds [x_L, x_U] with the enhanced Scatter Search. A reference set of good and diverse
+    solutions is combined pairwise every iteration, all the new candidates of an iteration are evaluated together
+    through fBatch (e.g. objectiveFun.objFun_batch, to use several cores), and promising points are refined with a
+    local solver
+    :param f: objective function of a single parameter vector
+    :param x_L: lower bounds
+    :param x_U: upper bounds
+    :param fBatch: function evaluating a whole population, array of shape (N, nvar) -> N values. By default f is
+    called on every row
+    :param x0: optional initial guess (or array of guesses) included in the initial population
+    :param maxEval: maximum number of evaluations of the objective function (default 1000 * nvar)
+    :param maxTime: maximum wall time, in seconds
+    :param vtr: value to reach, the search stops when the best value is below it
+    :param ndiverse: size of the initial population (default 10 * nvar)
+    :param dimRefset: size of the reference set (default from the number of variables, as in MEIGO)
+    :param localSolver: method of scipy.optimize.minimize used for the local searches, None to disable them
+    :param localGradient: optional gradient of f, passed to the local solver as jac
+    :param localN1: iteration of the first local search
+    :param localN2: iterations between local searches
+    :param localMaxEval: maximum evaluations of each local search (default 100 * nvar)
+    :param nStuck: iterations without improvement after which a member of the reference set is replaced
+    :param seed: seed of the random number generator
+    :param prune: the combinations of the reference set are evaluated as fBatch(X, threshold=t), with the value of the
+    worst member of the reference set as threshold: fBatch may then stop the evaluation of any row once its value
+    exceeds the threshold and return a lower bound above it (e.g. objectiveFun_solution.objFun_batch with its
+    threshold argument). Such rows could not replace any member anyway
+    :param verbose: print the best value after every iteration
+    :return: scipy.optimize.OptimizeResult with xbest, fbest (also as x, fun), nfev, nit, time, the final reference
+    set (refsetX, refsetF) and the history of improvements as (nfev, time, fbest)
+    """
+    start = time.time()
+    rng = np.random.RandomState(seed)
+    x_L = np.asarray(x_L, dtype=float)
+    x_U = np.asarray(x_U, dtype=float)
+    nvar = len(x_L)
+    if np.any(x_U < x_L):
+        raise ValueError('all the upper bounds must be greater than or equal to the lower bounds')
+
+    if fBatch is None:
+        if prune:
+            raise ValueError('prune needs an fBatch that accepts a threshold')
+        fBatch = lambda X: [f(x) for x in X]
+    if maxEval is None:
+        maxEval = 1000 * nvar
+    if ndiverse is None:
+        ndiverse = 10 * nvar
+    if dimRefset is None:
+        dimRefset = _refsetSize(nvar)
+    if localMaxEval is None:
+        localMaxEval = 100 * nvar
+
+    evaluator = _Evaluator(f, fBatch, maxEval, maxTime, start)
+    width = np.where(x_U > x_L, x_U - x_L, 1.0)
+
+    def stop():
+        return evaluator.exhausted() or (vtr is not None and evaluator.fbest <= vtr)
+
+    # initial population: diverse sample plus the initial guesses
+    X = diverseSample(x_L, x_U, ndiverse, rng)
+    if x0 is not None:
+        X = np.vstack([np.clip(np.atleast_2d(x0), x_L, x_U), X])
+    F = evaluator.batch(X)
+
+    # reference set: the best half of the population, completed with the points farthest from it
+    order = np.argsort(F)
+    chosen = list(order[:dimRefset // 2])
+    while len(chosen) < min(dimRefset, len(X)):
+        distance = np.min(np.abs((X[:, np.newaxis, :] - X[chosen][np.newaxis, :, :]) / width).sum(axis=2), axis=1)
+        distance[chosen] = -1
+        chosen.append(int(np.argmax(distance)))
+    refX = X[chosen].copy()
+    refF = F[chosen].copy()
+    stuck = np.zeros(len(refX), dtype=int)
+    searched = []
+
+    nit = 0
+    message = 'maximum number of evaluations reached'
+    collapsed = False
+    while not stop():
+        nit += 1
+        order = np.argsort(refF)
+        refX, refF, stuck = refX[order], refF[order], stuck[order]
+        b = len(refX)
+
+        # combination of every pair of members in the hyper-rectangles defined by them: points are biased towards
+        # the better member of the pair, and more so the further apart the two are in the ranking
+        owners, candidates = [], []
+        for i in range(b):
+            for j in range(b):
+                d = (refX[j] - refX[i]) / 2.0
+                if i == j or not np.any(d):
+                    continue
+                alpha = 1.0 if i < j else -1.0
+                beta = (abs(j - i) - 1.0) / max(b - 2, 1)
+                c1 = refX[i] - d * (1 + alpha * beta)
+                c2 = refX[i] - d * (1 - alpha * beta)
+                candidates.append(c1 + (c2 - c1) * rng.uniform(size=nvar))
+                owners.append(i)
+        if not candidates:
+            collapsed = True
+            break
+        candidates = np.clip(np.array(candidates), x_L, x_U)
+        owners = np.array(owners)
+        FC = evaluator.batch(candidates, np.max(refF) if prune else None)
+
+        improved = np.zeros(b, dtype=bool)
+        for i in range(b):
+            mine = np.where(owners == i)[0]
+            k = mine[np.argmin(FC[mine])]
+            if FC[k] < refF[i]:
+                child, fchild = candidates[k], FC[k]
+                # go-beyond: keep moving in the direction of improvement while it pays off
+                parent, step = refX[i], 1.0
+                try:
+                    while not stop():
+                        beyond = np.clip(child + (child - parent) * rng.uniform(size=nvar) / step, x_L, x_U)
+                        fbeyond = evaluator.single(beyond)
+                        if fbeyond >= fchild:
+                            break
+                        parent, child, fchild = child, beyond, fbeyond
+                        step = max(step / 2.0, 0.25)
+                except _StopSearch:
+                    pass
+                refX[i], refF[i] = child, fchild
+                improved[i] = True
+        stuck = np.where(improved, 0, stuck + 1)
+
+        # local search from the best member that has not been used as a starting point yet
+        if localSolver is not None and nit >= localN1 and (nit - localN1) % localN2 == 0 and not stop():
+            for k in np.argsort(refF):
+                if not any(np.allclose(refX[k], x) for x in searched):
+                    break
+            searched.append(refX[k].copy())
+            evaluator.limit = min(maxEval, evaluator.nfev + localMaxEval)
+            try:
+                local = optimize.minimize(evaluator.single, refX[k], method=localSolver, jac=localGradient,
+                                          bounds=list(zip(x_L, x_U)))
+                xlocal, flocal = local.x, local.fun
+            except _StopSearch:
+                xlocal, flocal = evaluator.xbest, evaluator.fbest
+            evaluator.limit = maxEval
+            worst = int(np.argmax(refF))
+            if flocal < refF[worst] and not any(np.allclose(xlocal, x) for x in refX):
+                refX[worst], refF[worst], stuck[worst] = xlocal, flocal, 0
+
+        # members that do not improve any more are replaced by new random points (keeping the best one)
+        renew = np.where(stuck > nStuck)[0]
+        renew = renew[renew != np.argmin(refF)]
+        if len(renew) and not stop():
+            refX[renew] = diverseSample(x_L, x_U, len(renew), rng)
+            refF[renew] = evaluator.batch(refX[renew])
+            stuck[renew] = 0
+
+        if verbose:
+            print('iteration {0}: {1} evaluations, best {2}'.format(nit, evaluator.nfev, evaluator.fbest))
+
+    if vtr is not None and evaluator.fbest <= vtr:
+        message = 'value to reach attained'
+    elif time.time() - start >= maxTime:
+        message = 'maximum time reached'
+    elif collapsed:
+        message = 'reference set collapsed to a single point'
+
+    return optimize.OptimizeResult(x=evaluator.xbest, fun=evaluator.fbest, xbest=evaluator.xbest,
+                                   fbest=evaluator.fbest, nfev=evaluator.nfev, nit=nit, time=time.time() - start,
+                                   refsetX=refX, refsetF=refF, history=evaluator.history, message=message)
+    # =======================================================
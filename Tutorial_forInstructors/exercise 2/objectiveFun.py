@@ -2,9 +2,9 @@
 ########################################################
 # objectiveFun.py
 # Author: Veronica Llorens-Rico
-# Version: 1.2
+# Version: 1.3
 # Date: December 2015
-# Last update: March 2016
+# Last update: October 2026
 # Description: Defines the objective function to
 # minimize to estimate model parameters
 # Reference: Chassagnole et al, 2002
@@ -26,6 +26,7 @@ def objFun(parameters):
     # Experimental data are extracted from Villaverde et al, 2015
     import numpy as np
     from equations import eqs
+    from jacobian import jac
     from scipy import integrate
     from readData import expData
 
@@ -104,3 +105,22 @@ def objFun(parameters):
 
     print objFunVal
     return objFunVal
+
+
+
+def objFun_batch(param_matrix, processes=None):
+    """
+    Evaluates objFun for many parameter sets at once, spread across a pool of worker processes. It can be passed as
+    fBatch to ess, which then evaluates all the candidates of an iteration together
+    :param param_matrix: array of shape (N, 116), one parameter set per row
+    :param processes: number of worker processes, by default one per core
+    :return: list with the N objective function values, in the order of the rows of param_matrix
+    """
+    import multiprocessing
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(objFun, [list(parameters) for parameters in param_matrix])
+    finally:
+        pool.close()
+        pool.join()
@@ -2,105 +2,517 @@
 ########################################################
 # objectiveFun.py
 # Author: Veronica Llorens-Rico
-# Version: 1.2
+# Version: 1.4
 # Date: December 2015
-# Last update: March 2016
+# Last update: October 2026
 # Description: Defines the objective function to
 # minimize to estimate model parameters
 # Reference: Chassagnole et al, 2002
 # Reference: Villaverde et al, 2015
 ########################################################
+import multiprocessing
+import warnings
+from collections import OrderedDict, namedtuple
 
+import numpy as np
+from scipy import sparse
+
+from equations import eqs
+from readData import expData
+from sensitivity import adjoint_gradient, parameterInfluence, simulate_sensitivities
+from simulation import makeStepper, missingOptions, solve
+
+
+# order of the species in the result of the simulation
+SPECIES = ['cdhap', 'ce4p', 'cpg2', 'cpg3', 'cpgp', 'crib5p', 'cribu5p', 'csed7p', 'cxyl5p', 'cf6p', 'cfdp', 'cg1p',
+           'cg6p', 'cgap', 'cglcex', 'cpep', 'cpg', 'cpyr']
+
+Evaluation = namedtuple('Evaluation', ['value', 'pruned'])
+
+# initial conditions, known because at t=0 we have values for everything
+INITIAL_COND = [0.185,  # cdhap
+                0.103,  # ce4p
+                0.422,  # cpg2
+                2.254,  # cpg3
+                0.008,  # cpgp
+                0.393,  # crib5p
+                0.108,  # cribu5p
+                0.246,  # csed7p
+                0.137,  # cxyl5p
+                0.570,  # cf6p
+                0.334,  # cfdp
+                0.616,  # cg1p
+                3.307,  # cg6p
+                0.242,  # cgap
+                2,  # cglex
+                2.824,  # cpep
+                0.793,  # cpg
+                2.669]  # cpyr
+
+
+# INDEX OF THE EXPERIMENTAL TIMES IN THE SIMULATION
+# =======================================================
+def timeIndices(tspan, times, tolerance=0.01):
+    """
+    Finds, for every experimental time, the index of the simulated time that matches it
+    :param tspan: sorted times of the simulation
+    :param times: experimental times
+    :param tolerance: maximum distance between an experimental time and the simulated one
+    :return: array with one index in tspan per experimental time
+    """
+    tspan = np.asarray(tspan, dtype=float)
+    times = np.asarray(times, dtype=float)
+
+    # first simulated time above (time - tolerance), as in a linear scan over tspan
+    index = np.searchsorted(tspan, times - tolerance, side='right')
+    found = index < len(tspan)
+    found[found] = tspan[index[found]] < times[found] + tolerance
+    if not np.all(found):
+        raise ValueError('experimental times {0} are not in the simulated time span'.format(times[~found]))
+
+    return index
+    # =======================================================
+
+
+# OBJECTIVE FUNCTION
+# =======================================================
+class ObjectiveFunction(object):
+    """
+    Weighted sum of squared residuals between the simulation and the experimental data. The data, and the position
+    of every data point in the simulation, are computed once, so an evaluation only integrates the model
+    """
+
+    def __init__(self, dataFile='expValues.txt', initial_cond=INITIAL_COND, tspan=None, solver=None):
+        """
+        :param dataFile: file with the experimental data (see readData.expData)
+        :param initial_cond: initial conditions of the simulation
+        :param tspan: times of the simulation. By default the solver only reports the state at t=0 and at the
+        experimental times, which is all the objective function reads
+        :param solver: optional arguments of simulation.solve to choose the ODE solver and its tolerances, e.g.
+        simulation.PRESETS['fitting']. By default, odeint with its default tolerances
+        """
+        # PART 1
+        # Experimental data are extracted from Villaverde et al, 2015
+        dataexp = expData(dataFile)
+        self.dataFile = dataFile
+        self.times = np.array([float(datapoint[0]) for datapoint in dataexp])
+        self.values = np.array([float(datapoint[1]) for datapoint in dataexp])
+        self.speciesIndex = np.array([SPECIES.index(datapoint[2]) for datapoint in dataexp], dtype=int)
+        self.noise = np.array([float(datapoint[3]) for datapoint in dataexp])
+        self.weights = 1.0 / self.noise ** 2
+
+        # PART 2
+        self.initial_cond = list(initial_cond)
+        if tspan is None:
+            tspan = np.union1d([0.0], self.times)
+        self.tspan = np.asarray(tspan, dtype=float)
+        self.timeIndex = timeIndices(self.tspan, self.times)
+        self.solver = solver
+
+    def simulate(self, parameters):
+        """
+        Runs the simulation with some parameters
+        :param parameters: parameters of the simulation
+        :return: result of the odeint function (or of the chosen solver), from the cache if it is on (cache.enable)
+        """
+        # without a solver, odeint with the analytical Jacobian and its default tolerances
+        return solve(eqs, self.initial_cond, self.tspan, parameters, **(self.solver or {})).y
+
+    def score(self, simResult):
+        """
+        PART 3: compares a simulation with the experimental data (Log-Likelihood cost function)
+        :param simResult: result of the odeint function over tspan
+        :return: weighted sum of squared residuals
+        """
+        simval = np.asarray(simResult)[self.timeIndex, self.speciesIndex]
+        return float(np.sum(self.weights * (simval - self.values) ** 2))
+
+    def __call__(self, parameters):
+        return self.score(self.simulate(parameters))
+
+    def evaluate(self, parameters, threshold=None):
+        """
+        Objective function with early abandonment: the solver is advanced one step at a time, the residuals of the
+        data points are added as soon as their times are reached, and the integration stops when the partial sum
+        exceeds the threshold. The partial sum is then a lower bound of the objective function, as the remaining
+        terms are positive. The steps are taken by simulation.makeStepper with all the options of the solver (with
+        odeint, scipy.integrate.LSODA with the same tolerances and step options), so the values can differ from those
+        of __call__ within the tolerances. Options of odeint that LSODA does not have (e.g. mxstep) give a normal
+        evaluation, with a RuntimeWarning
+        :param parameters: parameters of the simulation
+        :param threshold: value above which the parameters are not interesting (e.g. the worst member of the
+        reference set of a scatter search). None for a normal evaluation
+        :return: Evaluation(value, pruned): the objective function, or a lower bound above the threshold if pruned
+        """
+        if threshold is None or not np.isfinite(threshold):
+            return Evaluation(self(parameters), False)
+        options = dict(self.solver or {})
+        options.setdefault('method', 'odeint')
+        missing = missingOptions(options['method'], options)
+        if missing:
+            warnings.warn('the odeint options {0} have no equivalent in scipy.integrate.LSODA: the simulation is run '
+                          'whole, without early abandonment'.format(missing), RuntimeWarning)
+            return Evaluation(self(parameters), False)
+        y0 = np.asarray(self.initial_cond, dtype=float)
+        stepper = makeStepper(eqs, y0, self.tspan[0], self.tspan[-1], parameters, **options)
+        # squared residual of every data point, grouped by the simulated time where it is read
+        points = [np.where(self.timeIndex == k)[0] for k in range(len(self.tspan))]
+        cost = lambda k, y: np.sum(self.weights[points[k]] * (y[self.speciesIndex[points[k]]] -
+                                                               self.values[points[k]]) ** 2)
+
+        value = cost(0, y0)
+        k = 1
+        while k < len(self.tspan):
+            if stepper.status != 'running':
+                # the stepper failed: the result of the usual simulation is returned instead
+                return Evaluation(self(parameters), False)
+            stepper.step()
+            if self.tspan[k] > stepper.t:
+                continue
+            dense = stepper.dense_output()
+            while k < len(self.tspan) and self.tspan[k] <= stepper.t:
+                value += cost(k, dense(self.tspan[k]))
+                k += 1
+            if value > threshold:
+                return Evaluation(float(value), True)
+        return Evaluation(float(value), False)
+
+    def valueAndGradient(self, parameters, indices=None, method='forward'):
+        """
+        Objective function and its exact gradient, dF/dp_k = sum of 2 w (sim - data) dsim/dp_k over the data points
+        :param parameters: parameters of the simulation
+        :param indices: indices of the parameters to differentiate with respect to (default, all of them)
+        :param method: 'forward' integrates the sensitivities dsim/dp_k of the chosen parameters with the model,
+        at a cost that grows with their number. 'adjoint' integrates the model forwards and its adjoint backwards,
+        which gives the whole gradient at once: it is the cheaper choice for many parameters
+        :return: weighted sum of squared residuals and its gradient, with one entry per index
+        """
+        options = dict(self.solver or {})
+        if options.pop('method', 'odeint') != 'odeint':
+            raise ValueError('the gradient is computed with odeint')
+        if method == 'adjoint':
+            result = adjoint_gradient(parameters, self.initial_cond, self.tspan[0], self.times, self.speciesIndex,
+                                      self.values, self.weights, **options)
+            gradient = result.gradient if indices is None else result.gradient[np.asarray(indices, dtype=int)]
+            return result.value, gradient
+        if method != 'forward':
+            raise ValueError("unknown method {0}, choose 'forward' or 'adjoint'".format(method))
+
+        result = simulate_sensitivities(parameters, self.initial_cond, self.tspan, indices, **options)
+        residuals = result.y[self.timeIndex, self.speciesIndex] - self.values
+        dsim = result.S[self.timeIndex, self.speciesIndex]
+        value = float(np.sum(self.weights * residuals ** 2))
+        return value, 2.0 * np.dot(self.weights * residuals, dsim)
+
+    def gradient(self, parameters, indices=None, method='forward'):
+        """
+        :param parameters: parameters of the simulation
+        :param indices: indices of the parameters to differentiate with respect to (default, all of them)
+        :param method: 'forward' or 'adjoint', see valueAndGradient
+        :return: exact gradient of the weighted sum of squared residuals, see valueAndGradient
+        """
+        return self.valueAndGradient(parameters, indices, method)[1]
+
+    def residuals(self, parameters):
+        """
+        Weighted residuals of the data points, (sim - data) / sd, in the order of the data file. Their sum of
+        squares is the objective function, so they can be passed as fun to scipy.optimize.least_squares
+        :param parameters: parameters of the simulation
+        :return: array with one residual per data point
+        """
+        simval = np.asarray(self.simulate(parameters))[self.timeIndex, self.speciesIndex]
+        return (simval - self.values) / self.noise
+
+    def residualJacobian(self, parameters, indices=None):
+        """
+        Exact derivatives of the weighted residuals with respect to the parameters, from the forward sensitivities of
+        the simulation. They can be passed as jac to scipy.optimize.least_squares
+        :param parameters: parameters of the simulation
+        :param indices: indices of the parameters to differentiate with respect to (default, all of them)
+        :return: array of shape (data points, number of indices), in the order of residuals
+        """
+        options = dict(self.solver or {})
+        if options.pop('method', 'odeint') != 'odeint':
+            raise ValueError('the sensitivities are integrated with odeint')
+        result = simulate_sensitivities(parameters, self.initial_cond, self.tspan, indices, **options)
+        return result.S[self.timeIndex, self.speciesIndex] / self.noise[:, np.newaxis]
+
+    def residualSparsity(self, indices=None):
+        """
+        Structural pattern of residualJacobian: the data points at the initial time do not depend on the
+        parameters, and the others only on the parameters that reach their species (see
+        sensitivity.parameterInfluence). It can be passed as jac_sparsity to scipy.optimize.least_squares
+        :param indices: indices of the parameters (default, all of them)
+        :return: scipy.sparse.csr_matrix of ones and zeros, of shape (data points, number of indices)
+        """
+        influence = parameterInfluence()
+        if indices is not None:
+            influence = influence[:, np.asarray(indices, dtype=int)]
+        pattern = influence[self.speciesIndex] & (self.times > self.tspan[0])[:, np.newaxis]
+        return sparse.csr_matrix(pattern.astype(float))
+    # =======================================================
+
+
+# MEMOIZATION
+# =======================================================
+def roundSignificant(x, digits):
+    """
+    :param x: array of numbers
+    :param digits: number of significant digits to keep
+    :return: x rounded to that number of significant digits (zeros and non-finite values are kept)
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = 10.0 ** (digits - 1 - np.floor(np.log10(np.abs(x))))
+        rounded = np.round(x * scale) / scale
+    return np.where(np.isfinite(rounded), rounded, x)
+
+
+class Memoized(object):
+    """
+    Remembers the values of a function of a parameter vector, so that a vector that was already evaluated costs a
+    dictionary lookup instead of a simulation. The least recently used values are forgotten beyond maxSize
+    """
+
+    def __init__(self, f, maxSize=10000, digits=None):
+        """
+        :param f: function of a parameter vector
+        :param maxSize: maximum number of values remembered
+        :param digits: if given, the vectors are rounded to this number of significant digits before they are
+        compared, so that vectors that only differ beyond it share their value. By default they must be identical,
+        bit by bit
+        """
+        self.f = f
+        self.maxSize = maxSize
+        self.digits = digits
+        self._values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, x):
+        """
+        :param x: parameter vector
+        :return: the bytes identifying it
+        """
+        x = np.ascontiguousarray(x, dtype=float)
+        if self.digits is not None:
+            x = roundSignificant(x, self.digits)
+        return x.tobytes()
+
+    def lookup(self, key):
+        """
+        :param key: bytes returned by key
+        :return: the remembered value, or None (counted as a hit or a miss)
+        """
+        if key in self._values:
+            self.hits += 1
+            value = self._values.pop(key)
+            self._values[key] = value
+            return value
+        self.misses += 1
+        return None
+
+    def store(self, key, value):
+        """
+        :param key: bytes returned by key
+        :param value: value of the function
+        """
+        self._values.pop(key, None)
+        self._values[key] = value
+        while len(self._values) > self.maxSize:
+            self._values.popitem(last=False)
+
+    def __call__(self, x):
+        key = self.key(x)
+        value = self.lookup(key)
+        if value is None:
+            value = self.f(x)
+            self.store(key, value)
+        return value
+
+    def info(self):
+        """
+        :return: dictionary with the number of hits and misses and the number of values remembered
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._values)}
+
+    def clear(self):
+        """
+        Forgets all the values and resets the counters
+        """
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+    # =======================================================
+
+
+# the experimental data is only loaded the first time objFun is called
+_objective = None
+_memo = None
+# values of objFun_batch with a threshold: ObjectiveFunction.evaluate integrates with another solver than objFun
+# (see simulation.makeStepper), so its values are remembered apart from those of objFun
+_stepMemo = None
+
+
+def _objectiveFunction():
+    global _objective
+    if _objective is None:
+        _objective = ObjectiveFunction()
+    return _objective
+
+
+def _memoized(stepwise=False):
+    global _memo, _stepMemo
+    if _memo is None:
+        _memo = Memoized(_objectiveFunction())
+        _stepMemo = Memoized(_objectiveFunction())
+    return _stepMemo if stepwise else _memo
+
+
+def setMemo(maxSize=10000, digits=None):
+    """
+    Sets up the memoization of objFun (and of objFun_batch with the same data), forgetting the values remembered
+    :param maxSize: maximum number of values remembered, 0 to turn the memoization off
+    :param digits: optional number of significant digits used to compare the parameter vectors (see Memoized)
+    :return: the Memoized object of objFun, whose info method gives the hits and misses (objFun_batch with a
+    threshold uses another one, with the same settings)
+    """
+    global _memo
+    _memo = None
+    for memo in (_memoized(), _memoized(stepwise=True)):
+        memo.maxSize = maxSize
+        memo.digits = digits
+    return _memoized()
 
 
 def objFun(parameters):
     """
     For every experiment, for every observable on each exp, and for every sample in the experiment, minimize difference
-    between the experimental value and the simulated value
+    between the experimental value and the simulated value. Parameter vectors that were already evaluated are not
+    simulated again (see setMemo)
     :param parameters: parameters of the simulation
     :return:
     """
-    
-    # PART 1
-    # We can pass experimental data directly within this function, as it is not going to change
-    # Experimental data are extracted from Villaverde et al, 2015
-    import numpy as np
-    from equations import eqs
-    from scipy import integrate
-    from readData import expData
-
-    dataexp = expData('expValues.txt')
-
-    
-    # PART 2
-    # first we define the initial conditions, known because at t=0 we have values for everything
-    initial_cond = [0.185,  # cdhap
-                    0.103,  # ce4p
-                    0.422,  # cpg2
-                    2.254,  # cpg3
-                    0.008,  # cpgp
-                    0.393,  # crib5p
-                    0.108,  # cribu5p
-                    0.246,  # csed7p
-                    0.137,  # cxyl5p
-                    0.570,  # cf6p
-                    0.334,  # cfdp
-                    0.616,  # cg1p
-                    3.307,  # cg6p
-                    0.242,  # cgap
-                    2,  # cglex
-                    2.824,  # cpep
-                    0.793,  # cpg
-                    2.669]  # cpyr
-
-    # we define timespan of the simulation (range for which we have data=303s) and run the simulation
-    tspan = np.arange(0, 303, 0.05)
-    simResult = integrate.odeint(eqs, initial_cond, tspan, args=(parameters,))
-
-    # we convert the result of the simulation to a dictionary, for indexing purposes
-    simResult = np.transpose(simResult)
-
-    simVals = {'cdhap': simResult[0],
-               'ce4p': simResult[1],
-               'cpg2': simResult[2],
-               'cpg3': simResult[3],
-               'cpgp': simResult[4],
-               'crib5p': simResult[5],
-               'cribu5p': simResult[6],
-               'csed7p': simResult[7],
-               'cxyl5p': simResult[8],
-               'cf6p': simResult[9],
-               'cfdp': simResult[10],
-               'cg1p': simResult[11],
-               'cg6p': simResult[12],
-               'cgap': simResult[13],
-               'cglcex': simResult[14],
-               'cpep': simResult[15],
-               'cpg': simResult[16],
-               'cpyr': simResult[17]}
-
-    
-    # PART 3
-    # here we define the 'real' objective function which we will minimize
-    objFunVal = 0
-    for datapoint in dataexp:
-        timeval = float(datapoint[0])
-        realval = float(datapoint[1])
-        species = datapoint[2]
-        noiseval = float(datapoint[3])
-
-        # small trick to get the index of the time of the experiment in the simulation data
-        match = -1
-        timeIndex = 0
-        while match == -1:
-            if tspan[timeIndex] > (timeval - 0.01) and tspan[timeIndex] < (timeval + 0.01):
-                match = 1
-            else:
-                timeIndex += 1
-
-        simval = simVals[species][timeIndex]
-
-        objFunVal = objFunVal + ((simval - realval) ** 2) / (noiseval ** 2)
-
-    print objFunVal
+    objFunVal = _memoized()(parameters)
+
+    print(objFunVal)
     return objFunVal
+
+
+def objGrad(parameters):
+    """
+    Exact gradient of objFun with respect to all the parameters, with the adjoint method, which costs about three
+    simulations (the forward sensitivities of the 116 parameters, about thirty). It can be given to the local
+    searches of ess.ess as localGradient
+    :param parameters: parameters of the simulation
+    :return: array with the derivative of the objective function with respect to every parameter
+    """
+    return _objectiveFunction().gradient(parameters, method='adjoint')
+
+
+def objResiduals(parameters):
+    """
+    Weighted residuals (sim - data) / sd of every data point, in the order of the data file, for
+    scipy.optimize.least_squares (their sum of squares is objFun)
+    :param parameters: parameters of the simulation
+    :return: array with one residual per data point
+    """
+    return _objectiveFunction().residuals(parameters)
+
+
+def objResidualsJac(parameters):
+    """
+    Exact Jacobian of objResiduals with respect to all the parameters, for scipy.optimize.least_squares. Its
+    structural pattern is ObjectiveFunction.residualSparsity
+    :param parameters: parameters of the simulation
+    :return: array of shape (data points, number of parameters)
+    """
+    return _objectiveFunction().residualJacobian(parameters)
+
+
+# BATCH EVALUATION
+# =======================================================
+# every worker process loads the experimental data once, when the pool is created
+_workerObjective = None
+_pool = None
+_poolProcesses = None
+
+
+def _initWorker(dataFile):
+    global _workerObjective
+    _workerObjective = ObjectiveFunction(dataFile)
+
+
+def _evaluateInWorker(task):
+    parameters, threshold = task
+    return _workerObjective.evaluate(parameters, threshold)
+
+
+def closePool():
+    """
+    Terminates the worker processes used by objFun_batch
+    """
+    global _pool, _poolProcesses
+    if _pool is not None:
+        _pool.close()
+        _pool.join()
+    _pool = None
+    _poolProcesses = None
+
+
+def objFun_batch(param_matrix, processes=None, dataFile='expValues.txt', threshold=None):
+    """
+    Evaluates the objective function for many parameter sets, spreading them across a pool of worker processes. The
+    pool is kept alive between calls, so the data is only loaded once per worker
+    :param param_matrix: array of shape (N, 116), one parameter set per row
+    :param processes: number of worker processes, by default one per core. With 1, the parameter sets are evaluated
+    in this process
+    :param dataFile: file with the experimental data (see readData.expData)
+    :param threshold: optional value above which the parameter sets are abandoned during their simulation (see
+    ObjectiveFunction.evaluate). Their values are then only lower bounds, above the threshold
+    :return: array with the N objective function values, in the order of the rows of param_matrix
+    """
+    global _pool, _poolProcesses
+    param_matrix = np.atleast_2d(np.asarray(param_matrix, dtype=float))
+
+    # the rows already evaluated by objFun or by a previous batch are not sent to the workers. With a threshold, the
+    # values come from ObjectiveFunction.evaluate, and only those of previous batches with a threshold are used
+    memo = _memoized(threshold is not None and np.isfinite(threshold))
+    if memo.f.dataFile != dataFile:
+        memo = Memoized(ObjectiveFunction(dataFile), maxSize=0)
+    keys = [memo.key(parameters) for parameters in param_matrix]
+    values = np.empty(len(param_matrix))
+    first = {}
+    for i, key in enumerate(keys):
+        value = memo.lookup(key) if key not in first else None
+        if value is None:
+            first.setdefault(key, i)
+        else:
+            values[i] = value
+    # repeated rows of the batch are only evaluated once
+    pending = np.array(sorted(first.values()), dtype=int)
+    results = []
+    if processes == 1:
+        results = [memo.f.evaluate(param_matrix[i], threshold) for i in pending]
+    elif len(pending):
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        if _pool is not None and _poolProcesses != (processes, dataFile):
+            closePool()
+        if _pool is None:
+            _pool = multiprocessing.Pool(processes, initializer=_initWorker, initargs=(dataFile,))
+            _poolProcesses = (processes, dataFile)
+
+        # small chunks keep the workers busy when some parameter sets are much harder to integrate than others
+        chunksize = max(1, len(pending) // (4 * processes))
+        results = _pool.map(_evaluateInWorker, [(param_matrix[i], threshold) for i in pending], chunksize=chunksize)
+
+    # lower bounds of abandoned parameter sets are not remembered
+    for i, (value, pruned) in zip(pending, results):
+        values[i] = value
+        if not pruned:
+            memo.store(keys[i], value)
+    for i, key in enumerate(keys):
+        values[i] = values[first.get(key, i)]
+    return values
+    # =======================================================
@@ -2,8 +2,9 @@
 ########################################################
 # plotSim.py
 # Author: Veronica Llorens-Rico
-# Version: 1.1
+# Version: 1.2
 # Date: December 2015
+# Last update: October 2026
 # Description: Plots results of the simulation
 # Reference: Chassagnole et al, 2002
 ########################################################
@@ -119,3 +120,22 @@ def plotSimulation(simResult, time, experimentalData=None):
 
     plt.tight_layout()
     plt.show()
+
+
+def plotParameters(parameters, time, initial_cond, experimentalData=None, solver=None):
+    """
+    Simulates the model with some parameters and plots the time courses (see plotSimulation). The simulation goes
+    through simulation.solve, so it is read from the cache when it is on (cache.enable) and was already run
+    :param parameters: parameters of the simulation
+    :param time: time of the integration
+    :param initial_cond: initial conditions of the simulation
+    :param experimentalData: experimental measurements to add to the plot, as returned by readData.expData
+    :param solver: optional arguments of simulation.solve (method, tolerances...)
+    :return: the simulated time courses
+    """
+    from equations import eqs
+    from simulation import solve
+
+    simResult = solve(eqs, initial_cond, time, parameters, **(solver or {})).y
+    plotSimulation(simResult, time, experimentalData)
+    return simResult
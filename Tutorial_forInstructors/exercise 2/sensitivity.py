@@ -0,0 +1,226 @@
+#!/usr/bin/python
+########################################################
+# sensitivity.py
+# Author: Veronica Llorens-Rico
+# Version: 1.2
+# Date: October 2026
+# Description: Forward sensitivities of the simulation
+#   with respect to the parameters, dx/dp, integrated
+#   together with the state from the analytical
+#   derivatives of the rate laws in jacobian.py, and
+#   gradients of the weighted sum of squared residuals
+#   with the adjoint method
+# Reference: Chassagnole et al, 2002
+########################################################
+import time
+from collections import namedtuple
+
+import numpy as np
+from scipy import integrate
+
+from equations import eqs
+from jacobian import COLS, PAR_COLS, PAR_ROWS, ROWS, jac, jac_batch, jac_par, parameterEntries
+from simulation import _stats, _tolerances
+
+
+SensitivityResult = namedtuple('SensitivityResult', ['t', 'y', 'S', 'stats', 'indices'])
+AdjointResult = namedtuple('AdjointResult', ['value', 'gradient', 'stats'])
+
+
+# AUGMENTED SYSTEM
+# =======================================================
+def sensitivityEquations(indices, rhs=eqs, jacobian=jac, parJacobian=jac_par):
+    """
+    Right hand side and Jacobian of the state augmented with its sensitivities. For the sensitivity matrix S of
+    shape (18, m), S[i, k] = dx_i / dp_k, the forward sensitivity equations are dS/dt = J S + df/dp, with the
+    Jacobian J = df/dx. The augmented state is z = [x, S[:, 0], ..., S[:, m - 1]]
+    :param indices: indices of the parameters whose sensitivities are integrated
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param jacobian: Jacobian of rhs with respect to the species, with the same arguments
+    :param parJacobian: Jacobian of rhs with respect to all the parameters, with the same arguments
+    :return: the functions f(z, t, par) and Dfun(z, t, par) to be passed to odeint, the latter in banded form with
+    ml = mu = 17. Dfun only has the diagonal blocks J of the exact Jacobian, which is enough for the Newton
+    iterations of the solver and keeps the linear algebra at the cost of m + 1 independent blocks
+    """
+    indices = np.asarray(indices, dtype=int)
+    m = len(indices)
+
+    def f(z, t, par):
+        n = len(z) // (m + 1)
+        x = z[:n]
+        S = z[n:].reshape((m, n)).T
+        dS = np.dot(jacobian(x, t, par), S) + parJacobian(x, t, par)[:, indices]
+        return np.concatenate([rhs(x, t, par), dS.T.ravel()])
+
+    def Dfun(z, t, par):
+        n = len(z) // (m + 1)
+        J = jacobian(z[:n], t, par)
+        # banded storage of one block, band[i - j + n - 1, j] = J[i, j], repeated along the diagonal
+        i, j = np.indices((n, n))
+        band = np.zeros((2 * n - 1, n))
+        band[i - j + n - 1, j] = J
+        return np.tile(band, m + 1)
+
+    return f, Dfun
+    # =======================================================
+
+
+# STRUCTURE OF THE SENSITIVITIES
+# =======================================================
+def parameterInfluence():
+    """
+    Structural pattern of the sensitivities after the initial time: parameter k can change species i if the
+    equations where p_k appears (jacobian.PAR_ROWS) reach species i in the graph of the Jacobian (jacobian.ROWS,
+    jacobian.COLS). Sensitivities outside the pattern are zero for any value of the parameters
+    :return: boolean array of shape (18, 116)
+    """
+    n = np.max(ROWS) + 1
+    reach = np.eye(n, dtype=bool)
+    reach[ROWS, COLS] = True
+    # transitive closure, doubling the length of the paths at every product
+    for _ in range(int(np.ceil(np.log2(n)))):
+        reach = np.dot(reach.astype(int), reach.astype(int)) > 0
+    direct = np.zeros((n, np.max(PAR_COLS) + 1), dtype=int)
+    direct[PAR_ROWS, PAR_COLS] = 1
+    return np.dot(reach.astype(int), direct) > 0
+    # =======================================================
+
+
+# SIMULATION WITH SENSITIVITIES
+# =======================================================
+def simulate_sensitivities(par, y0, times, indices=None, rhs=eqs, jacobian=jac, parJacobian=jac_par, rtol=None,
+                           atol=None, **options):
+    """
+    Integrates the model and its forward sensitivities with respect to the parameters with odeint. The initial
+    conditions do not depend on the parameters, so the sensitivities start at zero
+    :param par: parameters passed to the model
+    :param y0: initial conditions at times[0]
+    :param times: increasing times at which the state is reported
+    :param indices: indices of the parameters whose sensitivities are wanted (default, all of them). The cost grows
+    with their number, as m + 1 copies of the model are integrated
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param jacobian: Jacobian of rhs with respect to the species, with the same arguments
+    :param parJacobian: Jacobian of rhs with respect to all the parameters, with the same arguments
+    :param rtol: relative tolerance, shared by the state and the sensitivities
+    :param atol: absolute tolerance, shared by the state and the sensitivities
+    :param options: other arguments of odeint. The sensitivities take part in the error control, so the integration
+    needs more steps than the model alone: mxstep defaults to 100000
+    :return: SensitivityResult(t, y, S, stats, indices): the times, the states (shape (len(times), 18)), the
+    sensitivities (shape (len(times), 18, m), S[l, i, k] = dx_i / dp_indices[k] at times[l]), the statistics of
+    the solver as in simulation.solve and the indices of the parameters
+    """
+    start = time.time()
+    par = np.asarray(par, dtype=float)
+    indices = np.arange(len(par)) if indices is None else np.asarray(indices, dtype=int)
+    y0 = np.asarray(y0, dtype=float)
+    n, m = len(y0), len(indices)
+
+    f, Dfun = sensitivityEquations(indices, rhs, jacobian, parJacobian)
+    z0 = np.concatenate([y0, np.zeros(n * m)])
+    options.setdefault('mxstep', 100000)
+    z, info = integrate.odeint(f, z0, times, args=(par,), Dfun=Dfun, ml=n - 1, mu=n - 1, full_output=True,
+                               **_tolerances(options, rtol, atol))
+
+    last = lambda key: info[key][-1] if len(info[key]) else 0
+    stats = _stats(last('nfe'), last('nje'), last('nst'), start, info['message'],
+                   info['message'] == 'Integration successful.')
+    S = np.transpose(z[:, n:].reshape((len(z), m, n)), (0, 2, 1))
+    return SensitivityResult(np.asarray(times, dtype=float), z[:, :n], S, stats, indices)
+    # =======================================================
+
+
+# ADJOINT GRADIENT
+# =======================================================
+# three stage Radau IIA method (order 5, L-stable): nodes, coefficients and weights (the last row of the coefficients)
+_RADAU_NODES = np.array([(4.0 - np.sqrt(6.0)) / 10.0, (4.0 + np.sqrt(6.0)) / 10.0, 1.0])
+_RADAU_COEFFICIENTS = np.array([
+    [(88.0 - 7.0 * np.sqrt(6.0)) / 360.0, (296.0 - 169.0 * np.sqrt(6.0)) / 1800.0, (-2.0 + 3.0 * np.sqrt(6.0)) / 225.0],
+    [(296.0 + 169.0 * np.sqrt(6.0)) / 1800.0, (88.0 + 7.0 * np.sqrt(6.0)) / 360.0, (-2.0 - 3.0 * np.sqrt(6.0)) / 225.0],
+    [(16.0 - np.sqrt(6.0)) / 36.0, (16.0 + np.sqrt(6.0)) / 36.0, 1.0 / 9.0]])
+_RADAU_WEIGHTS = _RADAU_COEFFICIENTS[-1]
+
+
+def adjoint_gradient(par, y0, t0, times, speciesIndex, values, weights, rhs=eqs, jacobian=jac,
+                     batchJacobian=jac_batch, rtol=1e-6, atol=1e-8):
+    """
+    Weighted sum of squared residuals F = sum of w (x_s(t) - data)^2 over the data points, and its gradient with
+    respect to all the parameters, with the adjoint method. The adjoint state l solves dl/dt = -J^T l backwards in
+    time, jumping by dF/dx at every data point, and the gradient is the integral of l^T df/dp.
+    The model is integrated once forwards with dense output. The adjoint equations are linear once the trajectory
+    is known, so they are solved in a single backward sweep on the steps of the forward solver (plus the data
+    times) with the three stage Radau IIA method: the Jacobians at all its nodes are evaluated in one call of
+    batchJacobian and the propagators of all the steps come from one stacked linear solve, which leaves a product
+    of small matrices per step and the jumps at the data times. The stages of the method give the adjoint state at
+    the nodes, where the integral of l^T df/dp is computed with the weights of the method (jacobian.parameterEntries
+    at all the nodes at once). A gradient costs about two to four simulations. The dense output keeps every forward
+    step in memory
+    :param par: parameters passed to the model
+    :param y0: initial conditions at t0, independent of the parameters
+    :param t0: initial time
+    :param times: time of every data point, all > t0 or equal to it (the points at t0 do not depend on par)
+    :param speciesIndex: index of the species measured at every data point
+    :param values: measured value of every data point
+    :param weights: weight of every data point
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param jacobian: Jacobian of rhs with respect to the species, with the same arguments, for the forward solver
+    :param batchJacobian: the same Jacobian for many states and times at once, with the arguments of
+    jacobian.jac_batch
+    :param rtol: relative tolerance of the forward integration, which sets the steps of the backward sweep
+    :param atol: absolute tolerance of the forward integration
+    :return: AdjointResult(value, gradient, stats): the weighted sum of squared residuals, its gradient with one
+    entry per parameter and a dictionary with the statistics of the forward solver (as in simulation.solve, the
+    Jacobians at the nodes included in njev) and the number of backward steps ('backwardSteps'). If the forward
+    integration fails, the value and the gradient are NaN
+    """
+    start = time.time()
+    par = np.asarray(par, dtype=float)
+    times = np.asarray(times, dtype=float)
+    speciesIndex = np.asarray(speciesIndex, dtype=int)
+    weights = np.asarray(weights, dtype=float)
+    y0 = np.asarray(y0, dtype=float)
+    n = len(y0)
+
+    # FORWARD PASS, with dense output
+    forward = integrate.solve_ivp(lambda t, y: rhs(y, t, par), (t0, np.max(times)), y0, method='LSODA',
+                                  jac=lambda t, y: jacobian(y, t, par), dense_output=True, rtol=rtol, atol=atol)
+    if not forward.success:
+        stats = _stats(forward.nfev, forward.njev, len(forward.t) - 1, start, forward.message, False)
+        stats['backwardSteps'] = 0
+        return AdjointResult(np.nan, np.full(len(par), np.nan), stats)
+    residuals = forward.sol(times)[speciesIndex, np.arange(len(times))] - values
+    value = float(np.sum(weights * residuals ** 2))
+
+    # BACKWARD SWEEP, from grid[i + 1] to grid[i], with the nodes at grid[i + 1] - c h
+    grid = np.union1d(np.union1d([t0], times), forward.t)
+    h = np.diff(grid)
+    m = len(h)
+    nodes = (grid[1:, np.newaxis] - h[:, np.newaxis] * _RADAU_NODES).ravel()
+    X = forward.sol(nodes)
+    Jt = np.transpose(batchJacobian(X.T, nodes, par).reshape((m, 3, n, n)), (0, 1, 3, 2))
+    # stages L_j = l + h sum_k a_jk J_k^T L_k: the propagators from l to the three stages, for all the steps
+    M = np.tile(np.eye(3 * n), (m, 1, 1))
+    hJt = h[:, np.newaxis, np.newaxis, np.newaxis] * Jt
+    for j in range(3):
+        for k in range(3):
+            M[:, j * n:(j + 1) * n, k * n:(k + 1) * n] -= _RADAU_COEFFICIENTS[j, k] * hJt[:, k]
+    P = np.linalg.solve(M, np.broadcast_to(np.tile(np.eye(n), (3, 1)), (m, 3 * n, n)))
+
+    jumps = np.zeros((len(grid), n))
+    np.add.at(jumps, (np.searchsorted(grid, times), speciesIndex), 2.0 * weights * residuals)
+    stages = np.empty((m, 3 * n))
+    l = jumps[-1]
+    for i in range(m - 1, -1, -1):
+        stages[i] = np.dot(P[i], l)
+        # the last node is the end of the step
+        l = stages[i, 2 * n:] + jumps[i]
+
+    # integral of l^T df/dp with the weights of the method, only for the non-zero entries of df/dp
+    quadrature = (h[:, np.newaxis] * _RADAU_WEIGHTS).ravel()
+    entries = np.array(np.broadcast_arrays(*parameterEntries(X, nodes, par)))
+    contributions = np.dot(entries * stages.reshape((3 * m, n)).T[PAR_ROWS], quadrature)
+    gradient = np.bincount(PAR_COLS, weights=contributions, minlength=len(par))
+
+    stats = _stats(forward.nfev, forward.njev + len(nodes), len(forward.t) - 1, start, forward.message, True)
+    stats['backwardSteps'] = m
+    return AdjointResult(value, gradient, stats)
+    # =======================================================
@@ -0,0 +1,158 @@
+#!/usr/bin/python
+########################################################
+# sparseJacobian.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Finite difference Jacobian of the model
+#   that perturbs groups of species at once, chosen
+#   from the sparsity pattern of the network by
+#   Curtis-Powell-Reid coloring, so that it costs one
+#   evaluation of the equations per group instead of
+#   one per species
+# Reference: Chassagnole et al, 2002
+# Reference: Curtis, Powell and Reid, 1974
+########################################################
+import numpy as np
+from scipy import sparse
+
+from equations import eqs
+from jacobian import COLS, ROWS
+
+
+# SPARSITY PATTERN
+# =======================================================
+def modelPattern():
+    """
+    Sparsity pattern of the Jacobian of equations.eqs, taken from the symbolic derivatives of the rate laws
+    (jacobian.ROWS, jacobian.COLS, generated by genJacobian.py): it holds for any concentrations, time and parameters
+    :return: boolean array of shape (18, 18), True where d eqs_i / d x_j can be non-zero
+    """
+    n = np.max(ROWS) + 1
+    pattern = np.zeros((n, n), dtype=bool)
+    pattern[ROWS, COLS] = True
+    return pattern
+
+
+def probePattern(rhs, x, args=(), samples=3, spread=0.5, seed=0):
+    """
+    Sparsity pattern of the Jacobian of any right hand side, found numerically: a full finite difference Jacobian
+    is computed at a few random states around x, and an entry belongs to the pattern if it is non-zero at any of
+    them. It costs samples * (n + 1) evaluations, once
+    :param rhs: right hand side, called as rhs(x, *args)
+    :param x: reference state (positive concentrations)
+    :param args: other arguments of rhs (e.g. (t, par) for equations.eqs)
+    :param samples: number of random states
+    :param spread: the states are x times random factors between 1 - spread and 1 + spread, which keeps them positive
+    and avoids accidental zeros of the derivatives at x itself
+    :param seed: seed of the random factors
+    :return: boolean array of shape (n, n)
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    random = np.random.RandomState(seed)
+    pattern = np.zeros((n, n), dtype=bool)
+    for _ in range(samples):
+        point = x * random.uniform(1 - spread, 1 + spread, n)
+        F = np.asarray(rhs(point, *args), dtype=float)
+        delta = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(point), 1e-8)
+        for j in range(n):
+            perturbed = np.array(point)
+            perturbed[j] += delta[j]
+            pattern[:, j] |= np.asarray(rhs(perturbed, *args), dtype=float) != F
+    return pattern
+    # =======================================================
+
+
+# COLUMN COLORING
+# =======================================================
+def colorColumns(pattern):
+    """
+    Curtis-Powell-Reid grouping of the columns of a sparse Jacobian: two columns can share a color when they have no
+    non-zero row in common (structurally orthogonal), so that one finite difference perturbing all the columns of a
+    color gives each of their entries separately. Greedy coloring of the column intersection graph, the columns with
+    most non-zeros first
+    :param pattern: boolean array of shape (m, n) (or a scipy sparse matrix) with the non-zero entries
+    :return: array with the color (0, 1, ...) of every column
+    """
+    pattern = np.asarray(pattern.toarray() if sparse.issparse(pattern) else pattern, dtype=bool)
+    overlap = np.dot(pattern.T.astype(int), pattern.astype(int)) > 0
+    colors = np.full(pattern.shape[1], -1, dtype=int)
+    for j in np.argsort(-np.sum(pattern, axis=0), kind='mergesort'):
+        taken = set(colors[overlap[j] & (colors >= 0)])
+        color = 0
+        while color in taken:
+            color += 1
+        colors[j] = color
+    return colors
+    # =======================================================
+
+
+# COLORED FINITE DIFFERENCES
+# =======================================================
+class ColoredJacobian(object):
+    """
+    Finite difference Jacobian of a right hand side with a known sparsity pattern, perturbing all the species of a
+    color at once (see colorColumns). It is called with the arguments of the right hand side, so it can be used
+    wherever a Jacobian of the model is expected: steadyState.find_steady_state, simulation.solve and the stability
+    analysis (e.g. ColoredJacobian(eqs_nopt) in exercise 3)
+    """
+
+    def __init__(self, rhs=eqs, pattern=None, method='forward', sparseOutput=False, floor=1e-8):
+        """
+        :param rhs: right hand side, called as rhs(x, *args)
+        :param pattern: boolean array (or scipy sparse matrix) with the non-zero entries of the Jacobian. Default,
+        modelPattern(): the right hand sides built from equations.rates (eqs, eqs_nopt...) all share it
+        :param method: 'forward' differences (one evaluation per color, plus one at x) or 'central' (two per color,
+        more accurate)
+        :param sparseOutput: return a scipy.sparse.csc_matrix instead of an array (for the BDF and Radau solvers)
+        :param floor: the step of species j is sqrt(eps) * max(|x_j|, floor) (the cube root of eps for central
+        differences), relative to the concentration so that small ones are not pushed below zero
+        """
+        if method not in ('forward', 'central'):
+            raise ValueError("method must be 'forward' or 'central', got {0}".format(method))
+        if pattern is None:
+            pattern = modelPattern()
+        pattern = np.asarray(pattern.toarray() if sparse.issparse(pattern) else pattern, dtype=bool)
+        self.rhs = rhs
+        self.shape = pattern.shape
+        self.rows, self.cols = np.nonzero(pattern)
+        self.colors = colorColumns(pattern)
+        self.nColors = int(np.max(self.colors)) + 1 if len(self.colors) else 0
+        self.method = method
+        self.sparseOutput = sparseOutput
+        self.floor = floor
+        self.evaluations = 0
+        # perturbation directions: column c of groups marks the species of color c
+        self._groups = np.zeros((self.shape[1], self.nColors))
+        self._groups[np.arange(self.shape[1]), self.colors] = 1.0
+
+    def _f(self, x, args):
+        self.evaluations += 1
+        return np.asarray(self.rhs(x, *args), dtype=float)
+
+    def __call__(self, x, *args):
+        """
+        :param x: state at which the Jacobian is computed
+        :param args: other arguments of the right hand side (e.g. t, par for equations.eqs)
+        :return: Jacobian, J[i, j] = d rhs_i / d x_j, as an array of shape (m, n) or a csc_matrix (sparseOutput)
+        """
+        x = np.asarray(x, dtype=float)
+        eps = np.finfo(float).eps
+        if self.method == 'forward':
+            delta = np.sqrt(eps) * np.maximum(np.abs(x), self.floor)
+            F = self._f(x, args)
+            D = np.column_stack([self._f(x + delta * group, args) - F for group in self._groups.T])
+            values = D[self.rows, self.colors[self.cols]] / delta[self.cols]
+        else:
+            delta = eps ** (1.0 / 3.0) * np.maximum(np.abs(x), self.floor)
+            D = np.column_stack([self._f(x + delta * group, args) - self._f(x - delta * group, args)
+                                 for group in self._groups.T])
+            values = D[self.rows, self.colors[self.cols]] / (2.0 * delta[self.cols])
+
+        if self.sparseOutput:
+            return sparse.csc_matrix((values, (self.rows, self.cols)), shape=self.shape)
+        J = np.zeros(self.shape)
+        J[self.rows, self.cols] = values
+        return J
+    # =======================================================
@@ -0,0 +1,90 @@
+#!/usr/bin/python
+########################################################
+# test_cache.py
+# Author: Veronica Llorens-Rico
+# Version: 1.1
+# Date: October 2026
+# Description: Tests of the keys and of the size
+#   accounting of the simulation cache of cache.py
+#   (run with pytest from this directory)
+########################################################
+import os
+
+import numpy as np
+from scipy import sparse
+
+import cache
+from cache import TrajectoryCache, _describe
+from equations import eqs
+from readData import params
+from simulation import solve
+from sparseJacobian import modelPattern
+
+
+PAR = np.ones(116)
+Y0 = np.ones(18)
+TIMES = np.linspace(0.0, 10.0, 11)
+
+
+def scaled(factor):
+    def jacobian(y, t, par):
+        return factor * np.eye(len(y))
+    return jacobian
+
+
+class Jacobian(object):
+    def __call__(self, y, t, par):
+        return np.eye(len(y))
+
+
+def test_functions_with_the_same_name_have_different_keys(tmp_path):
+    store = TrajectoryCache(str(tmp_path))
+    first, second = scaled(1.0), scaled(2.0)
+    assert first.__qualname__ == second.__qualname__
+    assert store.key(PAR, Y0, TIMES, {'jacobian': first}) != store.key(PAR, Y0, TIMES, {'jacobian': second})
+    assert store.key(PAR, Y0, TIMES, {'jacobian': first}) == store.key(PAR, Y0, TIMES, {'jacobian': scaled(1.0)})
+    assert _describe(lambda y: y + 1) != _describe(lambda y: y + 2)
+
+
+def test_callable_objects_are_not_cached(tmp_path):
+    store = TrajectoryCache(str(tmp_path))
+    assert store.key(PAR, Y0, TIMES, {'jacobian': Jacobian()}) is None
+    assert store.key(PAR, Y0, TIMES, {'jacobian': Jacobian().__call__}) is None
+
+
+def test_size_of_overwritten_results(tmp_path):
+    store = TrajectoryCache(str(tmp_path))
+    key = store.key(PAR, Y0, TIMES, {'method': 'odeint'})
+    for _ in range(3):
+        store.put(key, np.ones((len(TIMES), len(Y0))), {'nfev': 1})
+    assert store.info()['bytes'] == sum(os.path.getsize(path) for path in store._files())
+
+
+def test_sparsity_patterns_have_different_keys(tmp_path):
+    store = TrajectoryCache(str(tmp_path))
+    pattern = np.eye(18, dtype=bool)
+    other = np.array(pattern)
+    other[0, 1] = True
+    keys = [store.key(PAR, Y0, TIMES, {'sparsity': value})
+            for value in (None, pattern, other, sparse.csc_matrix(pattern), sparse.csr_matrix(pattern))]
+    assert len(set(keys[:3])) == 3
+    # the same pattern, in any sparse format
+    assert keys[3] == keys[4]
+    assert store.key(PAR, Y0, TIMES, {'sparsity': np.array(pattern)}) == keys[1]
+
+
+def test_solve_keys_the_sparsity_pattern(tmp_path):
+    store = cache.enable(str(tmp_path))
+    try:
+        parameters = np.array(params('parameters.txt'), dtype=float)
+        y0 = [0.185, 0.103, 0.422, 2.254, 0.008, 0.393, 0.108, 0.246, 0.137, 0.570, 0.334, 0.616, 3.307, 0.242, 2,
+              2.824, 0.793, 2.669]
+        results = [solve(eqs, y0, TIMES, parameters, method='LSODA', jacobian=None, sparsity=pattern)
+                   for pattern in (modelPattern(), np.ones((18, 18), dtype=bool), modelPattern())]
+    finally:
+        cache.disable()
+    # a full pattern takes another path through the solver: it is not read from the entry of the model pattern
+    assert not results[1].stats.get('cached', False)
+    assert results[1].stats['nfev'] != results[0].stats['nfev']
+    assert results[2].stats['cached']
+    assert store.info()['misses'] == 2
@@ -0,0 +1,76 @@
+#!/usr/bin/python
+########################################################
+# test_ensemble.py
+# Author: Veronica Llorens-Rico
+# Version: 1.1
+# Date: October 2026
+# Description: Tests of the ensemble integrator of
+#   ensemble.py when the linear systems of a step are
+#   singular (run with pytest from this directory)
+########################################################
+import numpy as np
+
+import ensemble
+from ensemble import integrate_ensemble
+
+
+# linear decay dy/dt = -rate * y of the 18 species of 3 members, with exact solution y0 exp(-rate t)
+RATES = np.linspace(0.1, 3.0, 3 * 18).reshape((3, 18))
+Y0 = np.ones((3, 18))
+TIMES = np.linspace(0.0, 2.0, 11)
+FIRST_STEP = 0.01
+
+
+def decay(y, t, par):
+    return -par * y
+
+
+def decayJacobian(y, t, par):
+    return -par[:, :, np.newaxis] * np.eye(y.shape[1])
+
+
+def exact():
+    return Y0[:, np.newaxis, :] * np.exp(-RATES[:, np.newaxis, :] * TIMES[np.newaxis, :, np.newaxis])
+
+
+def test_singular_first_step():
+    # with J = I / (h d), the matrices I - h d J of the first step are all exactly zero
+    d = 1.0 / (2.0 + np.sqrt(2.0))
+    calls = []
+
+    def jacobian(y, t, par):
+        calls.append(t)
+        if len(calls) == 1:
+            return np.broadcast_to(np.eye(y.shape[1]) / (FIRST_STEP * d), (len(y), y.shape[1], y.shape[1]))
+        return decayJacobian(y, t, par)
+
+    result = integrate_ensemble(RATES, Y0, TIMES, rhs=decay, jacobian=jacobian, first_step=FIRST_STEP)
+    assert np.all(result.stats['success'])
+    assert np.all(result.stats['rejected'] >= 1)
+    assert np.allclose(result.y, exact(), rtol=1e-3, atol=1e-6)
+
+
+def test_singular_step_after_accepted_steps(monkeypatch):
+    # the factorization fails in the middle of the integration, right after the first member has finished, when the
+    # states left over from the previous step belong to a larger block of members
+    factor = ensemble._factor
+    sizes = []
+    failures = []
+
+    def failing(W):
+        sizes.append(len(W))
+        if len(W) < max(sizes) and len(failures) < 2:
+            failures.append(len(W))
+            raise np.linalg.LinAlgError('singular matrix')
+        return factor(W)
+
+    monkeypatch.setattr(ensemble, '_factor', failing)
+    rates = np.array(RATES)
+    rates[0] *= 0.1
+    # the slow member takes longer steps and reaches the end first
+    result = integrate_ensemble(rates, Y0, TIMES, rhs=decay, jacobian=decayJacobian, first_step=FIRST_STEP)
+    assert len(failures) == 2
+    assert np.all(result.stats['success'])
+    assert np.all(np.isfinite(result.y))
+    expected = Y0[:, np.newaxis, :] * np.exp(-rates[:, np.newaxis, :] * TIMES[np.newaxis, :, np.newaxis])
+    assert np.allclose(result.y, expected, rtol=1e-3, atol=1e-6)
@@ -0,0 +1,38 @@
+#!/usr/bin/python
+########################################################
+# test_ess.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Tests of the enhanced Scatter Search of
+#   ess.py with the batch objective function of the
+#   solution (run with pytest from this directory)
+########################################################
+import numpy as np
+import pytest
+
+import objectiveFun_solution
+from ess import ess
+from objectiveFun_solution import closePool, objFun, objFun_batch
+from readData import params
+
+
+@pytest.fixture
+def bounds():
+    parameters = np.array(params('parameters.txt'), dtype=float)
+    objectiveFun_solution.setMemo()
+    yield 0.8 * parameters, 1.25 * parameters
+    closePool()
+
+
+def test_ess_prunes_with_objFun_batch(bounds):
+    # objFun_batch itself, whose second argument is the number of processes: the threshold (the worst member of the
+    # reference set) must reach it by keyword
+    x_L, x_U = bounds
+    result = ess(f=objFun, x_L=x_L, x_U=x_U, fBatch=objFun_batch, maxEval=40, ndiverse=12, dimRefset=4,
+                 localSolver=None, seed=0, prune=True)
+    assert result.nfev == 40
+    assert np.isfinite(result.fbest)
+    assert np.all(x_L <= result.xbest) and np.all(result.xbest <= x_U)
+    # the combinations were evaluated with the threshold, and remembered apart from the values of objFun
+    assert objectiveFun_solution._memoized(stepwise=True).info()['misses'] > 0
@@ -0,0 +1,33 @@
+#!/usr/bin/python
+########################################################
+# test_sensitivity.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Tests of the adjoint gradient of
+#   sensitivity.py against the forward sensitivities
+#   (run with pytest from this directory)
+########################################################
+import numpy as np
+
+from objectiveFun_solution import ObjectiveFunction
+from readData import params
+
+
+def test_adjoint_gradient_matches_forward_sensitivities():
+    parameters = np.array(params('parameters.txt'), dtype=float)
+    objective = ObjectiveFunction(solver={'rtol': 1e-10, 'atol': 1e-12})
+    value, forward = objective.valueAndGradient(parameters, method='forward')
+    adjointValue, adjoint = objective.valueAndGradient(parameters, method='adjoint')
+    assert np.isclose(adjointValue, value, rtol=1e-8)
+    assert np.max(np.abs(adjoint - forward)) < 1e-7 * np.max(np.abs(forward))
+
+
+def test_adjoint_gradient_of_some_parameters():
+    parameters = np.array(params('parameters.txt'), dtype=float)
+    objective = ObjectiveFunction(solver={'rtol': 1e-8, 'atol': 1e-10})
+    indices = [1, 48, 103]
+    _, forward = objective.valueAndGradient(parameters, indices, method='forward')
+    _, adjoint = objective.valueAndGradient(parameters, indices, method='adjoint')
+    assert adjoint.shape == (3,)
+    assert np.allclose(adjoint, forward, rtol=1e-5, atol=1e-6 * np.max(np.abs(forward)))
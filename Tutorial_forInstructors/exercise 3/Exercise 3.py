@@ -32,7 +32,6 @@ import numpy as np
 from scipy import integrate
 import sys
 sys.path.insert(0, 'src')  # necessary to work both in PyCharm and terminal
-import numdifftools as ndt
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -40,8 +39,9 @@ warnings.filterwarnings('ignore')
 # ===================================================================================
 # Import differential equations model------------------------------------------------
 # Import parameters
-from equations_noperturbation import eqs_nopt
+from equations_noperturbation import complexStepJacobian, eqs_nopt
 from equations import eqs
+from jacobian import jac
 from plotSim import plotSimulation
 from readData import *
 
@@ -89,6 +89,9 @@ ds = ######<<<>>>######
 plotSimulation(ds, t)
 
 
+# To stop the integration as soon as the answer is known instead of always running up to t=1000, use **`run_to_steady_state`** from **`simulation.py`**, with the same arguments as `odeint` (equations, initial conditions, times, parameters). It stops when the system is back at rest, when it diverges or when NaNs appear, and returns the times and states reached, the reason to stop (`status`) and the time at which the steady state was reached (`tSteady`).
+
+
 # ### Exercise 3.2. Calculate the Jacobian matrix of the model and solve it for the steady state point. Determine the eigenvalues of this matrix and describe the type of steady state. 
 # 
 # **Note:** at the steady state, we have the same initial conditions as before, but no glucose perturbation
@@ -101,12 +104,12 @@ plotSimulation(ds, t)
 
 # As there is no perturbation, we use a modified version of the **`equations.py`** script that does not account for the time dependencies of the NADH, NADP, NADPH, ATP, ADP and AMP. This is the **`equations_noperturbation.py`**, from which the eqs function (**`eqs_nopt`**) has already been imported.
 # 
-# The function that computes the Jacobian for a system of Ordinary Differential Equations such as the one presented here is **`ndt.Jacobian`**. The only required argument is the equations function.
+# The function that computes the Jacobian for a system of Ordinary Differential Equations such as the one presented here is **`complexStepJacobian`**, from **`equations_noperturbation.py`**. The only required argument is the equations function. It differentiates the equations with a tiny step in the imaginary direction, f'(x) = Im(f(x + ih)) / h, which gives the exact derivatives (up to rounding) instead of the finite difference approximations of **`numdifftools`**, whose errors can move the eigenvalues that are close to zero.
 
 # In[ ]:
 
 # Calculate the Jacobian for the modified equations
-Jacob = ndt.Jacobian(eqs_nopt)
+Jacob = complexStepJacobian(eqs_nopt)
 
 
 # Now, once the Jacobian matrix has been calculated, we need to pass the steady state concentrations (same as initial conditions) to solve the Jacobian for the steady state point. They need first to be converted to a NumPy array.
@@ -0,0 +1,307 @@
+#!/usr/bin/python
+########################################################
+# cache.py
+# Author: Veronica Llorens-Rico
+# Version: 1.1
+# Date: October 2026
+# Description: Cache of simulation results on disk,
+#   addressed by a hash of everything that determines
+#   them (parameters, initial conditions, times, solver
+#   and the source code of the model), so that
+#   identical simulations are only integrated once
+#   across fits, notebook reruns and processes
+# Reference: Chassagnole et al, 2002
+########################################################
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+from scipy import sparse
+
+import equations
+import jacobian
+
+
+# hash of the rate laws and of the Jacobian: editing the model invalidates all the cached results
+MODEL_HASH = hashlib.sha256((inspect.getsource(equations) + inspect.getsource(jacobian)).encode('utf-8')).hexdigest()
+
+
+# atomic rename, also over an existing file (os.replace does not exist in Python 2, where os.rename does it on POSIX)
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _sizeOf(path):
+    # files may be deleted meanwhile by another process using the same directory
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _describeCode(code):
+    # hash of compiled code: bytecode, names used and constants, with those of the nested functions
+    constants = []
+    for constant in code.co_consts:
+        if inspect.iscode(constant):
+            constants.append(_describeCode(constant))
+        elif isinstance(constant, frozenset):
+            # the order of the sets changes between processes with the hashes of the strings
+            constants.append(repr(sorted(repr(item) for item in constant)))
+        else:
+            constants.append(repr(constant))
+    text = repr((code.co_code, code.co_names, code.co_varnames, constants))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _describe(value):
+    # canonical text of a solver setting: arrays (dense or sparse) by their content, functions by their qualified
+    # name, their code and the values they close over or take by default (the globals they use are identified by name
+    # only). None if the setting cannot be identified, e.g. callable objects and bound methods, whose results depend
+    # on their state
+    if isinstance(value, np.ndarray):
+        return 'array{0}{1}{2}'.format(value.shape, value.dtype,
+                                       hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if sparse.issparse(value):
+        # e.g. a sparsity pattern, by the content of its canonical CSR form
+        value = sparse.csr_matrix(value, dtype=float)
+        value.sum_duplicates()
+        value.sort_indices()
+        return 'sparse{0}:{1}:{2}:{3}'.format(value.shape, _describe(value.indptr), _describe(value.indices),
+                                              _describe(value.data))
+    if callable(value):
+        name = '{0}.{1}'.format(getattr(value, '__module__', ''),
+                                getattr(value, '__qualname__', getattr(value, '__name__', None)))
+        if inspect.isbuiltin(value) or isinstance(value, np.ufunc):
+            return name
+        if not inspect.isfunction(value):
+            return None
+        try:
+            bound = [cell.cell_contents for cell in value.__closure__ or ()]
+        except ValueError:
+            # a variable of the enclosing function that is not assigned yet
+            return None
+        keywords = getattr(value, '__kwdefaults__', None) or {}
+        bound += list(value.__defaults__ or ()) + [keywords[keyword] for keyword in sorted(keywords)]
+        described = [_describe(item) for item in bound]
+        if None in described:
+            return None
+        return '{0}:{1}:{2}:{3}'.format(name, _describeCode(value.__code__), sorted(keywords), described)
+    return repr(value)
+
+
+def profileKey():
+    """
+    :return: text identifying the cofactor profile used by the rate laws after the pulse (see
+    equations.setCofactorProfile), or None if it cannot be identified and the results must not be cached
+    """
+    profile = equations._cofactorProfile
+    if profile is equations.pulseCofactors:
+        return 'analytical'
+    if hasattr(profile, 'coefficients'):
+        # a cofactorTable.CofactorTable, identified by its splines and by the function used after them
+        beyond = _describe(getattr(profile, 'beyond', None))
+        if beyond is None:
+            return None
+        return 'table' + hashlib.sha256(np.ascontiguousarray(profile.coefficients).tobytes()).hexdigest() + beyond
+    return None
+
+
+# TRAJECTORY CACHE
+# =======================================================
+class TrajectoryCache(object):
+    """
+    Simulation results stored as .npy files (read back memory-mapped) with their solver statistics in .json files,
+    named after a SHA-256 hash of the inputs of the simulation. The least recently used results are deleted when the
+    files exceed maxBytes. The last results read or written are also kept in memory
+    """
+
+    def __init__(self, directory='simulationCache', maxBytes=2 ** 30, memoryItems=128):
+        """
+        :param directory: directory of the cache, created if needed. It can be shared by several processes
+        :param maxBytes: maximum total size of the files
+        :param memoryItems: number of results kept in memory
+        """
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.memoryItems = memoryItems
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._size = sum(_sizeOf(path) for path in self._files())
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.npy') or name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, key[:2], key + extension)
+
+    def key(self, par, y0, times, solver):
+        """
+        :param par: parameters passed to the model
+        :param y0: initial conditions
+        :param times: times at which the states are reported
+        :param solver: dictionary with every setting of the solver (method, tolerances, options...)
+        :return: hexadecimal hash of the simulation, or None if it cannot be cached (unknown cofactor profile, or a
+        setting that cannot be identified, such as a callable object)
+        """
+        profile = profileKey()
+        if profile is None:
+            return None
+        digest = hashlib.sha256()
+        digest.update((MODEL_HASH + profile).encode('utf-8'))
+        for array in (par, y0, times):
+            array = np.ascontiguousarray(array, dtype=float)
+            digest.update(str(array.shape).encode('utf-8'))
+            digest.update(array.tobytes())
+        settings = sorted((name, _describe(value)) for name, value in solver.items())
+        if any(described is None for _, described in settings):
+            return None
+        digest.update(repr(settings).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        :param key: hash returned by key
+        :return: the stored states (read-only) and solver statistics, or None if the result is not in the cache
+        """
+        if key in self._memory:
+            self._memory[key] = self._memory.pop(key)
+            self.hits += 1
+            return self._memory[key]
+        path = self._path(key, '.npy')
+        try:
+            y = np.load(path, mmap_mode='r')
+            with open(self._path(key, '.json')) as inFile:
+                stats = json.load(inFile)
+            # the access time is updated by hand: file systems are often mounted without it
+            os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, (y, stats))
+        return y, stats
+
+    def put(self, key, y, stats):
+        """
+        Stores a result. The files are written under temporary names and renamed, so other processes never read a
+        partial result
+        :param key: hash returned by key
+        :param y: states of the simulation
+        :param stats: dictionary with the solver statistics (JSON serializable)
+        """
+        y = np.array(y, dtype=float)
+        y.setflags(write=False)
+        self._remember(key, (y, stats))
+        folder = os.path.dirname(self._path(key, '.npy'))
+        if not os.path.isdir(folder):
+            try:
+                os.makedirs(folder)
+            except OSError:
+                # created meanwhile by another process
+                pass
+        self._write(self._path(key, '.npy'), lambda outFile: np.save(outFile, y))
+        self._write(self._path(key, '.json'), lambda outFile: outFile.write(json.dumps(stats).encode('utf-8')))
+        if self._size > self.maxBytes:
+            self.evict()
+
+    def _write(self, path, write):
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(handle, 'wb') as outFile:
+            write(outFile)
+        # the same result may be stored again (e.g. by another process): the old file no longer counts
+        previous = _sizeOf(path)
+        _replace(temporary, path)
+        self._size += _sizeOf(path) - previous
+
+    def _remember(self, key, result):
+        self._memory.pop(key, None)
+        self._memory[key] = result
+        while len(self._memory) > self.memoryItems:
+            self._memory.popitem(last=False)
+
+    def evict(self):
+        """
+        Deletes the least recently used results until the files fit in maxBytes
+        """
+        results = []
+        for path in self._files():
+            if path.endswith('.npy'):
+                try:
+                    results.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        self._size = sum(_sizeOf(path) for path in self._files())
+        for _, path in sorted(results):
+            if self._size <= self.maxBytes:
+                break
+            for stale in (path, path[:-4] + '.json'):
+                self._size -= _sizeOf(stale)
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            self._memory.pop(os.path.basename(path)[:-4], None)
+
+    def clear(self):
+        """
+        Deletes all the stored results
+        """
+        for path in list(self._files()):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._memory.clear()
+        self._size = 0
+
+    def info(self):
+        """
+        :return: dictionary with the number of hits and misses, the results in memory and the size of the files
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'memoryItems': len(self._memory), 'bytes': self._size}
+    # =======================================================
+
+
+# CACHE USED BY THE SIMULATIONS
+# =======================================================
+_cache = None
+
+
+def enable(directory='simulationCache', maxBytes=2 ** 30, memoryItems=128):
+    """
+    Turns on the cache for simulation.solve and everything that uses it (ObjectiveFunction, objFun,
+    plotSim.plotParameters...)
+    :param directory: directory of the cache
+    :param maxBytes: maximum total size of the files
+    :param memoryItems: number of results kept in memory
+    :return: the TrajectoryCache
+    """
+    global _cache
+    _cache = TrajectoryCache(directory, maxBytes, memoryItems)
+    return _cache
+
+
+def disable():
+    """
+    Turns off the cache; the files are kept
+    """
+    global _cache
+    _cache = None
+
+
+def current():
+    """
+    :return: the TrajectoryCache in use, or None if the cache is off
+    """
+    return _cache
+    # =======================================================
@@ -0,0 +1,264 @@
+#!/usr/bin/python
+########################################################
+# continuation.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Pseudo-arclength continuation of the
+#   steady state before the glucose pulse along one
+#   parameter, with its stability at every point and
+#   detection of folds (saddle-node) and Hopf points
+# Reference: Chassagnole et al, 2002
+# Reference: Kuznetsov, Elements of Applied Bifurcation
+#   Theory, 2004
+########################################################
+import inspect
+import re
+from collections import namedtuple
+
+import numpy as np
+
+import equations
+from equations import REACTIONS, STOICHIOMETRY, eqs
+from jacobian import jac, jac_par
+from stability import GUESS
+from steadyState import find_steady_state
+
+
+# names of the entries of par and constants of the rate laws (lines such as 'rmaxPTS = par[103]', 'cfeed = 111.1')
+_SOURCE = inspect.getsource(equations.rates)
+PARAMETERS = [name for name, _ in sorted(re.findall(r'^\s*(\w+) = par\[(\d+)\]\s*$', _SOURCE, re.M),
+                                         key=lambda found: int(found[1]))]
+FIXED = dict((name, float(value)) for name, value in re.findall(r'^\s*(\w+) = ([-+.\deE]+)\s*$', _SOURCE, re.M))
+
+# glucose feed: vEXTER = Dil * (cfeed - cglcex) is linear in both constants, which enter no other rate law
+_EXTER = STOICHIOMETRY[:, REACTIONS.index('vEXTER')]
+_GLCEX = equations.SPECIES.index('cglcex')
+
+Branch = namedtuple('Branch', ['parameter', 'states', 'eigenvalues', 'stable', 'points', 'stats'])
+Bifurcation = namedtuple('Bifurcation', ['kind', 'index', 'parameter', 'state', 'eigenvalues'])
+
+
+# STEADY STATE EQUATIONS ALONG A PARAMETER
+# =======================================================
+def parameterProblem(par, parameter, t=0.0):
+    """
+    Steady state equations of the model as functions of the concentrations and of one parameter
+    :param par: parameters passed to the model
+    :param parameter: the parameter that varies: an index of par, one of the names in PARAMETERS (e.g. 'rmaxPTS'),
+    or one of the constants 'cfeed' (glucose in the feed) and 'Dil' (dilution rate of the extracellular glucose),
+    which are fixed in equations.rates and enter only vEXTER, linearly
+    :param t: time at which the equations are evaluated (t <= 0 is before the pulse)
+    :return: functions G(x, lam), Gx(x, lam) (Jacobian with respect to the species) and Glam(x, lam) (derivative
+    with respect to the parameter), and the value of the parameter in par (or in equations.rates)
+    """
+    par = np.array(par, dtype=float)
+
+    if parameter in ('cfeed', 'Dil'):
+        cfeed, dil = FIXED['cfeed'], FIXED['Dil']
+        if parameter == 'cfeed':
+            G = lambda x, lam: eqs(x, t, par) + _EXTER * dil * (lam - cfeed)
+            Gx = lambda x, lam: jac(x, t, par)
+            Glam = lambda x, lam: _EXTER * dil
+            return G, Gx, Glam, cfeed
+
+        def Gx(x, lam):
+            J = jac(x, t, par)
+            J[:, _GLCEX] -= _EXTER * (lam - dil)
+            return J
+
+        G = lambda x, lam: eqs(x, t, par) + _EXTER * (lam - dil) * (cfeed - x[_GLCEX])
+        Glam = lambda x, lam: _EXTER * (cfeed - x[_GLCEX])
+        return G, Gx, Glam, dil
+
+    k = PARAMETERS.index(parameter) if parameter in PARAMETERS else int(parameter)
+
+    def withValue(lam):
+        p = np.array(par)
+        p[k] = lam
+        return p
+
+    G = lambda x, lam: eqs(x, t, withValue(lam))
+    Gx = lambda x, lam: jac(x, t, withValue(lam))
+    Glam = lambda x, lam: jac_par(x, t, withValue(lam))[:, k]
+    return G, Gx, Glam, par[k]
+    # =======================================================
+
+
+# PSEUDO-ARCLENGTH CONTINUATION
+# =======================================================
+def _tangent(A, previous):
+    # unit vector of the null space of A (n x (n + 1)), oriented along the previous tangent
+    v = np.linalg.solve(np.vstack([A, previous]), np.append(np.zeros(len(A)), 1.0))
+    return v / np.linalg.norm(v)
+
+
+def _correct(G, A, prediction, tangent, n, scale, tol, maxIter):
+    # Newton iterations on G = 0 and tangent.(z - prediction) = 0; None if they do not converge
+    z = prediction
+    for iteration in range(maxIter):
+        F = G(z[:n], z[n] * scale)
+        if not np.all(np.isfinite(F)):
+            return None, iteration
+        if np.linalg.norm(F) <= tol and iteration > 0:
+            return z, iteration
+        try:
+            z = z + np.linalg.solve(np.vstack([A(z), tangent]), -np.append(F, np.dot(tangent, z - prediction)))
+        except np.linalg.LinAlgError:
+            return None, iteration
+    return None, maxIter
+
+
+def _locate(test, G, A, y0, y1, t0, t1, f0, f1, n, scale, tol, maxIter, iterations=20):
+    # zero of a test function between two points of the curve, by regula falsi (Illinois) on the position between
+    # them; every trial point is interpolated and corrected back onto the curve
+    a, b = 0.0, 1.0
+    z = y0 if abs(f0) < abs(f1) else y1
+    side = 0
+    for _ in range(iterations):
+        w = (a * f1 - b * f0) / (f1 - f0)
+        direction = (1 - w) * t0 + w * t1
+        direction /= np.linalg.norm(direction)
+        trial, _ = _correct(G, A, (1 - w) * y0 + w * y1, direction, n, scale, tol, maxIter)
+        if trial is None:
+            break
+        z = trial
+        f = test(z, direction)
+        if not np.isfinite(f) or abs(f) <= 1e-12 * max(abs(f0), abs(f1)):
+            break
+        if f * f0 < 0:
+            b, f1 = w, f
+            f0 = f0 / 2.0 if side == -1 else f0
+            side = -1
+        else:
+            a, f0 = w, f
+            f1 = f1 / 2.0 if side == 1 else f1
+            side = 1
+        if b - a < 1e-12:
+            break
+    return z
+
+
+def _hopfTest(eigenvalues, oscillationTol):
+    # largest real part among the complex eigenvalues, -inf if there are none
+    complexPart = np.abs(np.imag(eigenvalues)) > oscillationTol * np.max(np.abs(eigenvalues))
+    return np.max(np.real(eigenvalues[complexPart])) if np.any(complexPart) else -np.inf
+
+
+def continueCurve(G, Gx, Glam, x0, lam0, bounds, ds=0.01, dsMin=1e-8, dsMax=0.1, maxSteps=1000, tol=1e-10,
+                  maxIter=8, scale=None, positive=True, oscillationTol=1e-9):
+    """
+    Follows the curve of solutions of G(x, lam) = 0 from (x0, lam0) with pseudo-arclength continuation. Every step
+    predicts along the tangent of the curve, y = y0 + ds t, and corrects with Newton iterations on G = 0 plus the
+    condition t.(y - prediction) = 0, whose matrix stays regular at folds, where the curve turns back in lam.
+    The step grows while the corrector converges quickly and is halved when it fails.
+    Along the curve, the eigenvalues of Gx give the stability. Folds are detected as sign changes of the lam
+    component of the tangent, Hopf points as sign changes of the largest real part among the complex eigenvalues;
+    both are located between the two points around them by regula falsi, with every trial point corrected back
+    onto the curve
+    :param G: function G(x, lam) returning an array of length n
+    :param Gx: Jacobian of G with respect to x, shape (n, n)
+    :param Glam: derivative of G with respect to lam, length n
+    :param x0: solution of G(x0, lam0) = 0
+    :param lam0: initial value of the parameter
+    :param bounds: (lower, upper) values of the parameter where the continuation stops
+    :param ds: initial step along the curve, positive to start towards larger lam (in the scaled variables)
+    :param dsMin: the continuation stops when the step falls below dsMin
+    :param dsMax: maximum step
+    :param maxSteps: maximum number of accepted steps
+    :param tol: tolerance on the norm of G
+    :param maxIter: maximum number of Newton iterations of the corrector
+    :param scale: the parameter is followed as lam / scale, so that it counts like a concentration in the arclength
+    (default |lam0|, or 1 if lam0 is 0)
+    :param positive: reject the points with non-positive concentrations
+    :param oscillationTol: relative size of the imaginary parts taken as complex eigenvalues
+    :return: Branch(parameter, states, eigenvalues, stable, points, stats): the values of the parameter and the
+    states and eigenvalues of Gx along the curve, whether every point is stable, the list of detected
+    Bifurcation(kind, index, parameter, state, eigenvalues) ('fold' or 'hopf', the index of the point after it and
+    the values at the located point) and a dictionary with the accepted and rejected steps, the Newton iterations
+    and why the continuation stopped
+    """
+    if scale is None:
+        scale = abs(lam0) if lam0 != 0 else 1.0
+    lower, upper = bounds
+    n = len(x0)
+    y = np.append(np.asarray(x0, dtype=float), lam0 / scale)
+    A = lambda y: np.column_stack([Gx(y[:n], y[n] * scale), Glam(y[:n], y[n] * scale) * scale])
+    tangent = _tangent(A(y), np.append(np.zeros(n), np.sign(ds) or 1.0))
+    ds = abs(ds)
+
+    curve = [y]
+    tangents = [tangent]
+    eigenvalues = [np.linalg.eigvals(Gx(y[:n], lam0))]
+    stats = {'steps': 0, 'rejected': 0, 'newton': 0, 'message': 'maximum number of steps reached'}
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        while stats['steps'] < maxSteps:
+            z, iteration = _correct(G, A, y + ds * tangent, tangent, n, scale, tol, maxIter)
+            stats['newton'] += iteration
+            if z is None or (positive and not np.all(z[:n] > 0)):
+                stats['rejected'] += 1
+                ds /= 2.0
+                if ds < dsMin:
+                    stats['message'] = 'step size too small'
+                    break
+                continue
+
+            stats['steps'] += 1
+            tangent = _tangent(A(z), tangent)
+            y = z
+            curve.append(y)
+            tangents.append(tangent)
+            eigenvalues.append(np.linalg.eigvals(Gx(y[:n], y[n] * scale)))
+            ds = min(dsMax, ds * (1.5 if iteration <= 3 else 1.0))
+            if not lower <= y[n] * scale <= upper:
+                stats['message'] = 'parameter bound reached'
+                break
+
+    curve = np.array(curve)
+    eigenvalues = np.array(eigenvalues)
+    tests = {'fold': lambda z, direction: _tangent(A(z), direction)[n],
+             'hopf': lambda z, direction: _hopfTest(np.linalg.eigvals(Gx(z[:n], z[n] * scale)), oscillationTol)}
+    values = {'fold': np.array(tangents)[:, n], 'hopf': np.array([_hopfTest(e, oscillationTol) for e in eigenvalues])}
+    points = []
+    for i in range(1, len(curve)):
+        for kind in ('fold', 'hopf'):
+            before, after = values[kind][i - 1], values[kind][i]
+            if np.isfinite(before) and np.isfinite(after) and before * after < 0:
+                z = _locate(tests[kind], G, A, curve[i - 1], curve[i], tangents[i - 1], tangents[i], before, after,
+                            n, scale, tol, maxIter)
+                points.append(Bifurcation(kind, i, z[n] * scale, z[:n], np.linalg.eigvals(Gx(z[:n], z[n] * scale))))
+
+    stable = np.max(np.real(eigenvalues), axis=1) < 0
+    return Branch(curve[:, n] * scale, curve[:, :n], eigenvalues, stable, points, stats)
+    # =======================================================
+
+
+# CONTINUATION OF THE MODEL
+# =======================================================
+def continuation(par, parameter, bounds, guess=GUESS, t=0.0, direction=1, **options):
+    """
+    Follows the steady state before the glucose pulse as one parameter varies, starting from the value in par. The
+    first steady state is found with steadyState.find_steady_state; every following one is predicted from the last
+    and corrected, so the whole branch costs a few Newton iterations per point instead of one long integration per
+    value of the parameter
+    :param par: parameters passed to the model
+    :param parameter: the parameter that varies, an index of par, a name of PARAMETERS, 'cfeed' or 'Dil' (see
+    parameterProblem)
+    :param bounds: (lower, upper) values of the parameter where the continuation stops
+    :param guess: initial guess of the first steady state
+    :param t: time at which the equations are evaluated (t <= 0 is before the pulse)
+    :param direction: 1 to start towards larger values of the parameter, -1 towards smaller ones
+    :param options: other arguments of continueCurve (ds, dsMax, maxSteps, tol...)
+    :return: Branch, see continueCurve
+    """
+    G, Gx, Glam, lam0 = parameterProblem(par, parameter, t)
+    tol = options.get('tol', 1e-10)
+    start = find_steady_state(par, guess, t, rhs=lambda x, t, p: G(x, lam0), jacobian=lambda x, t, p: Gx(x, lam0),
+                              tol=tol)
+    if start.residual > tol:
+        raise ValueError('no steady state found at the initial value of {0} (residual {1})'.format(parameter,
+                                                                                                start.residual))
+    ds = options.pop('ds', 0.01)
+    return continueCurve(G, Gx, Glam, start.state, lam0, bounds, ds=direction * ds, **options)
+    # =======================================================
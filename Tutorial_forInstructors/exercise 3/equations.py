@@ -2,23 +2,142 @@
 ########################################################
 # equations.py
 # Author: Veronica Llorens-Rico
-# Version: 1.1
+# Version: 1.2
 # Date: December 2015
+# Last update: October 2026
 # Description: Defines differential equations of the
 #   central carbon metabolism of E. coli
 # Reference: Chassagnole et al, 2002
 ########################################################
+import numpy as np
 
 
-# DIF EQUATION SYSTEM
+# STOICHIOMETRY
 # =======================================================
-def eqs(init, t, par):
+# mass balance of every species, in the order of the state vector: coefficient of every reaction in its derivative
+# (the volumes of the cytosol and of the extracellular compartment are both 1)
+BALANCES = [('cdhap', {'vALDO': 1, 'vDHAP': -1, 'vG3PDH': -1, 'vTIS': -1}),
+            ('ce4p', {'vDAHPS': -1, 'vE4P': -1, 'vTA': 1, 'vTKB': -1}),
+            ('cpg2', {'vENO': -1, 'vpg2': -1, 'vrpGluMu': 1}),
+            ('cpg3', {'vPG3': -1, 'vPGK': 1, 'vrpGluMu': -1, 'vsersynth': -1}),
+            ('cpgp', {'vGAPDH': 1, 'vPGK': -1, 'vPGP': -1}),
+            ('crib5p', {'vPPK': -1, 'vR5PI': 1, 'vRIB5P': -1, 'vTKA': -1}),
+            ('cribu5p', {'vPGDH': 1, 'vR5PI': -1, 'vRibu5p': -1, 'vRu5P': -1}),
+            ('csed7p', {'vSED7P': -1, 'vTA': -1, 'vTKA': 1}),
+            ('cxyl5p', {'vRu5P': 1, 'vTKA': -1, 'vTKB': -1, 'vXYL5P': -1}),
+            ('cf6p', {'vMURSyNTH': -2, 'vPFK': -1, 'vPGI': 1, 'vTA': 1, 'vTKB': 1, 'vf6P': -1}),
+            ('cfdp', {'vALDO': -1, 'vPFK': 1, 'vfdP': -1}),
+            ('cg1p', {'vG1PAT': -1, 'vGLP': -1, 'vPGM': 1}),
+            ('cg6p', {'vG6P': -1, 'vG6PDH': -1, 'vPGI': -1, 'vPGM': -1, 'vPTS': 64.82759}),
+            ('cgap', {'vALDO': 1, 'vGAP': -1, 'vGAPDH': -1, 'vTA': -1, 'vTIS': 1, 'vTKA': 1, 'vTKB': 1,
+                      'vTRPSYNTH': 1}),
+            ('cglcex', {'vEXTER': 1, 'vPTS': -1}),
+            ('cpep', {'vDAHPS': -1, 'vENO': 1, 'vPEP': -1, 'vPK': -1, 'vPTS': -64.82759, 'vSynth1': -1,
+                      'vpepCxylase': -1}),
+            ('cpg', {'vG6PDH': 1, 'vPG': -1, 'vPGDH': -1}),
+            ('cpyr', {'vMethSynth': 1, 'vPDH': -1, 'vPK': 1, 'vPTS': 64.82759, 'vSynth2': -1, 'vTRPSYNTH': 1,
+                      'vpyr': -1})]
+
+SPECIES = [name for name, _ in BALANCES]
+
+# reactions, in the order of the rates returned by rates()
+REACTIONS = ['vALDO', 'vDAHPS', 'vDHAP', 'vE4P', 'vENO', 'vEXTER', 'vG1PAT', 'vG3PDH', 'vG6P', 'vG6PDH', 'vGAP',
+             'vGAPDH', 'vGLP', 'vMURSyNTH', 'vMethSynth', 'vPDH', 'vPEP', 'vPFK', 'vPG', 'vPG3', 'vPGDH', 'vPGI',
+             'vPGK', 'vPGM', 'vPGP', 'vPK', 'vPPK', 'vPTS', 'vR5PI', 'vRIB5P', 'vRibu5p', 'vRu5P', 'vSED7P', 'vSynth1',
+             'vSynth2', 'vTA', 'vTIS', 'vTKA', 'vTKB', 'vTRPSYNTH', 'vXYL5P', 'vf6P', 'vfdP', 'vpepCxylase', 'vpg2',
+             'vpyr', 'vrpGluMu', 'vsersynth']
+
+# stoichiometric matrix, species x reactions
+STOICHIOMETRY = np.array([[balance.get(reaction, 0.0) for reaction in REACTIONS] for _, balance in BALANCES])
+# =======================================================
+
+
+# COFACTOR CONCENTRATIONS
+# =======================================================
+# metabolites that are not integrated but defined by an analytical expression of time
+COFACTORS = ['cadp', 'camp', 'catp', 'cnad', 'cnadh', 'cnadp', 'cnadph']
+
+# their concentrations before the perturbation (t <= 0)
+STEADY_COFACTORS = (0.582, 0.123, 4.27, 1.314, 0.0934, 0.159, 0.062)
+
+
+def pulseCofactors(t):
     """
-    Reads the parameters from a file and describes the differential equations of the model (Chassagnole et al, 2002)
-    :param init: initial conditions
+    Analytical expressions of the cofactor concentrations after the glucose pulse (t > 0). Works on a single time
+    or on an array of times
+    :param t: time after the perturbation
+    :return: returns cadp, camp, catp, cnad, cnadh, cnadp, cnadph
+    """
+    cadp = 0.582 + 1.73 * 2.731 ** (-0.15 * t) * (0.12 * t + 0.000214 * t ** 3)
+    camp = 0.123 + 7.25 * (t / (7.25 + 1.47 * t + 0.17 * t ** 2)) + 1.073 / (1.29 + 8.05 * t)
+    catp = 4.27 - 4.163 * (t / (0.657 + 1.43 * t + 0.0364 * t ** 2))
+    cnad = 1.314 + 1.314 * 2.73 ** (-0.0435 * t - 0.342) - (t + 7.871) * (
+           2.73 ** (-0.0218 * t - 0.171) / (8.481 + t))
+    cnadh = 0.0934 + 0.00111 * 2.371 ** (-0.123 * t) * (0.844 * t + 0.104 * t ** 3)
+    cnadp = 0.159 - 0.00554 * (t / (2.8 - 0.271 * t + 0.01 * t ** 2)) + 0.182 / (4.82 + 0.526 * t)
+    cnadph = 0.062 + 0.332 * 2.718 ** (-0.464 * t) * (
+        0.0166 * t ** 1.58 + 0.000166 * t ** 4.73 + 0.1312 * 10 ** (-9) * t ** 7.89 + 0.1362 * 10 ** (
+            -12) * t ** 11 + 0.1233 * 10 ** (-15) * t ** 14.2)
+
+    return cadp, camp, catp, cnad, cnadh, cnadp, cnadph
+
+
+# profile of the cofactors after the pulse used by the rate laws
+_cofactorProfile = pulseCofactors
+
+
+def setCofactorProfile(profile=None):
+    """
+    Replaces the cofactor concentrations used by the rate laws after the pulse, e.g. with a
+    cofactorTable.CofactorTable of measured profiles. The rate laws do not change
+    :param profile: function of the time (a single time or an array) returning the seven cofactor concentrations
+    in the order of COFACTORS. None restores the analytical expressions
+    """
+    global _cofactorProfile
+    _cofactorProfile = pulseCofactors if profile is None else profile
+
+
+def cofactors(t):
+    """
+    Concentrations of the metabolites that are not integrated but defined by an analytical expression of time
+    (ADP, AMP, ATP, NAD, NADH, NADP and NADPH)
+    :param t: time of the integration, or array of times
+    :return: returns cadp, camp, catp, cnad, cnadh, cnadp, cnadph
+    """
+    if isinstance(t, np.ndarray):
+        # one time per column of a batch
+        return tuple(cofactors_batch(t))
+    # The perturbation occurs at time=0, so if t>0 the metabolites concentration will change according to the
+    # active profile (by default, the analytical expressions in pulseCofactors)
+    if t > 0.0:
+        return _cofactorProfile(t)
+    return STEADY_COFACTORS
+
+
+def cofactors_batch(times):
+    """
+    Cofactor concentrations at many times at once, for the integrators that advance several times together
+    :param times: array of times
+    :return: array of shape (7, len(times)), rows in the order of COFACTORS
+    """
+    times = np.asarray(times, dtype=float)
+    after = times > 0.0
+    # the profile is only valid after the pulse, so it is evaluated at t=0 where the constants apply
+    values = np.array(_cofactorProfile(np.where(after, times, 0.0)), dtype=float).reshape(len(COFACTORS), -1)
+    return np.where(after, values, np.array(STEADY_COFACTORS)[:, np.newaxis])
+    # =======================================================
+
+
+# REACTION RATES
+# =======================================================
+def rates(init, t, par):
+    """
+    Rate laws of the model (Chassagnole et al, 2002). This is the only place where they are written: the
+    differential equations, the fluxes at steady state and the Jacobian are all computed from these rates
+    :param init: concentrations of the species
     :param t: time of the integration
     :param par: parameters passed to the model
-    :return: returns the diff equations to be solved by the function odeint
+    :return: array with the rate of every reaction, in the order of REACTIONS
     """
 
     # Assign parameters to the different variable names
@@ -166,28 +285,8 @@ def eqs(init, t, par):
     cpg = init[16]
     cpyr = init[17]
 
-    # metabolites such as ATP, ADP, AMP... are defined by an analytical expression
-    # The perturbation occurs at time=0, so if t>0 the metabolites concentration will change according to these
-    # functions
-    if t > 0.0:
-        cadp = 0.582 + 1.73 * 2.731 ** (-0.15 * t) * (0.12 * t + 0.000214 * t ** 3)
-        camp = 0.123 + 7.25 * (t / (7.25 + 1.47 * t + 0.17 * t ** 2)) + 1.073 / (1.29 + 8.05 * t)
-        catp = 4.27 - 4.163 * (t / (0.657 + 1.43 * t + 0.0364 * t ** 2))
-        cnad = 1.314 + 1.314 * 2.73 ** (-0.0435 * t - 0.342) - (t + 7.871) * (
-               2.73 ** (-0.0218 * t - 0.171) / (8.481 + t))
-        cnadh = 0.0934 + 0.00111 * 2.371 ** (-0.123 * t) * (0.844 * t + 0.104 * t ** 3)
-        cnadp = 0.159 - 0.00554 * (t / (2.8 - 0.271 * t + 0.01 * t ** 2)) + 0.182 / (4.82 + 0.526 * t)
-        cnadph = 0.062 + 0.332 * 2.718 ** (-0.464 * t) * (
-            0.0166 * t ** 1.58 + 0.000166 * t ** 4.73 + 0.1312 * 10 ** (-9) * t ** 7.89 + 0.1362 * 10 ** (
-                -12) * t ** 11 + 0.1233 * 10 ** (-15) * t ** 14.2)
-    else:
-        cadp = 0.582
-        camp = 0.123
-        catp = 4.27
-        cnad = 1.314
-        cnadh = 0.0934
-        cnadp = 0.159
-        cnadph = 0.062
+    # metabolites such as ATP, ADP, AMP... are defined by an analytical expression of time
+    cadp, camp, catp, cnad, cnadh, cnadp, cnadph = cofactors(t)
 
     vALDO = cytosol * rmaxALDO * (cfdp - cgap * cdhap / kALDOeq) / (
         kALDOfdp + cfdp + kALDOgap * cdhap / (kALDOeq * VALDOblf) + kALDOdhap * cgap / (
@@ -258,25 +357,55 @@ def eqs(init, t, par):
     vrpGluMu = cytosol * rmaxPGluMu * (cpg3 - cpg2 / KPGluMueq) / (KPGluMupg3 * (1 + cpg2 / KPGluMupg2) + cpg3)
     vsersynth = cytosol * rmaxSerSynth * cpg3 / (KSerSynthpg3 + cpg3)
 
-    dcdhap = (vALDO - vDHAP - vG3PDH - vTIS) / cytosol
-    dce4p = (- vDAHPS - vE4P + vTA - vTKB) / cytosol
-    dcf6p = (- 2.0 * vMURSyNTH - vPFK + vPGI + vTA + vTKB - vf6P) / cytosol
-    dcfdp = (- vALDO + vPFK - vfdP) / cytosol
-    dcg1p = (- vG1PAT - vGLP + vPGM) / cytosol
-    dcg6p = (- vG6P - vG6PDH - vPGI - vPGM + 64.82759 * vPTS) / cytosol
-    dcgap = (vALDO - vGAP - vGAPDH - vTA + vTIS + vTKA + vTKB + vTRPSYNTH) / cytosol
-    dcpep = (- vDAHPS + vENO - vPEP - vPK - 64.82759 * vPTS - vSynth1 - vpepCxylase) / cytosol
-    dcpg = (vG6PDH - vPG - vPGDH) / cytosol
-    dcpg2 = (- vENO - vpg2 + vrpGluMu) / cytosol
-    dcpg3 = (- vPG3 + vPGK - vrpGluMu - vsersynth) / cytosol
-    dcpgp = (vGAPDH - vPGK - vPGP) / cytosol
-    dcpyr = (vMethSynth - vPDH + vPK + 64.82759 * vPTS - vSynth2 + vTRPSYNTH - vpyr) / cytosol
-    dcrib5p = (- vPPK + vR5PI - vRIB5P - vTKA) / cytosol
-    dcribu5p = (vPGDH - vR5PI - vRibu5p - vRu5P) / cytosol
-    dcsed7p = (- vSED7P - vTA + vTKA) / cytosol
-    dcxyl5p = (vRu5P - vTKA - vTKB - vXYL5P) / cytosol
-    dcglcex = (vEXTER - vPTS) / extracellular
-
-    return [dcdhap, dce4p, dcpg2, dcpg3, dcpgp, dcrib5p, dcribu5p, dcsed7p, dcxyl5p, dcf6p, dcfdp, dcg1p, dcg6p,
-            dcgap, dcglcex, dcpep, dcpg, dcpyr]
+    v = [vALDO, vDAHPS, vDHAP, vE4P, vENO, vEXTER, vG1PAT, vG3PDH, vG6P, vG6PDH, vGAP, vGAPDH, vGLP, vMURSyNTH,
+         vMethSynth, vPDH, vPEP, vPFK, vPG, vPG3, vPGDH, vPGI, vPGK, vPGM, vPGP, vPK, vPPK, vPTS, vR5PI, vRIB5P,
+         vRibu5p, vRu5P, vSED7P, vSynth1, vSynth2, vTA, vTIS, vTKA, vTKB, vTRPSYNTH, vXYL5P, vf6P, vfdP, vpepCxylase,
+         vpg2, vpyr, vrpGluMu, vsersynth]
+    if np.ndim(cdhap) > np.ndim(rmaxMurSynth):
+        # the zero order rates are scalars when only the concentrations are batched: give them the same shape
+        v = np.broadcast_arrays(*v)
+
+    return np.array(v)
+    # =======================================================
+
+
+# DIF EQUATION SYSTEM
+# =======================================================
+def eqs(init, t, par):
+    """
+    Describes the differential equations of the model (Chassagnole et al, 2002) as dx/dt = N v(x), where N is the
+    constant stoichiometric matrix and v the reaction rates
+    :param init: initial conditions
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: returns the diff equations to be solved by the function odeint
+    """
+    return STOICHIOMETRY.dot(rates(init, t, par))
+    # =======================================================
+
+
+# BATCHED DIF EQUATION SYSTEM
+# =======================================================
+def eqs_batch(init, t, par):
+    """
+    Evaluates the differential equations of the model for many states and parameter sets at once. Every
+    rate law is evaluated on whole columns of the batch, so there is a single Python call per solver step
+    instead of one call per parameter set
+    :param init: array of shape (N, 18), one state per row (same species order as in eqs)
+    :param t: time of the integration, shared by all the rows, or array with the time of every row
+    :param par: array of shape (N, 116), one parameter set per row. A single parameter set of length 116 is
+    shared by all the rows
+    :return: array of shape (N, 18) with the derivatives of every row
+    """
+    init = np.asarray(init, dtype=float)
+    par = np.asarray(par, dtype=float)
+    if init.ndim != 2 or init.shape[1] != 18:
+        raise ValueError('init must have shape (N, 18), got {0}'.format(init.shape))
+    if par.shape[-1] != 116 or (par.ndim == 2 and par.shape[0] != init.shape[0]):
+        raise ValueError('par must have shape (116,) or ({0}, 116), got {1}'.format(init.shape[0], par.shape))
+    if np.ndim(t) > 0 and np.shape(t) != (init.shape[0],):
+        raise ValueError('t must be a single time or have shape ({0},), got {1}'.format(init.shape[0], np.shape(t)))
+
+    # transposed, init[i] and par[i] are whole columns of the batch
+    return np.transpose(eqs(init.T, t, par.T))
     # =======================================================
@@ -0,0 +1,290 @@
+#!/usr/bin/python
+########################################################
+# genJacobian.py
+# Author: Veronica Llorens-Rico
+# Version: 1.1
+# Date: October 2026
+# Description: Generates jacobian.py, the analytical
+#   Jacobian of the differential equations defined in
+#   equations.py with respect to the species and to the
+#   parameters. Run it again whenever the rate laws
+#   change (requires SymPy)
+# Reference: Chassagnole et al, 2002
+########################################################
+import inspect
+import re
+import textwrap
+
+import sympy
+
+import equations
+
+
+COFACTORS = ['cadp', 'camp', 'catp', 'cnad', 'cnadh', 'cnadp', 'cnadph']
+
+HEADER = '''#!/usr/bin/python
+########################################################
+# jacobian.py
+# Generated by genJacobian.py from equations.py, do not
+#   edit by hand
+# Description: Analytical Jacobian of the differential
+#   equations of the central carbon metabolism of E. coli,
+#   with respect to the species and to the parameters
+# Reference: Chassagnole et al, 2002
+########################################################
+from __future__ import division
+import numpy as np
+from scipy import sparse
+
+from equations import cofactors
+'''
+
+
+# NAMES OF THE VARIABLES OF THE MODEL
+# =======================================================
+def variableNames(source, vector):
+    """
+    Finds the names given in the rate laws to the entries of one of its arguments (lines such as 'cdhap = init[0]')
+    :param source: source code of the rates function
+    :param vector: name of the argument, 'init' or 'par'
+    :return: list with the variable names, in the order of the argument
+    """
+    found = re.findall(r'^\s*(\w+) = ' + vector + r'\[(\d+)\]\s*$', source, re.M)
+    names = dict((int(index), name) for name, index in found)
+    return [names[i] for i in range(len(names))]
+    # =======================================================
+
+
+# SYMBOLIC JACOBIAN
+# =======================================================
+def symbolicJacobian():
+    """
+    Evaluates the rate laws on SymPy symbols (with the cofactors as free symbols), builds the equations N v(x) and
+    differentiates every equation with respect to every species and to every parameter
+    :return: state names, parameter names and the lists of (row, column, expression) non-zero entries of the
+    Jacobian with respect to the species and with respect to the parameters
+    """
+    source = inspect.getsource(equations.rates)
+    stateNames = variableNames(source, 'init')
+    parNames = variableNames(source, 'par')
+
+    states = sympy.symbols(stateNames)
+    par = sympy.symbols(parNames)
+    cof = sympy.symbols(COFACTORS)
+
+    # the cofactors only depend on time, so they are constants for the Jacobian
+    original = equations.cofactors
+    equations.cofactors = lambda t: cof
+    try:
+        v = equations.rates(states, 0.0, par)
+    finally:
+        equations.cofactors = original
+
+    # integer coefficients are kept exact, so that the generated code has no spurious 1.0 factors
+    rhs = []
+    for balance in equations.STOICHIOMETRY:
+        rhs.append(sum((sympy.Integer(int(c)) if c == int(c) else sympy.Float(c)) * v[k]
+                       for k, c in enumerate(balance) if c != 0))
+
+    entries = []
+    for row, equation in enumerate(rhs):
+        for col, species in enumerate(states):
+            derivative = sympy.diff(equation, species)
+            if derivative != 0:
+                entries.append((row, col, derivative))
+
+    parEntries = []
+    for row, equation in enumerate(rhs):
+        for col, parameter in enumerate(par):
+            derivative = sympy.diff(equation, parameter)
+            if derivative != 0:
+                parEntries.append((row, col, derivative))
+
+    return stateNames, parNames, entries, parEntries
+    # =======================================================
+
+
+# CODE GENERATION
+# =======================================================
+def code(expr):
+    """
+    :param expr: SymPy expression
+    :return: Python code of the expression. The logarithms (from the derivatives of the powers with respect to their
+    exponents) use NumPy, so that the generated functions also accept arrays
+    """
+    return sympy.pycode(expr, user_functions={'log': 'np.log'})
+    # =======================================================
+
+
+def indexList(indices):
+    """
+    :param indices: row or column indices of the non-zero entries
+    :return: the indices as the body of a Python list, wrapped to the line length of the generated module
+    """
+    return '\n    '.join(textwrap.wrap(', '.join(str(i) for i in indices), 112))
+    # =======================================================
+
+
+def entriesFunction(name, description, expressions, stateNames, parNames):
+    """
+    Writes the code of a function of (init, t, par) that evaluates a list of expressions. Common subexpressions are
+    computed once, and only the states and parameters that appear in the expressions are unpacked
+    :param name: name of the function
+    :param description: first line of its docstring
+    :param expressions: SymPy expressions to evaluate
+    :param stateNames: names of the species, in the order of the state vector
+    :param parNames: names of the parameters, in the order of the parameter vector
+    :return: list with the lines of the function
+    """
+    replacements, reduced = sympy.cse(expressions, symbols=sympy.numbered_symbols('tmp'), optimizations='basic')
+    used = set()
+    for _, expr in replacements:
+        used.update(str(s) for s in expr.free_symbols)
+    for expr in reduced:
+        used.update(str(s) for s in expr.free_symbols)
+
+    lines = ['def {0}(init, t, par):'.format(name),
+             '    """',
+             '    ' + description,
+             '    :param init: concentrations of the species',
+             '    :param t: time of the integration',
+             '    :param par: parameters passed to the model',
+             '    :return: list with the values of the non-zero entries',
+             '    """']
+    for i, parName in enumerate(parNames):
+        if parName in used:
+            lines.append('    {0} = par[{1}]'.format(parName, i))
+    lines.append('')
+    for i, stateName in enumerate(stateNames):
+        if stateName in used:
+            lines.append('    {0} = init[{1}]'.format(stateName, i))
+    lines.append('')
+    lines.append('    {0} = cofactors(t)'.format(', '.join(COFACTORS)))
+    lines.append('')
+    for symbol, expr in replacements:
+        lines.append('    {0} = {1}'.format(symbol, code(expr)))
+    lines.append('')
+    lines.append('    return [')
+    for expr in reduced:
+        lines.append('        {0},'.format(code(expr)))
+    lines.append('    ]')
+    lines.append('    # =======================================================')
+    return lines
+    # =======================================================
+
+
+# MODULE
+# =======================================================
+def generate(fileName='jacobian.py'):
+    """
+    Writes a Python module with the analytical Jacobian of the model, with respect to the species and to the
+    parameters. Common subexpressions are computed once, and only the structurally non-zero entries are evaluated
+    :param fileName: name of the module to write
+    :return: number of non-zero entries of the Jacobian
+    """
+    stateNames, parNames, entries, parEntries = symbolicJacobian()
+    n = len(stateNames)
+
+    lines = [HEADER, '',
+             '# row and column of every structurally non-zero entry of the Jacobian',
+             'ROWS = np.array([\n    {0}])'.format(indexList(row for row, _, _ in entries)),
+             'COLS = np.array([\n    {0}])'.format(indexList(col for _, col, _ in entries)),
+             '',
+             '# sparsity pattern, to be passed as jac_sparsity to the sparse solvers of scipy',
+             'JAC_SPARSITY = sparse.csc_matrix((np.ones(len(ROWS)), (ROWS, COLS)), shape=({0}, {0}))'.format(n),
+             '',
+             '# row and column of every structurally non-zero entry of the derivatives with respect to the parameters',
+             'PAR_ROWS = np.array([\n    {0}])'.format(indexList(row for row, _, _ in parEntries)),
+             'PAR_COLS = np.array([\n    {0}])'.format(indexList(col for _, col, _ in parEntries)),
+             '', '',
+             '# NON-ZERO ENTRIES OF THE JACOBIAN',
+             '# =======================================================']
+    lines.extend(entriesFunction('entries', 'Evaluates the structurally non-zero entries of the Jacobian, in the order '
+                                 'given by ROWS and COLS', [expr for _, _, expr in entries], stateNames, parNames))
+    lines.extend(['', '',
+                  '# NON-ZERO DERIVATIVES WITH RESPECT TO THE PARAMETERS',
+                  '# ======================================================='])
+    lines.extend(entriesFunction('parameterEntries', 'Evaluates the structurally non-zero derivatives of the equations '
+                                 'with respect to the parameters, in the order\n    given by PAR_ROWS and PAR_COLS',
+                                 [expr for _, _, expr in parEntries], stateNames, parNames))
+    lines.append('')
+    lines.append('''
+# DENSE JACOBIAN
+# =======================================================
+def jac(init, t, par):
+    """
+    Analytical Jacobian of the differential equations of the model, with the same arguments as eqs. It can be
+    passed to odeint as Dfun to avoid building the Jacobian by finite differences
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: array of shape ({0}, {0}), J[i, j] is the derivative of equation i with respect to species j
+    """
+    J = np.zeros(({0}, {0}))
+    J[ROWS, COLS] = entries(init, t, par)
+    return J
+    # =======================================================
+
+
+# SPARSE JACOBIAN
+# =======================================================
+def jac_sparse(init, t, par):
+    """
+    Analytical Jacobian of the differential equations of the model as a sparse matrix, for the solvers of
+    scipy.integrate.solve_ivp (BDF, Radau) that can exploit it
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: scipy.sparse.csc_matrix of shape ({0}, {0})
+    """
+    return sparse.csc_matrix((entries(init, t, par), (ROWS, COLS)), shape=({0}, {0}))
+    # =======================================================
+
+
+# BATCHED JACOBIAN
+# =======================================================
+def jac_batch(init, t, par):
+    """
+    Jacobians of many states and parameter sets at once, with the same arguments as equations.eqs_batch
+    :param init: array of shape (N, {0}), one state per row
+    :param t: time of the integration, shared by all the rows, or array with the time of every row
+    :param par: array of shape (N, number of parameters), one parameter set per row, or a single parameter set
+    shared by all the rows
+    :return: array of shape (N, {0}, {0})
+    """
+    init = np.asarray(init, dtype=float)
+    par = np.asarray(par, dtype=float)
+    # transposed, every entry is evaluated on whole columns of the batch
+    values = np.array(np.broadcast_arrays(*entries(init.T, t, par.T)))
+    J = np.zeros((len(init), {0}, {0}))
+    J[:, ROWS, COLS] = values.T
+    return J
+    # =======================================================
+
+
+# DERIVATIVES WITH RESPECT TO THE PARAMETERS
+# =======================================================
+def jac_par(init, t, par):
+    """
+    Derivatives of the differential equations of the model with respect to the parameters, with the same arguments
+    as eqs. They are the inhomogeneous term of the forward sensitivity equations, dS/dt = J S + jac_par
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: array of shape ({0}, {1}), P[i, k] is the derivative of equation i with respect to parameter k
+    """
+    P = np.zeros(({0}, {1}))
+    P[PAR_ROWS, PAR_COLS] = parameterEntries(init, t, par)
+    return P
+    # =======================================================
+'''.format(n, len(parNames)))
+
+    with open(fileName, 'w') as outFile:
+        outFile.write('\n'.join(lines))
+
+    return len(entries)
+    # =======================================================
+
+
+if __name__ == '__main__':
+    print('jacobian.py written, {0} non-zero entries'.format(generate()))
@@ -0,0 +1,452 @@
+#!/usr/bin/python
+########################################################
+# simulation.py
+# Author: Veronica Llorens-Rico
+# Version: 1.3
+# Date: October 2026
+# Description: Simulation of the model with a choice of
+#   ODE solvers, and of the glucose pulse experiment:
+#   steady state before the pulse and response after
+#   it, integrated as two phases that meet at the
+#   discontinuity at t=0. Long runs can stop as soon as
+#   the steady state is reached
+# Reference: Chassagnole et al, 2002
+# Reference: Shampine and Reichelt, 1997
+########################################################
+import time
+from collections import namedtuple
+
+import numpy as np
+from scipy import integrate, linalg
+
+import cache
+from equations import SPECIES, eqs
+from jacobian import jac
+from sparseJacobian import ColoredJacobian
+
+
+Trajectory = namedtuple('Trajectory', ['y', 'stats'])
+PulseSimulation = namedtuple('PulseSimulation', ['t', 'y', 'stats'])
+SteadyRun = namedtuple('SteadyRun', ['t', 'y', 'state', 'tSteady', 'status', 'stats'])
+
+# first time after the pulse: the cofactors follow their post-pulse expressions for any t > 0
+_AFTER_PULSE = np.nextafter(0.0, 1.0)
+
+# solver settings for the usual tasks, to be passed as solve(..., **PRESETS[name])
+PRESETS = {
+    # what the tutorial has always used: LSODA through odeint with its default tolerances
+    'default': {'method': 'odeint'},
+    # objective function evaluations: the data has a few percent of noise, so tighter tolerances are wasted
+    'fitting': {'method': 'odeint', 'rtol': 1e-6, 'atol': 1e-8},
+    # long runs towards the steady state, where the problem is stiffest and the steps grow large
+    'long': {'method': 'BDF', 'rtol': 1e-6, 'atol': 1e-9},
+    # reference solutions
+    'accurate': {'method': 'Radau', 'rtol': 1e-10, 'atol': 1e-12},
+}
+
+
+def _stats(nfev, njev, steps, start, message, success):
+    return {'nfev': int(nfev), 'njev': int(njev), 'steps': int(steps), 'time': time.time() - start,
+            'message': message, 'success': bool(success)}
+
+
+def _jacobianCalls(jacobian):
+    # evaluations of the right hand side made by a finite difference Jacobian (sparseJacobian.ColoredJacobian)
+    return getattr(jacobian, 'evaluations', 0)
+
+
+def _tolerances(options, rtol, atol):
+    if rtol is not None:
+        options['rtol'] = rtol
+    if atol is not None:
+        options['atol'] = atol
+    return options
+
+
+# BACKENDS
+# =======================================================
+def _odeint(rhs, y0, times, par, jacobian, sparsity, rtol, atol, options):
+    start = time.time()
+    before = _jacobianCalls(jacobian)
+    y, info = integrate.odeint(rhs, y0, times, args=(par,), Dfun=jacobian, full_output=True,
+                               **_tolerances(options, rtol, atol))
+    last = lambda key: info[key][-1] if len(info[key]) else 0
+    nfev = last('nfe') + _jacobianCalls(jacobian) - before
+    return Trajectory(y, _stats(nfev, last('nje'), last('nst'), start, info['message'],
+                                info['message'] == 'Integration successful.'))
+
+
+def _solveIvp(method):
+    def backend(rhs, y0, times, par, jacobian, sparsity, rtol, atol, options):
+        start = time.time()
+        before = _jacobianCalls(jacobian)
+        options = _tolerances(options, rtol, atol)
+        if jacobian is not None:
+            options['jac'] = lambda t, y: jacobian(y, t, par)
+        elif sparsity is not None and method != 'LSODA':
+            options['jac_sparsity'] = sparsity
+        # without t_eval every step is kept, and the states at the requested times come from the dense output
+        sol = integrate.solve_ivp(lambda t, y: rhs(y, t, par), (times[0], times[-1]), y0, method=method,
+                                  dense_output=True, **options)
+        y = np.full((len(times), len(y0)), np.nan)
+        reached = times <= sol.t[-1]
+        y[reached] = sol.sol(times[reached]).T if len(sol.t) > 1 else y0
+        nfev = sol.nfev + _jacobianCalls(jacobian) - before
+        return Trajectory(y, _stats(nfev, sol.njev, len(sol.t) - 1, start, sol.message, sol.success))
+    return backend
+
+
+def rosenbrock(rhs, y0, times, par, jacobian=None, sparsity=None, rtol=None, atol=None, options=None):
+    """
+    Rosenbrock method of order 2 with an error estimate of order 3 (Shampine and Reichelt, 1997, as in ode23s of
+    MATLAB). Being linearly implicit, every step solves three linear systems with the same matrix I - h d J instead
+    of Newton iterations. The states at the requested times are interpolated with cubic Hermite polynomials
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param y0: initial conditions at times[0]
+    :param times: increasing times at which the state is reported
+    :param par: parameters passed to the model
+    :param jacobian: Jacobian of rhs, with the same arguments (None for forward differences)
+    :param sparsity: not used, the linear systems are dense (solve turns it into a colored Jacobian)
+    :param rtol: relative tolerance (default 1e-6)
+    :param atol: absolute tolerance (default 1e-9)
+    :param options: optional dictionary with the initial step 'first_step', the maximum step 'max_step' and the
+    maximum number of steps 'max_steps'
+    :return: Trajectory(y, stats), with NaN at the times that were not reached
+    """
+    start = time.time()
+    options = options or {}
+    rtol = 1e-6 if rtol is None else rtol
+    atol = 1e-9 if atol is None else atol
+    maxStep = options.get('max_step', np.inf)
+    maxSteps = options.get('max_steps', 100000)
+    d = 1.0 / (2.0 + np.sqrt(2.0))
+    e32 = 6.0 + np.sqrt(2.0)
+    n = len(y0)
+    identity = np.eye(n)
+    counts = {'nfev': 0, 'njev': 0}
+    before = _jacobianCalls(jacobian)
+
+    def f(t, y):
+        counts['nfev'] += 1
+        return np.asarray(rhs(y, t, par), dtype=float)
+
+    def jacobianAt(t, y, F):
+        counts['njev'] += 1
+        if jacobian is not None:
+            return np.asarray(jacobian(y, t, par), dtype=float)
+        J = np.empty((n, n))
+        for j in range(n):
+            delta = np.sqrt(np.finfo(float).eps) * max(abs(y[j]), 1.0)
+            perturbed = np.array(y)
+            perturbed[j] += delta
+            J[:, j] = (f(t, perturbed) - F) / delta
+        return J
+
+    times = np.asarray(times, dtype=float)
+    out = np.full((len(times), n), np.nan)
+    t, y = times[0], np.array(y0, dtype=float)
+    out[0] = y
+    F = f(t, y)
+    tEnd = times[-1]
+    h = options.get('first_step', min(maxStep, 1e-3 * max(tEnd - t, 1.0)))
+    k = 1
+    steps = 0
+    message = 'Integration successful.'
+
+    # stages that leave the positive concentrations give NaN rates: the step is then rejected and shortened
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        while t < tEnd and message == 'Integration successful.':
+            if steps >= maxSteps:
+                message = 'maximum number of steps reached'
+                break
+            J = jacobianAt(t, y, F)
+            # the model depends on time through the cofactors
+            delta = np.sqrt(np.finfo(float).eps) * max(abs(t), 1.0)
+            T = (f(t + delta, y) - F) / delta
+
+            while True:
+                h = min(h, maxStep, tEnd - t)
+                if h < 1e-14 * max(abs(t), 1.0):
+                    message = 'step size too small'
+                    break
+                lu = linalg.lu_factor(identity - h * d * J, check_finite=False)
+                k1 = linalg.lu_solve(lu, F + h * d * T, check_finite=False)
+                F1 = f(t + 0.5 * h, y + 0.5 * h * k1)
+                k2 = linalg.lu_solve(lu, F1 - k1, check_finite=False) + k1
+                yNew = y + h * k2
+                tNew = tEnd if h >= tEnd - t else t + h
+                FNew = f(tNew, yNew)
+                k3 = linalg.lu_solve(lu, FNew - e32 * (k2 - F1) - 2.0 * (k1 - F) + h * d * T, check_finite=False)
+                scale = atol + rtol * np.maximum(np.abs(y), np.abs(yNew))
+                err = np.max(np.abs(h / 6.0 * (k1 - 2.0 * k2 + k3)) / scale)
+                if err <= 1.0:
+                    break
+                h *= max(0.2, 0.8 * err ** (-1.0 / 3.0)) if np.isfinite(err) else 0.1
+            if message != 'Integration successful.':
+                break
+
+            # cubic Hermite interpolation of the requested times inside the step
+            while k < len(times) and times[k] <= tNew:
+                s = (times[k] - t) / h
+                out[k] = ((1 + 2 * s) * (1 - s) ** 2 * y + s * (1 - s) ** 2 * h * F +
+                          s ** 2 * (3 - 2 * s) * yNew + s ** 2 * (s - 1) * h * FNew)
+                k += 1
+            steps += 1
+            t, y, F = tNew, yNew, FNew
+            h *= min(5.0, 0.8 * max(err, 1e-10) ** (-1.0 / 3.0))
+
+    counts['nfev'] += _jacobianCalls(jacobian) - before
+    return Trajectory(out, _stats(counts['nfev'], counts['njev'], steps, start, message,
+                                  message == 'Integration successful.'))
+
+
+SOLVERS = {'odeint': _odeint, 'LSODA': _solveIvp('LSODA'), 'BDF': _solveIvp('BDF'), 'Radau': _solveIvp('Radau'),
+           'rosenbrock': rosenbrock}
+# =======================================================
+
+
+# SOLVER INTERFACE
+# =======================================================
+def solve(rhs, y0, times, par, method='odeint', jacobian=jac, sparsity=None, rtol=None, atol=None, **options):
+    """
+    Integrates the model with one of the backends in SOLVERS, all with the same arguments and results
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param y0: initial conditions at times[0]
+    :param times: increasing times at which the state is reported
+    :param par: parameters passed to the model
+    :param method: 'odeint' (LSODA from ODEPACK), 'LSODA', 'BDF' or 'Radau' (scipy.integrate.solve_ivp) or
+    'rosenbrock' (built-in linearly implicit method)
+    :param jacobian: Jacobian of rhs, with the same arguments. It may return a sparse matrix for BDF and Radau
+    (e.g. jacobian.jac_sparse). None for finite differences
+    :param sparsity: sparsity pattern of the Jacobian (e.g. jacobian.JAC_SPARSITY), used to group the finite
+    differences when no jacobian is given: by BDF and Radau themselves, and through sparseJacobian.ColoredJacobian
+    for the other methods
+    :param rtol: relative tolerance (default, the one of the backend)
+    :param atol: absolute tolerance (default, the one of the backend)
+    :param options: other arguments of the backend (e.g. mxstep for odeint, max_step for solve_ivp)
+    :return: Trajectory(y, stats): the states at the requested times (NaN after a failure, except for odeint) and a
+    dictionary with the evaluations of rhs ('nfev') and of the Jacobian ('njev'), the number of steps ('steps'),
+    the wall time ('time'), the message of the solver and whether it succeeded ('success'). When the cache is on
+    (cache.enable) and the simulation was already run, the stored states (read-only) and statistics are returned
+    instead, with 'cached' set in the statistics
+    """
+    if method not in SOLVERS:
+        raise ValueError('unknown method {0}, choose one of {1}'.format(method, sorted(SOLVERS)))
+    times = np.asarray(times, dtype=float)
+    y0 = np.asarray(y0, dtype=float)
+
+    # only the equations of the model are cached: the cache knows their source code, not that of other functions
+    store = cache.current() if rhs is eqs else None
+    key = None
+    if store is not None:
+        solver = dict(options, method=method, jacobian=jacobian, sparsity=sparsity, rtol=rtol, atol=atol)
+        key = store.key(par, y0, times, solver)
+    if key is not None:
+        found = store.get(key)
+        if found is not None:
+            return Trajectory(found[0], dict(found[1], cached=True))
+
+    if jacobian is None and sparsity is not None and method not in ('BDF', 'Radau'):
+        jacobian = ColoredJacobian(rhs, sparsity)
+    result = SOLVERS[method](rhs, y0, times, par, jacobian, sparsity, rtol, atol, options)
+    if key is not None and result.stats['success']:
+        store.put(key, result.y, result.stats)
+    return result
+    # =======================================================
+
+
+# GLUCOSE PULSE
+# =======================================================
+def simulate_pulse(par, ic, pulse=None, t_pre=None, t_post=None, rhs=eqs, jacobian=jac, out=None, method='odeint',
+                   **options):
+    """
+    Simulates the model before and after the glucose pulse. The solver is stopped exactly at t=0, the pulse is
+    applied to the state reached there, and the solver is restarted on the post-pulse side of the discontinuity,
+    so no step of the integration crosses it
+    :param par: parameters passed to the model
+    :param ic: initial conditions at the first time of t_pre
+    :param pulse: concentrations set at t=0, as a dictionary species -> value (default {'cglcex': 2})
+    :param t_pre: increasing times <= 0 at which the state is reported before the pulse (default -10 to 0 s, step
+    0.1 s, without 0)
+    :param t_post: increasing times >= 0 at which the state is reported after the pulse (default 0 to 350 s, step
+    0.1 s)
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param jacobian: Jacobian of rhs, with the same arguments (None for finite differences)
+    :param out: optional array of shape (len(t_pre) + len(t_post), 18) where the states are written
+    :param method: solver used in both phases (see solve)
+    :param options: other arguments passed to solve in both phases (rtol, atol, sparsity...)
+    :return: PulseSimulation(t, y, stats): all the times, the states at those times (the rows of t_pre followed by
+    the rows of t_post) and a dictionary with the solver statistics of each phase, 'pre' and 'post' (see solve)
+    """
+    if pulse is None:
+        pulse = {'cglcex': 2}
+    t_pre = np.arange(-10, 0, 0.1) if t_pre is None else np.asarray(t_pre, dtype=float)
+    t_post = np.arange(0, 350, 0.1) if t_post is None else np.asarray(t_post, dtype=float)
+    if len(t_pre) == 0 or t_pre[-1] > 0 or np.any(np.diff(t_pre) <= 0):
+        raise ValueError('t_pre must be a non-empty increasing array of times <= 0')
+    if len(t_post) == 0 or t_post[0] < 0 or np.any(np.diff(t_post) <= 0):
+        raise ValueError('t_post must be a non-empty increasing array of times >= 0')
+    unknown = [name for name in pulse if name not in SPECIES]
+    if unknown:
+        raise ValueError('unknown species in the pulse: {0}'.format(unknown))
+
+    nPre = len(t_pre)
+    if out is None:
+        out = np.empty((nPre + len(t_post), len(SPECIES)))
+    elif out.shape != (nPre + len(t_post), len(SPECIES)):
+        raise ValueError('out must have shape ({0}, {1})'.format(nPre + len(t_post), len(SPECIES)))
+
+    # PHASE 1: up to the pulse, always reaching t=0 exactly
+    times = t_pre if t_pre[-1] == 0 else np.append(t_pre, 0.0)
+    y, statsPre = solve(rhs, ic, times, par, method, jacobian, **options)
+    out[:nPre] = y[:nPre]
+
+    # PHASE 2: from the state at t=0, with the pulse applied
+    y0 = np.array(y[-1], dtype=float)
+    for name, value in pulse.items():
+        y0[SPECIES.index(name)] = value
+    skip = 0 if t_post[0] == 0 else 1
+    times = np.concatenate([[_AFTER_PULSE], t_post[1 - skip:]])
+    y, statsPost = solve(rhs, y0, times, par, method, jacobian, **options)
+    out[nPre:] = y[skip:]
+
+    return PulseSimulation(np.concatenate([t_pre, t_post]), out, {'pre': statsPre, 'post': statsPost})
+    # =======================================================
+
+
+# INTEGRATION UP TO THE STEADY STATE
+# =======================================================
+_STEPPERS = {'odeint': integrate.LSODA, 'LSODA': integrate.LSODA, 'BDF': integrate.BDF, 'Radau': integrate.Radau}
+
+# options of odeint and the name of their equivalent in scipy.integrate.LSODA
+_ODEINT_OPTIONS = {'rtol': 'rtol', 'atol': 'atol', 'h0': 'first_step', 'hmax': 'max_step', 'hmin': 'min_step',
+                   'ml': 'lband', 'mu': 'uband'}
+
+
+def missingOptions(method, options):
+    """
+    :param method: method of solve
+    :param options: settings of solve (method, jacobian, sparsity, tolerances and the options of the backend)
+    :return: sorted names of the options that the stepper of makeStepper does not have: with odeint, those that
+    scipy.integrate.LSODA has no equivalent for (e.g. mxstep). Empty for the other methods
+    """
+    if method != 'odeint':
+        return []
+    return sorted(set(options) - set(_ODEINT_OPTIONS) - set(['method', 'jacobian', 'sparsity']))
+
+
+def makeStepper(rhs, y0, t0, tEnd, par, method='LSODA', jacobian=jac, sparsity=None, rtol=None, atol=None,
+                **options):
+    """
+    Solver of scipy.integrate that is advanced one step at a time (with its step method), set up with the arguments
+    of solve, so that it integrates the model as the corresponding backend does
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param y0: initial conditions at t0
+    :param t0: initial time
+    :param tEnd: final time
+    :param par: parameters passed to the model
+    :param method: 'LSODA', 'BDF', 'Radau' or 'odeint', which is replaced by LSODA with the default tolerances of
+    odeint and its options translated (h0, hmax, hmin, ml and mu)
+    :param jacobian: Jacobian of rhs, with the same arguments (None for finite differences)
+    :param sparsity: sparsity pattern of the Jacobian, used as in solve when jacobian is None
+    :param rtol: relative tolerance (default, that of the method)
+    :param atol: absolute tolerance (default, that of the method)
+    :param options: other arguments of the solver. A TypeError is raised for the options of odeint that LSODA does
+    not have (see missingOptions)
+    :return: the scipy.integrate.OdeSolver, at t0
+    """
+    if method not in _STEPPERS:
+        raise ValueError('unknown method {0}, choose one of {1}'.format(method, sorted(_STEPPERS)))
+    options = _tolerances(dict(options), rtol, atol)
+    if method == 'odeint':
+        missing = missingOptions(method, options)
+        if missing:
+            raise TypeError('the odeint options {0} have no equivalent in scipy.integrate.LSODA'.format(missing))
+        options = dict((_ODEINT_OPTIONS[name], value) for name, value in options.items())
+        # default tolerances of odeint
+        options.setdefault('rtol', 1.49012e-8)
+        options.setdefault('atol', 1.49012e-8)
+    if jacobian is None and sparsity is not None and method in ('odeint', 'LSODA'):
+        jacobian = ColoredJacobian(rhs, sparsity)
+    if jacobian is not None:
+        options['jac'] = lambda t, y: jacobian(y, t, par)
+    elif sparsity is not None:
+        options['jac_sparsity'] = sparsity
+    return _STEPPERS[method](lambda t, y: rhs(y, t, par), t0, np.asarray(y0, dtype=float), tEnd, **options)
+
+
+def run_to_steady_state(rhs, y0, times, par, method='LSODA', jacobian=jac, tol=1e-4, dwell=20.0, floor=1e-6,
+                        limit=1e6, rtol=1e-6, atol=1e-9, **options):
+    """
+    Integrates the model one solver step at a time and stops as soon as the answer is known: when the scaled right
+    hand side, max |dx_i/dt| / max(|x_i|, floor), has stayed below tol for at least dwell seconds (steady state),
+    when a concentration exceeds limit (divergence) or when NaNs appear. Oscillations never stop the integration
+    early, as the right hand side keeps coming back above tol
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param y0: initial conditions at times[0]
+    :param times: increasing times at which the state is reported, up to the longest integration wanted
+    :param par: parameters passed to the model
+    :param method: 'LSODA' (also 'odeint', which is not stepwise and is replaced by it), 'BDF' or 'Radau'
+    :param jacobian: Jacobian of rhs, with the same arguments (None for finite differences)
+    :param tol: tolerance on the scaled right hand side, in relative change per second
+    :param dwell: time the scaled right hand side must stay below tol
+    :param floor: concentrations below floor are scaled by floor, so species that vanish count in absolute terms
+    :param limit: concentration above which the simulation is taken as divergent
+    :param rtol: relative tolerance. The test on the right hand side needs an accurate trajectory: with the loose
+    default tolerances of the solvers (rtol=1e-3), the errors of the steps keep the scaled right hand side above tol
+    and the steady state is not detected
+    :param atol: absolute tolerance
+    :param options: other arguments of the solver, as in makeStepper (e.g. max_step)
+    :return: SteadyRun(t, y, state, tSteady, status, stats): the requested times reached before stopping and the
+    states at them, the state where the integration stopped, the time at which the scaled right hand side went
+    below tol for the last time (NaN if the steady state was not reached), the reason to stop ('steady',
+    'diverged', 'nan', 'end' if times[-1] was reached first or 'failed' if the solver failed) and the statistics
+    of the solver as in solve, plus the time where it stopped ('tStop')
+    """
+    start = time.time()
+    times = np.asarray(times, dtype=float)
+    stepper = makeStepper(rhs, y0, times[0], times[-1], par, method, jacobian, None, rtol, atol, **options)
+
+    out = np.full((len(times), len(y0)), np.nan)
+    out[0] = y0
+    k = 1
+    steps = 0
+    checks = 0
+    since = None
+    status = 'end'
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        while stepper.status == 'running':
+            stepper.step()
+            steps += 1
+            if stepper.status == 'failed':
+                status = 'failed'
+                break
+            reached = np.searchsorted(times, stepper.t, side='right')
+            if reached > k:
+                out[k:reached] = stepper.dense_output()(times[k:reached]).T
+                k = reached
+
+            y = stepper.y
+            F = np.asarray(rhs(y, stepper.t, par), dtype=float)
+            checks += 1
+            if not (np.all(np.isfinite(y)) and np.all(np.isfinite(F))):
+                status = 'nan'
+                break
+            if np.max(np.abs(y)) > limit:
+                status = 'diverged'
+                break
+            if np.max(np.abs(F) / np.maximum(np.abs(y), floor)) > tol:
+                since = None
+            elif since is None:
+                since = stepper.t
+            if since is not None and stepper.t - since >= dwell:
+                status = 'steady'
+                break
+
+    # the right hand side evaluated at the end of every step for the test is counted with those of the solver
+    stats = _stats(stepper.nfev + checks, stepper.njev, steps, start, 'Integration stopped: {0}.'.format(status),
+                   status in ('steady', 'end'))
+    stats['tStop'] = float(stepper.t)
+    tSteady = since if status == 'steady' else np.nan
+    return SteadyRun(times[:k], out[:k], np.array(stepper.y), tSteady, status, stats)
+    # =======================================================
@@ -0,0 +1,137 @@
+#!/usr/bin/python
+########################################################
+# stability.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Stability of the steady state before the
+#   glucose pulse for many parameter sets at once (e.g.
+#   all the solutions of a fit): steady states, Jacobians
+#   and eigenvalues computed on whole stacks of them
+# Reference: Chassagnole et al, 2002
+########################################################
+from collections import namedtuple
+
+import numpy as np
+
+from jacobian import jac_batch
+from steadyState import find_steady_states
+
+
+# steady state concentrations before the glucose pulse, used as initial guess
+GUESS = [0.169491,    # cdhap
+         0.0988719,   # ce4p
+         0.39666,     # cpg2
+         2.1185,      # cpg3
+         0.00813025,  # cpgp
+         0.398943,    # crib5p
+         0.11126,     # cribu5p
+         0.273191,    # csed7p
+         0.138348,    # cxyl5p
+         0.597874,    # cf6p
+         0.279883,    # cfdp
+         0.64958,     # cg1p
+         3.46767,     # cg6p
+         0.22137,     # cgap
+         0.0552527,   # cglex
+         2.65434,     # cpep
+         0.804284,    # cpg
+         2.66951]     # cpyr
+
+StabilityTable = namedtuple('StabilityTable', ['maxReal', 'oscillatory', 'slowest', 'fastest', 'stable',
+                                               'converged', 'states', 'eigenvalues'])
+
+
+# EIGENVALUES
+# =======================================================
+def eigenvalues_batch(J, chunk=5000):
+    """
+    Eigenvalues of a stack of square matrices, with one call of np.linalg.eigvals per chunk of them. Matrices with
+    non-finite entries get NaN eigenvalues instead of stopping the whole stack
+    :param J: array of shape (N, n, n)
+    :param chunk: number of matrices per call, to bound the memory used
+    :return: complex array of shape (N, n)
+    """
+    J = np.asarray(J, dtype=float)
+    eigenvalues = np.full(J.shape[:2], np.nan, dtype=complex)
+    finite = np.where(np.all(np.isfinite(J), axis=(1, 2)))[0]
+    for start in range(0, len(finite), chunk):
+        rows = finite[start:start + chunk]
+        eigenvalues[rows] = np.linalg.eigvals(J[rows])
+    return eigenvalues
+    # =======================================================
+
+
+# STABILITY SCREENING
+# =======================================================
+def classify(eigenvalues, oscillationTol=1e-9):
+    """
+    Summary of the eigenvalues of the Jacobian at the steady state of every set
+    :param eigenvalues: complex array of shape (N, n)
+    :param oscillationTol: an eigenvalue is oscillatory when its imaginary part is above oscillationTol times the
+    largest modulus among the eigenvalues of its set (rounding leaves tiny imaginary parts on real eigenvalues)
+    :return: dictionary of arrays of length N: 'maxReal' (largest real part), 'oscillatory' (complex eigenvalues
+    present), 'slowest' and 'fastest' (largest and smallest time constants abs(1/real part), in seconds) and
+    'stable' (all the real parts negative)
+    """
+    eigenvalues = np.asarray(eigenvalues, dtype=complex)
+    real = np.real(eigenvalues)
+    scale = np.max(np.abs(eigenvalues), axis=1, initial=0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        timeConstants = np.abs(1.0 / real)
+        return {'maxReal': np.max(real, axis=1),
+                'oscillatory': np.any(np.abs(np.imag(eigenvalues)) > oscillationTol * scale[:, np.newaxis], axis=1),
+                'slowest': np.max(timeConstants, axis=1),
+                'fastest': np.min(timeConstants, axis=1),
+                'stable': np.max(real, axis=1) < 0}
+
+
+def screen_stability(par, guess=GUESS, t=0.0, tol=1e-10, chunk=5000, oscillationTol=1e-9):
+    """
+    Stability of the steady state before the pulse for every parameter set: the steady states are found with
+    steadyState.find_steady_states, the Jacobians with jacobian.jac_batch and the eigenvalues with
+    eigenvalues_batch, all on whole stacks of parameter sets
+    :param par: parameters, array of shape (N, 116) (a single set is also accepted)
+    :param guess: initial guess of the steady state, shared by all the sets or one per set (shape (N, 18))
+    :param t: time at which the equations are evaluated (t <= 0 is before the pulse)
+    :param tol: tolerance on the norm of the residual of the steady states
+    :param chunk: number of Jacobians per call of np.linalg.eigvals
+    :param oscillationTol: relative size of the imaginary parts taken as oscillations (see classify)
+    :return: StabilityTable with one entry per set: maxReal, oscillatory, slowest, fastest and stable as in
+    classify, whether the steady state was found ('converged'), the steady states (shape (N, 18)) and the
+    eigenvalues (shape (N, 18)). Sets whose steady state was not found have NaN eigenvalues and summaries, and
+    are neither stable nor oscillatory
+    """
+    par = np.atleast_2d(np.asarray(par, dtype=float))
+    steady = find_steady_states(par, guess, t, tol=tol)
+    converged = steady.residual <= tol
+
+    J = np.full((len(par),) + 2 * steady.state.shape[1:], np.nan)
+    if np.any(converged):
+        J[converged] = jac_batch(steady.state[converged], t, par[converged])
+    eigenvalues = eigenvalues_batch(J, chunk)
+
+    summary = classify(eigenvalues, oscillationTol)
+    summary['oscillatory'] &= converged
+    return StabilityTable(converged=converged, states=steady.state, eigenvalues=eigenvalues, **summary)
+
+
+def formatTable(table, rows=None):
+    """
+    Text table of the results of screen_stability, one line per parameter set
+    :param table: StabilityTable
+    :param rows: indices of the sets to show (default, all of them)
+    :return: string
+    """
+    rows = np.arange(len(table.maxReal)) if rows is None else np.asarray(rows, dtype=int)
+    lines = ['{0:>6} {1:>12} {2:>6} {3:>11} {4:>12} {5:>12}'.format('set', 'maxReal', 'stable', 'oscillatory',
+                                                                      'slowest (s)', 'fastest (s)')]
+    for i in rows:
+        if not table.converged[i]:
+            lines.append('{0:>6} {1:>12}'.format(i, 'no steady state'))
+            continue
+        lines.append('{0:>6} {1:>12.4g} {2:>6} {3:>11} {4:>12.4g} {5:>12.4g}'.format(
+            i, table.maxReal[i], 'yes' if table.stable[i] else 'no', 'yes' if table.oscillatory[i] else 'no',
+            table.slowest[i], table.fastest[i]))
+    return '\n'.join(lines)
+    # =======================================================
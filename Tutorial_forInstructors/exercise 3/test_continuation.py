@@ -0,0 +1,70 @@
+#!/usr/bin/python
+########################################################
+# test_continuation.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Tests of the pseudo-arclength continuation
+#   of continuation.py on problems with known folds and
+#   Hopf points, and of the derivatives of the model with
+#   respect to a parameter (run with pytest from this
+#   directory)
+# Reference: Kuznetsov, Elements of Applied Bifurcation
+#   Theory, 2004
+########################################################
+import os
+
+import numpy as np
+import pytest
+
+from continuation import continueCurve, parameterProblem
+from readData import params
+from stability import GUESS
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_fold_of_scalar_problem():
+    # G = x^2 - lam: the branch x = sqrt(lam) turns back at the fold (0, 0) into x = -sqrt(lam), which is stable
+    G = lambda x, lam: np.array([x[0] ** 2 - lam])
+    Gx = lambda x, lam: np.array([[2.0 * x[0]]])
+    Glam = lambda x, lam: np.array([-1.0])
+    branch = continueCurve(G, Gx, Glam, [1.0], 1.0, (-1.0, 2.0), ds=-0.05, positive=False)
+    assert branch.stats['message'] == 'parameter bound reached'
+    assert np.allclose(branch.states[:, 0] ** 2, branch.parameter, atol=1e-9)
+    assert [point.kind for point in branch.points] == ['fold']
+    fold = branch.points[0]
+    assert abs(fold.parameter) < 1e-8 and abs(fold.state[0]) < 1e-6
+    assert np.array_equal(branch.stable, branch.states[:, 0] < 0)
+
+
+def test_hopf_of_normal_form():
+    # supercritical Hopf normal form: the origin loses stability at lam = 0 to a pair of eigenvalues lam +- i
+    def G(x, lam):
+        r2 = x[0] ** 2 + x[1] ** 2
+        return np.array([lam * x[0] - x[1] - x[0] * r2, x[0] + lam * x[1] - x[1] * r2])
+
+    def Gx(x, lam):
+        return np.array([[lam - 3 * x[0] ** 2 - x[1] ** 2, -1.0 - 2 * x[0] * x[1]],
+                         [1.0 - 2 * x[0] * x[1], lam - x[0] ** 2 - 3 * x[1] ** 2]])
+
+    Glam = lambda x, lam: np.array(x, dtype=float)
+    branch = continueCurve(G, Gx, Glam, [0.0, 0.0], -1.0, (-1.0, 1.0), ds=0.05, positive=False)
+    assert [point.kind for point in branch.points] == ['hopf']
+    hopf = branch.points[0]
+    assert abs(hopf.parameter) < 1e-8
+    assert np.allclose(np.sort(np.imag(hopf.eigenvalues)), [-1.0, 1.0])
+    assert np.array_equal(branch.stable, branch.parameter < 0)
+
+
+@pytest.mark.parametrize('parameter', ['rmaxPTS', 'cfeed', 'Dil'])
+def test_parameter_derivative(parameter):
+    # Glam agrees with central differences of G in the parameter, and G is the model at the value of par
+    par = params(os.path.join(HERE, 'parameters.txt'))
+    G, Gx, Glam, lam0 = parameterProblem(par, parameter)
+    x = np.array(GUESS)
+    h = 1e-6 * abs(lam0)
+    difference = (G(x, lam0 + h) - G(x, lam0 - h)) / (2 * h)
+    assert np.allclose(Glam(x, lam0), difference, rtol=1e-6, atol=1e-8)
+    assert np.allclose(G(x, lam0), parameterProblem(par, 0)[0](x, par[0]))
@@ -0,0 +1,59 @@
+#!/usr/bin/python
+########################################################
+# test_simulation.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Tests of the integration up to the steady
+#   state of simulation.py on the pulse of exercise 3.1
+#   (run with pytest from this directory)
+# Reference: Chassagnole et al, 2002
+########################################################
+import os
+
+import numpy as np
+import pytest
+
+from equations import eqs
+from readData import params
+from simulation import run_to_steady_state
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# initial conditions of exercise 3.1, with the glucose pulse
+PULSE_COND = [0.185, 0.103, 0.422, 2.254, 0.008, 0.393, 0.108, 0.246, 0.137, 0.570, 0.334, 0.616, 3.307, 0.242, 2,
+              2.824, 0.793, 2.669]
+
+
+@pytest.fixture(scope='module')
+def parameters():
+    return params(os.path.join(HERE, 'parameters.txt'))
+
+
+@pytest.mark.parametrize('method', ['odeint', 'LSODA', 'BDF'])
+def test_pulse_stops_before_the_end(parameters, method):
+    run = run_to_steady_state(eqs, PULSE_COND, np.arange(0, 1000, 0.1), parameters, method=method)
+    assert run.status == 'steady'
+    assert run.tSteady < run.stats['tStop'] < 1000
+    assert len(run.t) == len(run.y) and run.t[-1] <= run.stats['tStop']
+    assert np.all(np.isfinite(run.y))
+
+
+def test_counts_every_evaluation(parameters):
+    calls = []
+
+    def counted(y, t, par):
+        calls.append(t)
+        return eqs(y, t, par)
+
+    run = run_to_steady_state(counted, PULSE_COND, np.arange(0, 1000, 0.1), parameters)
+    assert run.stats['nfev'] == len(calls)
+
+
+def test_nan_stops_the_integration(parameters):
+    wrong = np.array(parameters)
+    wrong[103] = -wrong[103]
+    run = run_to_steady_state(eqs, PULSE_COND, np.arange(0, 1000, 0.1), wrong)
+    assert run.status in ('nan', 'diverged')
+    assert run.stats['tStop'] < 1000
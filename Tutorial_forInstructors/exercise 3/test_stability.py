@@ -0,0 +1,66 @@
+#!/usr/bin/python
+########################################################
+# test_stability.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Tests of the stability screening of
+#   stability.py against the eigenvalues of the Jacobian
+#   of a single parameter set (run with pytest from this
+#   directory)
+# Reference: Chassagnole et al, 2002
+########################################################
+import os
+
+import numpy as np
+import pytest
+
+from equations import eqs
+from jacobian import jac
+from readData import params
+from stability import classify, screen_stability
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='module')
+def parameters():
+    return np.array(params(os.path.join(HERE, 'parameters.txt')), dtype=float)
+
+
+def test_single_set_matches_eigvals(parameters):
+    table = screen_stability(parameters)
+    assert table.converged.tolist() == [True]
+    state = table.states[0]
+    assert np.linalg.norm(eqs(state, 0.0, parameters)) <= 1e-10
+    expected = np.linalg.eigvals(jac(state, 0.0, parameters))
+    assert np.allclose(np.sort_complex(table.eigenvalues[0]), np.sort_complex(expected), rtol=1e-8, atol=1e-10)
+    assert table.maxReal[0] == pytest.approx(np.max(np.real(expected)))
+    assert table.stable[0] == (np.max(np.real(expected)) < 0)
+
+
+def test_stack_matches_single_sets(parameters):
+    # a stack of sets gives the same results as every set alone, and a set without steady state only marks its row
+    rng = np.random.RandomState(0)
+    par = parameters * np.exp(0.05 * rng.standard_normal((3, len(parameters))))
+    wrong = np.array(parameters)
+    wrong[103] = -wrong[103]
+    table = screen_stability(np.vstack([par, wrong]))
+    assert table.converged.tolist() == [True, True, True, False]
+    assert np.all(np.isnan(table.eigenvalues[3])) and not table.stable[3] and not table.oscillatory[3]
+    for i in range(3):
+        single = screen_stability(par[i])
+        assert np.allclose(np.sort_complex(table.eigenvalues[i]), np.sort_complex(single.eigenvalues[0]),
+                           rtol=1e-8, atol=1e-10)
+
+
+def test_classify():
+    eigenvalues = np.array([[-1.0, -0.01 + 2.0j, -0.01 - 2.0j],
+                            [0.5, -2.0, -3.0 + 1e-14j]])
+    summary = classify(eigenvalues)
+    assert summary['stable'].tolist() == [True, False]
+    assert summary['oscillatory'].tolist() == [True, False]
+    assert np.allclose(summary['maxReal'], [-0.01, 0.5])
+    assert np.allclose(summary['slowest'], [100.0, 2.0])
+    assert np.allclose(summary['fastest'], [1.0, 1.0 / 3.0])
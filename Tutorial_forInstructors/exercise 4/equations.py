@@ -0,0 +1,411 @@
+#!/usr/bin/python
+########################################################
+# equations.py
+# Author: Veronica Llorens-Rico
+# Version: 1.2
+# Date: December 2015
+# Last update: October 2026
+# Description: Defines differential equations of the
+#   central carbon metabolism of E. coli
+# Reference: Chassagnole et al, 2002
+########################################################
+import numpy as np
+
+
+# STOICHIOMETRY
+# =======================================================
+# mass balance of every species, in the order of the state vector: coefficient of every reaction in its derivative
+# (the volumes of the cytosol and of the extracellular compartment are both 1)
+BALANCES = [('cdhap', {'vALDO': 1, 'vDHAP': -1, 'vG3PDH': -1, 'vTIS': -1}),
+            ('ce4p', {'vDAHPS': -1, 'vE4P': -1, 'vTA': 1, 'vTKB': -1}),
+            ('cpg2', {'vENO': -1, 'vpg2': -1, 'vrpGluMu': 1}),
+            ('cpg3', {'vPG3': -1, 'vPGK': 1, 'vrpGluMu': -1, 'vsersynth': -1}),
+            ('cpgp', {'vGAPDH': 1, 'vPGK': -1, 'vPGP': -1}),
+            ('crib5p', {'vPPK': -1, 'vR5PI': 1, 'vRIB5P': -1, 'vTKA': -1}),
+            ('cribu5p', {'vPGDH': 1, 'vR5PI': -1, 'vRibu5p': -1, 'vRu5P': -1}),
+            ('csed7p', {'vSED7P': -1, 'vTA': -1, 'vTKA': 1}),
+            ('cxyl5p', {'vRu5P': 1, 'vTKA': -1, 'vTKB': -1, 'vXYL5P': -1}),
+            ('cf6p', {'vMURSyNTH': -2, 'vPFK': -1, 'vPGI': 1, 'vTA': 1, 'vTKB': 1, 'vf6P': -1}),
+            ('cfdp', {'vALDO': -1, 'vPFK': 1, 'vfdP': -1}),
+            ('cg1p', {'vG1PAT': -1, 'vGLP': -1, 'vPGM': 1}),
+            ('cg6p', {'vG6P': -1, 'vG6PDH': -1, 'vPGI': -1, 'vPGM': -1, 'vPTS': 64.82759}),
+            ('cgap', {'vALDO': 1, 'vGAP': -1, 'vGAPDH': -1, 'vTA': -1, 'vTIS': 1, 'vTKA': 1, 'vTKB': 1,
+                      'vTRPSYNTH': 1}),
+            ('cglcex', {'vEXTER': 1, 'vPTS': -1}),
+            ('cpep', {'vDAHPS': -1, 'vENO': 1, 'vPEP': -1, 'vPK': -1, 'vPTS': -64.82759, 'vSynth1': -1,
+                      'vpepCxylase': -1}),
+            ('cpg', {'vG6PDH': 1, 'vPG': -1, 'vPGDH': -1}),
+            ('cpyr', {'vMethSynth': 1, 'vPDH': -1, 'vPK': 1, 'vPTS': 64.82759, 'vSynth2': -1, 'vTRPSYNTH': 1,
+                      'vpyr': -1})]
+
+SPECIES = [name for name, _ in BALANCES]
+
+# reactions, in the order of the rates returned by rates()
+REACTIONS = ['vALDO', 'vDAHPS', 'vDHAP', 'vE4P', 'vENO', 'vEXTER', 'vG1PAT', 'vG3PDH', 'vG6P', 'vG6PDH', 'vGAP',
+             'vGAPDH', 'vGLP', 'vMURSyNTH', 'vMethSynth', 'vPDH', 'vPEP', 'vPFK', 'vPG', 'vPG3', 'vPGDH', 'vPGI',
+             'vPGK', 'vPGM', 'vPGP', 'vPK', 'vPPK', 'vPTS', 'vR5PI', 'vRIB5P', 'vRibu5p', 'vRu5P', 'vSED7P', 'vSynth1',
+             'vSynth2', 'vTA', 'vTIS', 'vTKA', 'vTKB', 'vTRPSYNTH', 'vXYL5P', 'vf6P', 'vfdP', 'vpepCxylase', 'vpg2',
+             'vpyr', 'vrpGluMu', 'vsersynth']
+
+# stoichiometric matrix, species x reactions
+STOICHIOMETRY = np.array([[balance.get(reaction, 0.0) for reaction in REACTIONS] for _, balance in BALANCES])
+# =======================================================
+
+
+# COFACTOR CONCENTRATIONS
+# =======================================================
+# metabolites that are not integrated but defined by an analytical expression of time
+COFACTORS = ['cadp', 'camp', 'catp', 'cnad', 'cnadh', 'cnadp', 'cnadph']
+
+# their concentrations before the perturbation (t <= 0)
+STEADY_COFACTORS = (0.582, 0.123, 4.27, 1.314, 0.0934, 0.159, 0.062)
+
+
+def pulseCofactors(t):
+    """
+    Analytical expressions of the cofactor concentrations after the glucose pulse (t > 0). Works on a single time
+    or on an array of times
+    :param t: time after the perturbation
+    :return: returns cadp, camp, catp, cnad, cnadh, cnadp, cnadph
+    """
+    cadp = 0.582 + 1.73 * 2.731 ** (-0.15 * t) * (0.12 * t + 0.000214 * t ** 3)
+    camp = 0.123 + 7.25 * (t / (7.25 + 1.47 * t + 0.17 * t ** 2)) + 1.073 / (1.29 + 8.05 * t)
+    catp = 4.27 - 4.163 * (t / (0.657 + 1.43 * t + 0.0364 * t ** 2))
+    cnad = 1.314 + 1.314 * 2.73 ** (-0.0435 * t - 0.342) - (t + 7.871) * (
+           2.73 ** (-0.0218 * t - 0.171) / (8.481 + t))
+    cnadh = 0.0934 + 0.00111 * 2.371 ** (-0.123 * t) * (0.844 * t + 0.104 * t ** 3)
+    cnadp = 0.159 - 0.00554 * (t / (2.8 - 0.271 * t + 0.01 * t ** 2)) + 0.182 / (4.82 + 0.526 * t)
+    cnadph = 0.062 + 0.332 * 2.718 ** (-0.464 * t) * (
+        0.0166 * t ** 1.58 + 0.000166 * t ** 4.73 + 0.1312 * 10 ** (-9) * t ** 7.89 + 0.1362 * 10 ** (
+            -12) * t ** 11 + 0.1233 * 10 ** (-15) * t ** 14.2)
+
+    return cadp, camp, catp, cnad, cnadh, cnadp, cnadph
+
+
+# profile of the cofactors after the pulse used by the rate laws
+_cofactorProfile = pulseCofactors
+
+
+def setCofactorProfile(profile=None):
+    """
+    Replaces the cofactor concentrations used by the rate laws after the pulse, e.g. with a
+    cofactorTable.CofactorTable of measured profiles. The rate laws do not change
+    :param profile: function of the time (a single time or an array) returning the seven cofactor concentrations
+    in the order of COFACTORS. None restores the analytical expressions
+    """
+    global _cofactorProfile
+    _cofactorProfile = pulseCofactors if profile is None else profile
+
+
+def cofactors(t):
+    """
+    Concentrations of the metabolites that are not integrated but defined by an analytical expression of time
+    (ADP, AMP, ATP, NAD, NADH, NADP and NADPH)
+    :param t: time of the integration, or array of times
+    :return: returns cadp, camp, catp, cnad, cnadh, cnadp, cnadph
+    """
+    if isinstance(t, np.ndarray):
+        # one time per column of a batch
+        return tuple(cofactors_batch(t))
+    # The perturbation occurs at time=0, so if t>0 the metabolites concentration will change according to the
+    # active profile (by default, the analytical expressions in pulseCofactors)
+    if t > 0.0:
+        return _cofactorProfile(t)
+    return STEADY_COFACTORS
+
+
+def cofactors_batch(times):
+    """
+    Cofactor concentrations at many times at once, for the integrators that advance several times together
+    :param times: array of times
+    :return: array of shape (7, len(times)), rows in the order of COFACTORS
+    """
+    times = np.asarray(times, dtype=float)
+    after = times > 0.0
+    # the profile is only valid after the pulse, so it is evaluated at t=0 where the constants apply
+    values = np.array(_cofactorProfile(np.where(after, times, 0.0)), dtype=float).reshape(len(COFACTORS), -1)
+    return np.where(after, values, np.array(STEADY_COFACTORS)[:, np.newaxis])
+    # =======================================================
+
+
+# REACTION RATES
+# =======================================================
+def rates(init, t, par):
+    """
+    Rate laws of the model (Chassagnole et al, 2002). This is the only place where they are written: the
+    differential equations, the fluxes at steady state and the Jacobian are all computed from these rates
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: array with the rate of every reaction, in the order of REACTIONS
+    """
+
+    # Assign parameters to the different variable names
+    kALDOdhap = par[0]
+    kALDOeq = par[1]
+    kALDOfdp = par[2]
+    kALDOgap = par[3]
+    kALDOgapinh = par[4]
+    KDAHPSe4p = par[5]
+    KDAHPSpep = par[6]
+    KENOeq = par[7]
+    KENOpep = par[8]
+    KENOpg2 = par[9]
+    KG1PATatp = par[10]
+    KG1PATfdp = par[11]
+    KG1PATg1p = par[12]
+    KG3PDHdhap = par[13]
+    KG6PDHg6p = par[14]
+    KG6PDHnadp = par[15]
+    KG6PDHnadphg6pinh = par[16]
+    KG6PDHnadphnadpinh = par[17]
+    KGAPDHeq = par[18]
+    KGAPDHgap = par[19]
+    KGAPDHnad = par[20]
+    KGAPDHnadh = par[21]
+    KGAPDHpgp = par[22]
+    KPDHpyr = par[23]
+    KpepCxylasefdp = par[24]
+    KpepCxylasepep = par[25]
+    KPFKadpa = par[26]
+    KPFKadpb = par[27]
+    KPFKadpc = par[28]
+    KPFKampa = par[29]
+    KPFKampb = par[30]
+    KPFKatps = par[31]
+    KPFKf6ps = par[32]
+    KPFKpep = par[33]
+    KPGDHatpinh = par[34]
+    KPGDHnadp = par[35]
+    KPGDHnadphinh = par[36]
+    KPGDHpg = par[37]
+    KPGIeq = par[38]
+    KPGIf6p = par[39]
+    KPGIf6ppginh = par[40]
+    KPGIg6p = par[41]
+    KPGIg6ppginh = par[42]
+    KPGKadp = par[43]
+    KPGKatp = par[44]
+    KPGKeq = par[45]
+    KPGKpg3 = par[46]
+    KPGKpgp = par[47]
+    KPGluMueq = par[48]
+    KPGluMupg2 = par[49]
+    KPGluMupg3 = par[50]
+    KPGMeq = par[51]
+    KPGMg1p = par[52]
+    KPGMg6p = par[53]
+    KPKadp = par[54]
+    KPKamp = par[55]
+    KPKatp = par[56]
+    KPKfdp = par[57]
+    KPKpep = par[58]
+    KPTSa1 = par[59]
+    KPTSa2 = par[60]
+    KPTSa3 = par[61]
+    KPTSg6p = par[62]
+    KR5PIeq = par[63]
+    KRPPKrib5p = par[64]
+    KRu5Peq = par[65]
+    KSerSynthpg3 = par[66]
+    KSynth1pep = par[67]
+    KSynth2pyr = par[68]
+    KTAeq = par[69]
+    kTISdhap = par[70]
+    kTISeq = par[71]
+    kTISgap = par[72]
+    KTKaeq = par[73]
+    KTKbeq = par[74]
+    LPFK = par[75]
+    LPK = par[76]
+    nDAHPSe4p = par[77]
+    nDAHPSpep = par[78]
+    nG1PATfdp = par[79]
+    nPDH = par[80]
+    npepCxylasefdp = par[81]
+    nPFK = par[82]
+    nPK = par[83]
+    nPTSg6p = par[84]
+    rmaxALDO = par[85]
+    rmaxDAHPS = par[86]
+    rmaxENO = par[87]
+    rmaxG1PAT = par[88]
+    rmaxG3PDH = par[89]
+    rmaxG6PDH = par[90]
+    rmaxGAPDH = par[91]
+    rmaxMetSynth = par[92]
+    rmaxMurSynth = par[93]
+    rmaxPDH = par[94]
+    rmaxpepCxylase = par[95]
+    rmaxPFK = par[96]
+    rmaxPGDH = par[97]
+    rmaxPGI = par[98]
+    rmaxPGK = par[99]
+    rmaxPGluMu = par[100]
+    rmaxPGM = par[101]
+    rmaxPK = par[102]
+    rmaxPTS = par[103]
+    rmaxR5PI = par[104]
+    rmaxRPPK = par[105]
+    rmaxRu5P = par[106]
+    rmaxSerSynth = par[107]
+    rmaxSynth1 = par[108]
+    rmaxSynth2 = par[109]
+    rmaxTA = par[110]
+    rmaxTIS = par[111]
+    rmaxTKa = par[112]
+    rmaxTKb = par[113]
+    rmaxTrpSynth = par[114]
+    VALDOblf = par[115]
+
+    # fixed parameters
+    cfeed = 111.1
+    Dil = 2.78e-05
+    mu = 2.78e-05
+    cytosol = 1
+    extracellular = 1
+
+    # Assign initial conditions
+    cdhap = init[0]
+    ce4p = init[1]
+    cpg2 = init[2]
+    cpg3 = init[3]
+    cpgp = init[4]
+    crib5p = init[5]
+    cribu5p = init[6]
+    csed7p = init[7]
+    cxyl5p = init[8]
+    cf6p = init[9]
+    cfdp = init[10]
+    cg1p = init[11]
+    cg6p = init[12]
+    cgap = init[13]
+    cglcex = init[14]
+    cpep = init[15]
+    cpg = init[16]
+    cpyr = init[17]
+
+    # metabolites such as ATP, ADP, AMP... are defined by an analytical expression of time
+    cadp, camp, catp, cnad, cnadh, cnadp, cnadph = cofactors(t)
+
+    vALDO = cytosol * rmaxALDO * (cfdp - cgap * cdhap / kALDOeq) / (
+        kALDOfdp + cfdp + kALDOgap * cdhap / (kALDOeq * VALDOblf) + kALDOdhap * cgap / (
+            kALDOeq * VALDOblf) + cfdp * cgap / kALDOgapinh + cgap * cdhap / (VALDOblf * kALDOeq))
+    vDAHPS = cytosol * rmaxDAHPS * ce4p ** nDAHPSe4p * cpep ** nDAHPSpep / (
+        (KDAHPSe4p + ce4p ** nDAHPSe4p) * (KDAHPSpep + cpep ** nDAHPSpep))
+    vDHAP = cytosol * mu * cdhap
+    vE4P = cytosol * mu * ce4p
+    vENO = cytosol * rmaxENO * (cpg2 - cpep / KENOeq) / (KENOpg2 * (1 + cpep / KENOpep) + cpg2)
+    vEXTER = extracellular * Dil * (cfeed - cglcex)
+    vG1PAT = cytosol * rmaxG1PAT * cg1p * catp * (1 + (cfdp / KG1PATfdp) ** nG1PATfdp) / (
+        (KG1PATatp + catp) * (KG1PATg1p + cg1p))
+    vG3PDH = cytosol * rmaxG3PDH * cdhap / (KG3PDHdhap + cdhap)
+    vG6P = cytosol * mu * cg6p
+    vG6PDH = cytosol * rmaxG6PDH * cg6p * cnadp / (
+        (cg6p + KG6PDHg6p) * (1 + cnadph / KG6PDHnadphg6pinh) * (
+            KG6PDHnadp * (1 + cnadph / KG6PDHnadphnadpinh) + cnadp))
+    vGAP = cytosol * mu * cgap
+    vGAPDH = cytosol * rmaxGAPDH * (cgap * cnad - cpgp * cnadh / KGAPDHeq) / (
+        (KGAPDHgap * (1 + cpgp / KGAPDHpgp) + cgap) * (KGAPDHnad * (1 + cnadh / KGAPDHnadh) + cnad))
+    vGLP = cytosol * mu * cg1p
+    vMURSyNTH = cytosol * rmaxMurSynth
+    vMethSynth = cytosol * rmaxMetSynth
+    vPDH = cytosol * rmaxPDH * cpyr ** nPDH / (KPDHpyr + cpyr ** nPDH)
+    vPEP = cytosol * mu * cpep
+    vPFK = cytosol * rmaxPFK * catp * cf6p / ((catp + KPFKatps * (1 + cadp / KPFKadpc)) * (
+        cf6p + KPFKf6ps * (1 + cpep / KPFKpep + cadp / KPFKadpb + camp / KPFKampb) / (
+            1 + cadp / KPFKadpa + camp / KPFKampa)) * (
+                                                  1 + LPFK / (1 + cf6p * (1 + cadp / KPFKadpa + camp / KPFKampa) / (
+                                                      KPFKf6ps * (
+                                                          1 + cpep / KPFKpep + cadp / KPFKadpb + camp / KPFKampb))) ** nPFK))
+    vPG = cytosol * mu * cpg
+    vPG3 = cytosol * mu * cpg3
+    vPGDH = cytosol * rmaxPGDH * cpg * cnadp / (
+        (cpg + KPGDHpg) * (cnadp + KPGDHnadp * (1 + cnadph / KPGDHnadphinh) * (1 + catp / KPGDHatpinh)))
+    vPGI = cytosol * rmaxPGI * (cg6p - cf6p / KPGIeq) / (
+        KPGIg6p * (1 + cf6p / (KPGIf6p * (1 + cpg / KPGIf6ppginh)) + cpg / KPGIg6ppginh) + cg6p)
+    vPGK = cytosol * rmaxPGK * (cadp * cpgp - catp * cpg3 / KPGKeq) / (
+        (KPGKadp * (1 + catp / KPGKatp) + cadp) * (KPGKpgp * (1 + cpg3 / KPGKpg3) + cpgp))
+    vPGM = cytosol * rmaxPGM * (cg6p - cg1p / KPGMeq) / (KPGMg6p * (1 + cg1p / KPGMg1p) + cg6p)
+    vPGP = cytosol * mu * cpgp
+    vPK = cytosol * rmaxPK * cpep * (cpep / KPKpep + 1) ** (nPK - 1) * cadp / (
+        KPKpep * (
+            LPK * ((1 + catp / KPKatp) / (cfdp / KPKfdp + camp / KPKamp + 1)) ** nPK + (cpep / KPKpep + 1) ** nPK) * (
+            cadp + KPKadp))
+    vPPK = cytosol * rmaxRPPK * crib5p / (KRPPKrib5p + crib5p)
+    vPTS = extracellular * rmaxPTS * cglcex * (cpep / cpyr) / (
+        (KPTSa1 + KPTSa2 * (cpep / cpyr) + KPTSa3 * cglcex + cglcex * (cpep / cpyr)) * (1 + cg6p ** nPTSg6p / KPTSg6p))
+    vR5PI = cytosol * rmaxR5PI * (cribu5p - crib5p / KR5PIeq)
+    vRIB5P = cytosol * mu * crib5p
+    vRibu5p = cytosol * mu * cribu5p
+    vRu5P = cytosol * rmaxRu5P * (cribu5p - cxyl5p / KRu5Peq)
+    vSED7P = cytosol * mu * csed7p
+    vSynth1 = cytosol * rmaxSynth1 * cpep / (KSynth1pep + cpep)
+    vSynth2 = cytosol * rmaxSynth2 * cpyr / (KSynth2pyr + cpyr)
+    vTA = cytosol * rmaxTA * (cgap * csed7p - ce4p * cf6p / KTAeq)
+    vTIS = cytosol * rmaxTIS * (cdhap - cgap / kTISeq) / (kTISdhap * (1 + cgap / kTISgap) + cdhap)
+    vTKA = cytosol * rmaxTKa * (crib5p * cxyl5p - csed7p * cgap / KTKaeq)
+    vTKB = cytosol * rmaxTKb * (cxyl5p * ce4p - cf6p * cgap / KTKbeq)
+    vTRPSYNTH = cytosol * rmaxTrpSynth
+    vXYL5P = cytosol * mu * cxyl5p
+    vf6P = cytosol * mu * cf6p
+    vfdP = cytosol * mu * cfdp
+    vpepCxylase = cytosol * rmaxpepCxylase * cpep * (1 + (cfdp / KpepCxylasefdp) ** npepCxylasefdp) / (
+        KpepCxylasepep + cpep)
+    vpg2 = cytosol * mu * cpg2
+    vpyr = cytosol * mu * cpyr
+    vrpGluMu = cytosol * rmaxPGluMu * (cpg3 - cpg2 / KPGluMueq) / (KPGluMupg3 * (1 + cpg2 / KPGluMupg2) + cpg3)
+    vsersynth = cytosol * rmaxSerSynth * cpg3 / (KSerSynthpg3 + cpg3)
+
+    v = [vALDO, vDAHPS, vDHAP, vE4P, vENO, vEXTER, vG1PAT, vG3PDH, vG6P, vG6PDH, vGAP, vGAPDH, vGLP, vMURSyNTH,
+         vMethSynth, vPDH, vPEP, vPFK, vPG, vPG3, vPGDH, vPGI, vPGK, vPGM, vPGP, vPK, vPPK, vPTS, vR5PI, vRIB5P,
+         vRibu5p, vRu5P, vSED7P, vSynth1, vSynth2, vTA, vTIS, vTKA, vTKB, vTRPSYNTH, vXYL5P, vf6P, vfdP, vpepCxylase,
+         vpg2, vpyr, vrpGluMu, vsersynth]
+    if np.ndim(cdhap) > np.ndim(rmaxMurSynth):
+        # the zero order rates are scalars when only the concentrations are batched: give them the same shape
+        v = np.broadcast_arrays(*v)
+
+    return np.array(v)
+    # =======================================================
+
+
+# DIF EQUATION SYSTEM
+# =======================================================
+def eqs(init, t, par):
+    """
+    Describes the differential equations of the model (Chassagnole et al, 2002) as dx/dt = N v(x), where N is the
+    constant stoichiometric matrix and v the reaction rates
+    :param init: initial conditions
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: returns the diff equations to be solved by the function odeint
+    """
+    return STOICHIOMETRY.dot(rates(init, t, par))
+    # =======================================================
+
+
+# BATCHED DIF EQUATION SYSTEM
+# =======================================================
+def eqs_batch(init, t, par):
+    """
+    Evaluates the differential equations of the model for many states and parameter sets at once. Every
+    rate law is evaluated on whole columns of the batch, so there is a single Python call per solver step
+    instead of one call per parameter set
+    :param init: array of shape (N, 18), one state per row (same species order as in eqs)
+    :param t: time of the integration, shared by all the rows, or array with the time of every row
+    :param par: array of shape (N, 116), one parameter set per row. A single parameter set of length 116 is
+    shared by all the rows
+    :return: array of shape (N, 18) with the derivatives of every row
+    """
+    init = np.asarray(init, dtype=float)
+    par = np.asarray(par, dtype=float)
+    if init.ndim != 2 or init.shape[1] != 18:
+        raise ValueError('init must have shape (N, 18), got {0}'.format(init.shape))
+    if par.shape[-1] != 116 or (par.ndim == 2 and par.shape[0] != init.shape[0]):
+        raise ValueError('par must have shape (116,) or ({0}, 116), got {1}'.format(init.shape[0], par.shape))
+    if np.ndim(t) > 0 and np.shape(t) != (init.shape[0],):
+        raise ValueError('t must be a single time or have shape ({0},), got {1}'.format(init.shape[0], np.shape(t)))
+
+    # transposed, init[i] and par[i] are whole columns of the batch
+    return np.transpose(eqs(init.T, t, par.T))
+    # =======================================================
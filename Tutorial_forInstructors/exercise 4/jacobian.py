@@ -0,0 +1,1272 @@
+#!/usr/bin/python
+########################################################
+# jacobian.py
+# Generated by genJacobian.py from equations.py, do not
+#   edit by hand
+# Description: Analytical Jacobian of the differential
+#   equations of the central carbon metabolism of E. coli,
+#   with respect to the species and to the parameters
+# Reference: Chassagnole et al, 2002
+########################################################
+from __future__ import division
+import numpy as np
+from scipy import sparse
+
+from equations import cofactors
+
+
+# row and column of every structurally non-zero entry of the Jacobian
+ROWS = np.array([
+    0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5, 5, 5, 6, 6, 6, 6, 7, 7, 7, 7, 7, 7, 8, 8, 8, 8,
+    8, 8, 8, 9, 9, 9, 9, 9, 9, 9, 9, 10, 10, 10, 10, 10, 11, 11, 11, 12, 12, 12, 12, 12, 12, 12, 13, 13, 13, 13, 13,
+    13, 13, 13, 13, 14, 14, 14, 14, 15, 15, 15, 15, 15, 15, 15, 16, 16, 17, 17, 17, 17, 17])
+COLS = np.array([
+    0, 10, 13, 1, 7, 8, 9, 13, 15, 2, 3, 15, 2, 3, 4, 3, 4, 13, 5, 6, 7, 8, 13, 5, 6, 8, 16, 1, 5, 7, 8, 9, 13, 1,
+    5, 6, 7, 8, 9, 13, 1, 7, 8, 9, 12, 13, 15, 16, 0, 9, 10, 13, 15, 10, 11, 12, 9, 11, 12, 14, 15, 16, 17, 0, 1, 4,
+    5, 7, 8, 9, 10, 13, 12, 14, 15, 17, 1, 2, 10, 12, 14, 15, 17, 12, 16, 10, 12, 14, 15, 17])
+
+# sparsity pattern, to be passed as jac_sparsity to the sparse solvers of scipy
+JAC_SPARSITY = sparse.csc_matrix((np.ones(len(ROWS)), (ROWS, COLS)), shape=(18, 18))
+
+# row and column of every structurally non-zero entry of the derivatives with respect to the parameters
+PAR_ROWS = np.array([
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 3, 3,
+    3, 3, 3, 3, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 5, 5, 5, 5, 5, 5, 6, 6, 6, 6, 6, 6, 6, 6, 6, 7, 7, 7, 7, 8,
+    8, 8, 8, 8, 8, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 9, 10, 10, 10, 10, 10, 10, 10, 10,
+    10, 10, 10, 10, 10, 10, 10, 10, 10, 10, 11, 11, 11, 11, 11, 11, 11, 11, 11, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+    12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 13, 13, 13, 13, 13, 13, 13, 13, 13, 13, 13, 13, 13, 13, 13, 13,
+    13, 13, 13, 13, 13, 13, 13, 13, 14, 14, 14, 14, 14, 14, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15,
+    15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 16, 16, 16, 16, 16, 16, 16, 16, 16, 16, 17, 17, 17,
+    17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17, 17])
+PAR_COLS = np.array([
+    0, 1, 2, 3, 4, 13, 70, 71, 72, 85, 89, 111, 115, 5, 6, 69, 74, 77, 78, 86, 110, 113, 7, 8, 9, 48, 49, 50, 87,
+    100, 43, 44, 45, 46, 47, 48, 49, 50, 66, 99, 100, 107, 18, 19, 20, 21, 22, 43, 44, 45, 46, 47, 91, 99, 63, 64,
+    73, 104, 105, 112, 34, 35, 36, 37, 63, 65, 97, 104, 106, 69, 73, 110, 112, 65, 73, 74, 106, 112, 113, 26, 27,
+    28, 29, 30, 31, 32, 33, 38, 39, 40, 41, 42, 69, 74, 75, 82, 93, 96, 98, 110, 113, 0, 1, 2, 3, 4, 26, 27, 28, 29,
+    30, 31, 32, 33, 75, 82, 85, 96, 115, 10, 11, 12, 51, 52, 53, 79, 88, 101, 14, 15, 16, 17, 38, 39, 40, 41, 42,
+    51, 52, 53, 59, 60, 61, 62, 84, 90, 98, 101, 103, 0, 1, 2, 3, 4, 18, 19, 20, 21, 22, 69, 70, 71, 72, 73, 74, 85,
+    91, 110, 111, 112, 113, 114, 115, 59, 60, 61, 62, 84, 103, 5, 6, 7, 8, 9, 24, 25, 54, 55, 56, 57, 58, 59, 60,
+    61, 62, 67, 76, 77, 78, 81, 83, 84, 86, 87, 95, 102, 103, 108, 14, 15, 16, 17, 34, 35, 36, 37, 90, 97, 23, 54,
+    55, 56, 57, 58, 59, 60, 61, 62, 68, 76, 80, 83, 84, 92, 94, 102, 103, 109, 114])
+
+
+# NON-ZERO ENTRIES OF THE JACOBIAN
+# =======================================================
+def entries(init, t, par):
+    """
+    Evaluates the structurally non-zero entries of the Jacobian, in the order given by ROWS and COLS
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: list with the values of the non-zero entries
+    """
+    kALDOdhap = par[0]
+    kALDOeq = par[1]
+    kALDOfdp = par[2]
+    kALDOgap = par[3]
+    kALDOgapinh = par[4]
+    KDAHPSe4p = par[5]
+    KDAHPSpep = par[6]
+    KENOeq = par[7]
+    KENOpep = par[8]
+    KENOpg2 = par[9]
+    KG1PATatp = par[10]
+    KG1PATfdp = par[11]
+    KG1PATg1p = par[12]
+    KG3PDHdhap = par[13]
+    KG6PDHg6p = par[14]
+    KG6PDHnadp = par[15]
+    KG6PDHnadphg6pinh = par[16]
+    KG6PDHnadphnadpinh = par[17]
+    KGAPDHeq = par[18]
+    KGAPDHgap = par[19]
+    KGAPDHnad = par[20]
+    KGAPDHnadh = par[21]
+    KGAPDHpgp = par[22]
+    KPDHpyr = par[23]
+    KpepCxylasefdp = par[24]
+    KpepCxylasepep = par[25]
+    KPFKadpa = par[26]
+    KPFKadpb = par[27]
+    KPFKadpc = par[28]
+    KPFKampa = par[29]
+    KPFKampb = par[30]
+    KPFKatps = par[31]
+    KPFKf6ps = par[32]
+    KPFKpep = par[33]
+    KPGDHatpinh = par[34]
+    KPGDHnadp = par[35]
+    KPGDHnadphinh = par[36]
+    KPGDHpg = par[37]
+    KPGIeq = par[38]
+    KPGIf6p = par[39]
+    KPGIf6ppginh = par[40]
+    KPGIg6p = par[41]
+    KPGIg6ppginh = par[42]
+    KPGKadp = par[43]
+    KPGKatp = par[44]
+    KPGKeq = par[45]
+    KPGKpg3 = par[46]
+    KPGKpgp = par[47]
+    KPGluMueq = par[48]
+    KPGluMupg2 = par[49]
+    KPGluMupg3 = par[50]
+    KPGMeq = par[51]
+    KPGMg1p = par[52]
+    KPGMg6p = par[53]
+    KPKadp = par[54]
+    KPKamp = par[55]
+    KPKatp = par[56]
+    KPKfdp = par[57]
+    KPKpep = par[58]
+    KPTSa1 = par[59]
+    KPTSa2 = par[60]
+    KPTSa3 = par[61]
+    KPTSg6p = par[62]
+    KR5PIeq = par[63]
+    KRPPKrib5p = par[64]
+    KRu5Peq = par[65]
+    KSerSynthpg3 = par[66]
+    KSynth1pep = par[67]
+    KSynth2pyr = par[68]
+    KTAeq = par[69]
+    kTISdhap = par[70]
+    kTISeq = par[71]
+    kTISgap = par[72]
+    KTKaeq = par[73]
+    KTKbeq = par[74]
+    LPFK = par[75]
+    LPK = par[76]
+    nDAHPSe4p = par[77]
+    nDAHPSpep = par[78]
+    nG1PATfdp = par[79]
+    nPDH = par[80]
+    npepCxylasefdp = par[81]
+    nPFK = par[82]
+    nPK = par[83]
+    nPTSg6p = par[84]
+    rmaxALDO = par[85]
+    rmaxDAHPS = par[86]
+    rmaxENO = par[87]
+    rmaxG1PAT = par[88]
+    rmaxG3PDH = par[89]
+    rmaxG6PDH = par[90]
+    rmaxGAPDH = par[91]
+    rmaxPDH = par[94]
+    rmaxpepCxylase = par[95]
+    rmaxPFK = par[96]
+    rmaxPGDH = par[97]
+    rmaxPGI = par[98]
+    rmaxPGK = par[99]
+    rmaxPGluMu = par[100]
+    rmaxPGM = par[101]
+    rmaxPK = par[102]
+    rmaxPTS = par[103]
+    rmaxR5PI = par[104]
+    rmaxRPPK = par[105]
+    rmaxRu5P = par[106]
+    rmaxSerSynth = par[107]
+    rmaxSynth1 = par[108]
+    rmaxSynth2 = par[109]
+    rmaxTA = par[110]
+    rmaxTIS = par[111]
+    rmaxTKa = par[112]
+    rmaxTKb = par[113]
+    VALDOblf = par[115]
+
+    cdhap = init[0]
+    ce4p = init[1]
+    cpg2 = init[2]
+    cpg3 = init[3]
+    cpgp = init[4]
+    crib5p = init[5]
+    csed7p = init[7]
+    cxyl5p = init[8]
+    cf6p = init[9]
+    cfdp = init[10]
+    cg1p = init[11]
+    cg6p = init[12]
+    cgap = init[13]
+    cglcex = init[14]
+    cpep = init[15]
+    cpg = init[16]
+    cpyr = init[17]
+
+    cadp, camp, catp, cnad, cnadh, cnadp, cnadph = cofactors(t)
+
+    tmp0 = KG3PDHdhap + cdhap
+    tmp1 = 1/kTISgap
+    tmp2 = cdhap + kTISdhap*(cgap*tmp1 + 1)
+    tmp3 = rmaxTIS/tmp2
+    tmp4 = 1/kTISeq
+    tmp5 = rmaxTIS*(cdhap - cgap*tmp4)/tmp2**2
+    tmp6 = 1/kALDOeq
+    tmp7 = 1/kALDOgapinh
+    tmp8 = cgap*tmp7
+    tmp9 = 1/VALDOblf
+    tmp10 = cdhap*tmp6
+    tmp11 = cgap*tmp10
+    tmp12 = tmp10*tmp9
+    tmp13 = kALDOdhap*tmp6*tmp9
+    tmp14 = cfdp*tmp8 + cfdp + cgap*tmp13 + kALDOfdp + kALDOgap*tmp12 + tmp11*tmp9
+    tmp15 = 1/tmp14
+    tmp16 = rmaxALDO*tmp15
+    tmp17 = tmp16*tmp6
+    tmp18 = cgap + kALDOgap
+    tmp19 = -cfdp + tmp11
+    tmp20 = tmp14**(-2)
+    tmp21 = cgap*tmp17 - rmaxALDO*tmp18*tmp19*tmp20*tmp6*tmp9
+    tmp22 = tmp8 + 1
+    tmp23 = tmp15*tmp19
+    tmp24 = tmp16*(tmp22*tmp23 + 1)
+    tmp25 = cfdp*tmp7 + tmp12 + tmp13
+    tmp26 = rmaxALDO*tmp19*tmp20
+    tmp27 = tmp10*tmp16
+    tmp28 = kTISdhap*tmp1*tmp5 + tmp3*tmp4
+    tmp29 = ce4p**nDAHPSe4p
+    tmp30 = KDAHPSe4p + tmp29
+    tmp31 = 1/tmp30
+    tmp32 = tmp29*tmp31
+    tmp33 = 1/ce4p
+    tmp34 = cpep**nDAHPSpep
+    tmp35 = KDAHPSpep + tmp34
+    tmp36 = 1/tmp35
+    tmp37 = tmp34*tmp36
+    tmp38 = rmaxDAHPS*tmp37
+    tmp39 = nDAHPSe4p*tmp32*tmp33*tmp38
+    tmp40 = cxyl5p*rmaxTKb
+    tmp41 = rmaxTA/KTAeq
+    tmp42 = cf6p*tmp41
+    tmp43 = tmp40 + tmp42
+    tmp44 = cgap*rmaxTA
+    tmp45 = ce4p*rmaxTKb
+    tmp46 = rmaxTKb/KTKbeq
+    tmp47 = cgap*tmp46
+    tmp48 = ce4p*tmp41
+    tmp49 = tmp47 - tmp48
+    tmp50 = csed7p*rmaxTA
+    tmp51 = cf6p*tmp46
+    tmp52 = tmp50 + tmp51
+    tmp53 = 1/cpep
+    tmp54 = nDAHPSpep*tmp32*tmp38*tmp53
+    tmp55 = 1/KENOpep
+    tmp56 = KENOpg2*(cpep*tmp55 + 1) + cpg2
+    tmp57 = 1/tmp56
+    tmp58 = rmaxENO*tmp57
+    tmp59 = 1/KPGluMueq
+    tmp60 = 1/KPGluMupg2
+    tmp61 = KPGluMupg3*(cpg2*tmp60 + 1) + cpg3
+    tmp62 = 1/tmp61
+    tmp63 = rmaxPGluMu*tmp62
+    tmp64 = 1/KENOeq
+    tmp65 = -cpep*tmp64 + cpg2
+    tmp66 = tmp56**(-2)
+    tmp67 = -cpg2*tmp59 + cpg3
+    tmp68 = tmp61**(-2)
+    tmp69 = KPGluMupg3*tmp60
+    tmp70 = tmp62*tmp67
+    tmp71 = tmp57*tmp65
+    tmp72 = KENOpg2*tmp55
+    tmp73 = KSerSynthpg3 + cpg3
+    tmp74 = catp/KPGKeq
+    tmp75 = 1/KPGKpg3
+    tmp76 = KPGKpgp*(cpg3*tmp75 + 1) + cpgp
+    tmp77 = 1/tmp76
+    tmp78 = 1/(KPGKadp*(1 + catp/KPGKatp) + cadp)
+    tmp79 = rmaxPGK*tmp78
+    tmp80 = tmp77*tmp79
+    tmp81 = KPGKpgp*tmp75
+    tmp82 = cadp*cpgp - cpg3*tmp74
+    tmp83 = tmp76**(-2)
+    tmp84 = tmp77*tmp82
+    tmp85 = cnadh/KGAPDHeq
+    tmp86 = 1/KGAPDHpgp
+    tmp87 = KGAPDHgap*(cpgp*tmp86 + 1) + cgap
+    tmp88 = 1/tmp87
+    tmp89 = 1/(KGAPDHnad*(1 + cnadh/KGAPDHnadh) + cnad)
+    tmp90 = rmaxGAPDH*tmp89
+    tmp91 = tmp88*tmp90
+    tmp92 = KGAPDHgap*tmp86
+    tmp93 = cgap*cnad - cpgp*tmp85
+    tmp94 = tmp87**(-2)
+    tmp95 = tmp88*tmp93
+    tmp96 = cxyl5p*rmaxTKa
+    tmp97 = rmaxR5PI/KR5PIeq
+    tmp98 = KRPPKrib5p + crib5p
+    tmp99 = rmaxTKa/KTKaeq
+    tmp100 = cgap*tmp99
+    tmp101 = crib5p*rmaxTKa
+    tmp102 = csed7p*tmp99
+    tmp103 = rmaxRu5P/KRu5Peq
+    tmp104 = KPGDHpg + cpg
+    tmp105 = 1/tmp104
+    tmp106 = 1/(KPGDHnadp*(1 + catp/KPGDHatpinh)*(1 + cnadph/KPGDHnadphinh) + cnadp)
+    tmp107 = cnadp*rmaxPGDH*tmp105*tmp106
+    tmp108 = rmaxTA + tmp99
+    tmp109 = tmp101 + tmp45
+    tmp110 = 1/KPGIeq
+    tmp111 = 1/KPGIg6ppginh
+    tmp112 = 1/KPGIf6ppginh
+    tmp113 = cpg*tmp112 + 1
+    tmp114 = 1/tmp113
+    tmp115 = 1/KPGIf6p
+    tmp116 = cf6p*tmp115
+    tmp117 = KPGIg6p*(cpg*tmp111 + tmp114*tmp116 + 1) + cg6p
+    tmp118 = 1/tmp117
+    tmp119 = rmaxPGI*tmp118
+    tmp120 = -cf6p*tmp110 + cg6p
+    tmp121 = tmp117**(-2)
+    tmp122 = KPGIg6p*rmaxPGI*tmp120*tmp121
+    tmp123 = tmp114*tmp115
+    tmp124 = 1/KPFKpep
+    tmp125 = cpep*tmp124 + 1 + camp/KPFKampb + cadp/KPFKadpb
+    tmp126 = 1 + camp/KPFKampa + cadp/KPFKadpa
+    tmp127 = KPFKf6ps/tmp126
+    tmp128 = cf6p + tmp125*tmp127
+    tmp129 = 1/tmp128
+    tmp130 = 1/tmp125
+    tmp131 = 1/KPFKf6ps
+    tmp132 = cf6p*tmp126*tmp131
+    tmp133 = tmp130*tmp132
+    tmp134 = tmp133 + 1
+    tmp135 = LPFK*tmp134**(-nPFK)
+    tmp136 = tmp135 + 1
+    tmp137 = 1/tmp136
+    tmp138 = 1/(KPFKatps*(1 + cadp/KPFKadpc) + catp)
+    tmp139 = catp*rmaxPFK*tmp138
+    tmp140 = tmp137*tmp139
+    tmp141 = tmp129*tmp140
+    tmp142 = cf6p*tmp129
+    tmp143 = nPFK*tmp135/tmp134
+    tmp144 = tmp118*tmp120
+    tmp145 = tmp137*tmp143
+    tmp146 = tmp124*tmp140*tmp142*(tmp127*tmp129 + tmp132*tmp145/tmp125**2)
+    tmp147 = tmp122*(tmp111 - tmp112*tmp116/tmp113**2)
+    tmp148 = 1/cfdp
+    tmp149 = 1/(KG1PATatp + catp)
+    tmp150 = KG1PATg1p + cg1p
+    tmp151 = 1/tmp150
+    tmp152 = (cfdp/KG1PATfdp)**nG1PATfdp
+    tmp153 = 1/KPGMeq
+    tmp154 = 1/KPGMg1p
+    tmp155 = KPGMg6p*(cg1p*tmp154 + 1) + cg6p
+    tmp156 = 1/tmp155
+    tmp157 = rmaxPGM*tmp156
+    tmp158 = tmp152 + 1
+    tmp159 = -cg1p*tmp153 + cg6p
+    tmp160 = tmp155**(-2)
+    tmp161 = KPGMg6p*tmp154
+    tmp162 = tmp156*tmp159
+    tmp163 = KG6PDHg6p + cg6p
+    tmp164 = 1/tmp163
+    tmp165 = 1/(1 + cnadph/KG6PDHnadphg6pinh)
+    tmp166 = 1/(KG6PDHnadp*(1 + cnadph/KG6PDHnadphnadpinh) + cnadp)
+    tmp167 = cnadp*rmaxG6PDH*tmp164*tmp165*tmp166
+    tmp168 = 1/cpyr
+    tmp169 = cpep*tmp168
+    tmp170 = cglcex*tmp169
+    tmp171 = KPTSa1 + KPTSa2*tmp169 + KPTSa3*cglcex + tmp170
+    tmp172 = 1/tmp171
+    tmp173 = cg6p**nPTSg6p/KPTSg6p
+    tmp174 = tmp173 + 1
+    tmp175 = nPTSg6p*rmaxPTS*tmp170*tmp172*tmp173/(cg6p*tmp174**2)
+    tmp176 = 64.82759*tmp175
+    tmp177 = KPTSa3 + tmp169
+    tmp178 = cglcex*tmp172
+    tmp179 = tmp177*tmp178 - 1
+    tmp180 = tmp169*tmp172
+    tmp181 = 1/tmp174
+    tmp182 = rmaxPTS*tmp181
+    tmp183 = tmp180*tmp182
+    tmp184 = 64.82759*tmp183
+    tmp185 = -tmp179*tmp184
+    tmp186 = KPTSa2 + cglcex
+    tmp187 = tmp180*tmp186 - 1
+    tmp188 = -tmp187
+    tmp189 = tmp178*tmp182
+    tmp190 = tmp168*tmp189
+    tmp191 = 64.82759*tmp190
+    tmp192 = cpep/cpyr**2
+    tmp193 = tmp189*tmp192
+    tmp194 = 64.82759*tmp193
+    tmp195 = tmp171**(-2)
+    tmp196 = tmp188*tmp193
+    tmp197 = KpepCxylasepep + cpep
+    tmp198 = 1/tmp197
+    tmp199 = (cfdp/KpepCxylasefdp)**npepCxylasefdp
+    tmp200 = 1/KPKpep
+    tmp201 = 1/KPKfdp
+    tmp202 = 1/(cfdp*tmp201 + 1 + camp/KPKamp)
+    tmp203 = LPK*(tmp202*(1 + catp/KPKatp))**nPK
+    tmp204 = cpep*tmp200
+    tmp205 = tmp204 + 1
+    tmp206 = tmp205**nPK
+    tmp207 = tmp203 + tmp206
+    tmp208 = nPK - 1
+    tmp209 = cadp*rmaxPK*tmp205**tmp208/(KPKadp + cadp)
+    tmp210 = nPK*tmp209/tmp207**2
+    tmp211 = tmp201*tmp202*tmp203*tmp210
+    tmp212 = KSynth1pep + cpep
+    tmp213 = tmp199 + 1
+    tmp214 = tmp209/tmp207
+    tmp215 = cpep/(KPKpep**2*tmp205)
+    tmp216 = -64.82759*cglcex*tmp182*tmp186*tmp192*tmp195 + tmp191 + tmp200*tmp214 - tmp206*tmp210*tmp215 + tmp208*tmp214*tmp215
+    tmp217 = KSynth2pyr + cpyr
+    tmp218 = cpyr**nPDH
+    tmp219 = KPDHpyr + tmp218
+
+    return [
+        cdhap*rmaxG3PDH/tmp0**2 - rmaxG3PDH/tmp0 - tmp21 - tmp3 + tmp5 - 2.78e-5,
+        tmp24,
+        tmp25*tmp26 - tmp27 + tmp28,
+        ce4p**(2*nDAHPSe4p)*nDAHPSe4p*rmaxDAHPS*tmp33*tmp34*tmp36/tmp30**2 - tmp39 - tmp43 - 2.78e-5,
+        tmp44,
+        -tmp45,
+        tmp49,
+        tmp52,
+        tmp54*(tmp37 - 1),
+        rmaxENO*tmp65*tmp66 - rmaxPGluMu*tmp67*tmp68*tmp69 - tmp58 - tmp59*tmp63 - 2.78e-5,
+        tmp63*(1 - tmp70),
+        tmp58*(tmp64 + tmp71*tmp72),
+        tmp63*(tmp59 + tmp69*tmp70),
+        cpg3*rmaxSerSynth/tmp73**2 + rmaxPGluMu*tmp67*tmp68 - rmaxSerSynth/tmp73 - tmp63 - tmp74*tmp80 - tmp79*tmp81*tmp82*tmp83 - 2.78e-5,
+        tmp80*(cadp - tmp84),
+        tmp80*(tmp74 + tmp81*tmp84),
+        -cadp*tmp80 + rmaxPGK*tmp78*tmp82*tmp83 - tmp85*tmp91 - tmp90*tmp92*tmp93*tmp94 - 2.78e-5,
+        tmp91*(cnad - tmp95),
+        crib5p*rmaxRPPK/tmp98**2 - rmaxRPPK/tmp98 - tmp96 - tmp97 - 2.78e-5,
+        rmaxR5PI,
+        tmp100,
+        -tmp101,
+        tmp102,
+        tmp97,
+        -rmaxR5PI - rmaxRu5P - 2.78e-5,
+        tmp103,
+        tmp107*(-cpg*tmp105 + 1),
+        tmp42,
+        tmp96,
+        -tmp100 - tmp44 - 2.78e-5,
+        tmp101,
+        tmp48,
+        -csed7p*tmp108,
+        -tmp40,
+        -tmp96,
+        rmaxRu5P,
+        tmp100,
+        -tmp103 - tmp109 - 2.78e-5,
+        tmp47,
+        tmp102 + tmp51,
+        tmp40 - tmp42,
+        tmp44,
+        tmp45,
+        catp*cf6p*rmaxPFK*tmp137*tmp138/tmp128**2 - tmp110*tmp119 - tmp122*tmp123 - tmp126*tmp130*tmp131*tmp139*tmp142*tmp143/tmp136**2 - tmp141 - tmp47 - tmp48 - 2.78e-5,
+        tmp119*(1 - tmp144),
+        tmp50 - tmp51,
+        tmp146,
+        -tmp147,
+        tmp17*(cgap - tmp18*tmp23*tmp9),
+        tmp141*(tmp133*tmp145 - tmp142 + 1),
+        -tmp16 - tmp22*tmp26 - 2.78e-5,
+        tmp16*(tmp10 - tmp23*tmp25),
+        -tmp146,
+        -catp*cg1p*nG1PATfdp*rmaxG1PAT*tmp148*tmp149*tmp151*tmp152,
+        catp*cg1p*rmaxG1PAT*tmp149*tmp158/tmp150**2 - catp*rmaxG1PAT*tmp149*tmp151*tmp158 - rmaxPGM*tmp159*tmp160*tmp161 - tmp153*tmp157 - 2.78e-5,
+        tmp157*(1 - tmp162),
+        tmp119*(KPGIg6p*tmp123*tmp144 + tmp110),
+        tmp157*(tmp153 + tmp161*tmp162),
+        cg6p*cnadp*rmaxG6PDH*tmp165*tmp166/tmp163**2 + rmaxPGI*tmp120*tmp121 + rmaxPGM*tmp159*tmp160 - tmp119 - tmp157 - tmp167 - tmp176 - 2.78e-5,
+        tmp185,
+        tmp188*tmp191,
+        tmp147,
+        tmp187*tmp194,
+        -tmp21 + tmp3 - tmp5,
+        tmp43,
+        tmp91*(tmp85 + tmp92*tmp95),
+        tmp96,
+        -cgap*tmp108,
+        tmp109,
+        -tmp49,
+        tmp24,
+        -cnad*tmp91 + rmaxALDO*tmp19*tmp20*tmp25 + rmaxGAPDH*tmp89*tmp93*tmp94 - tmp102 - tmp27 - tmp28 - tmp52 - 2.78e-5,
+        tmp175,
+        cglcex*cpep*rmaxPTS*tmp168*tmp177*tmp181*tmp195 - tmp183 - 2.78e-5,
+        tmp187*tmp190,
+        tmp196,
+        tmp39*(tmp32 - 1),
+        tmp58*(1 - tmp71),
+        -cpep*(npepCxylasefdp*rmaxpepCxylase*tmp148*tmp198*tmp199 + tmp200*tmp211),
+        tmp176,
+        tmp179*tmp184,
+        cpep*rmaxSynth1/tmp212**2 + cpep*rmaxpepCxylase*tmp213/tmp197**2 + cpep**(2*nDAHPSpep)*nDAHPSpep*rmaxDAHPS*tmp29*tmp31*tmp53/tmp35**2 - rmaxENO*tmp65*tmp66*tmp72 - rmaxSynth1/tmp212 - rmaxpepCxylase*tmp198*tmp213 - tmp216 - tmp54 - tmp58*tmp64 - 2.78e-5,
+        64.82759*tmp196,
+        tmp167*(-cg6p*tmp164 + 1),
+        cnadp*cpg*rmaxPGDH*tmp106/tmp104**2 - tmp107 - 2.78e-5,
+        tmp204*tmp211,
+        -tmp176,
+        tmp185,
+        tmp216,
+        64.82759*cglcex*cpep**2*rmaxPTS*tmp181*tmp186*tmp195/cpyr**3 + cpyr*rmaxSynth2/tmp217**2 + cpyr**(2*nPDH)*nPDH*rmaxPDH*tmp168/tmp219**2 - nPDH*rmaxPDH*tmp168*tmp218/tmp219 - rmaxSynth2/tmp217 - tmp194 - 2.78e-5,
+    ]
+    # =======================================================
+
+
+# NON-ZERO DERIVATIVES WITH RESPECT TO THE PARAMETERS
+# =======================================================
+def parameterEntries(init, t, par):
+    """
+    Evaluates the structurally non-zero derivatives of the equations with respect to the parameters, in the order
+    given by PAR_ROWS and PAR_COLS
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: list with the values of the non-zero entries
+    """
+    kALDOdhap = par[0]
+    kALDOeq = par[1]
+    kALDOfdp = par[2]
+    kALDOgap = par[3]
+    kALDOgapinh = par[4]
+    KDAHPSe4p = par[5]
+    KDAHPSpep = par[6]
+    KENOeq = par[7]
+    KENOpep = par[8]
+    KENOpg2 = par[9]
+    KG1PATatp = par[10]
+    KG1PATfdp = par[11]
+    KG1PATg1p = par[12]
+    KG3PDHdhap = par[13]
+    KG6PDHg6p = par[14]
+    KG6PDHnadp = par[15]
+    KG6PDHnadphg6pinh = par[16]
+    KG6PDHnadphnadpinh = par[17]
+    KGAPDHeq = par[18]
+    KGAPDHgap = par[19]
+    KGAPDHnad = par[20]
+    KGAPDHnadh = par[21]
+    KGAPDHpgp = par[22]
+    KPDHpyr = par[23]
+    KpepCxylasefdp = par[24]
+    KpepCxylasepep = par[25]
+    KPFKadpa = par[26]
+    KPFKadpb = par[27]
+    KPFKadpc = par[28]
+    KPFKampa = par[29]
+    KPFKampb = par[30]
+    KPFKatps = par[31]
+    KPFKf6ps = par[32]
+    KPFKpep = par[33]
+    KPGDHatpinh = par[34]
+    KPGDHnadp = par[35]
+    KPGDHnadphinh = par[36]
+    KPGDHpg = par[37]
+    KPGIeq = par[38]
+    KPGIf6p = par[39]
+    KPGIf6ppginh = par[40]
+    KPGIg6p = par[41]
+    KPGIg6ppginh = par[42]
+    KPGKadp = par[43]
+    KPGKatp = par[44]
+    KPGKeq = par[45]
+    KPGKpg3 = par[46]
+    KPGKpgp = par[47]
+    KPGluMueq = par[48]
+    KPGluMupg2 = par[49]
+    KPGluMupg3 = par[50]
+    KPGMeq = par[51]
+    KPGMg1p = par[52]
+    KPGMg6p = par[53]
+    KPKadp = par[54]
+    KPKamp = par[55]
+    KPKatp = par[56]
+    KPKfdp = par[57]
+    KPKpep = par[58]
+    KPTSa1 = par[59]
+    KPTSa2 = par[60]
+    KPTSa3 = par[61]
+    KPTSg6p = par[62]
+    KR5PIeq = par[63]
+    KRPPKrib5p = par[64]
+    KRu5Peq = par[65]
+    KSerSynthpg3 = par[66]
+    KSynth1pep = par[67]
+    KSynth2pyr = par[68]
+    KTAeq = par[69]
+    kTISdhap = par[70]
+    kTISeq = par[71]
+    kTISgap = par[72]
+    KTKaeq = par[73]
+    KTKbeq = par[74]
+    LPFK = par[75]
+    LPK = par[76]
+    nDAHPSe4p = par[77]
+    nDAHPSpep = par[78]
+    nG1PATfdp = par[79]
+    nPDH = par[80]
+    npepCxylasefdp = par[81]
+    nPFK = par[82]
+    nPK = par[83]
+    nPTSg6p = par[84]
+    rmaxALDO = par[85]
+    rmaxDAHPS = par[86]
+    rmaxENO = par[87]
+    rmaxG1PAT = par[88]
+    rmaxG3PDH = par[89]
+    rmaxG6PDH = par[90]
+    rmaxGAPDH = par[91]
+    rmaxPDH = par[94]
+    rmaxpepCxylase = par[95]
+    rmaxPFK = par[96]
+    rmaxPGDH = par[97]
+    rmaxPGI = par[98]
+    rmaxPGK = par[99]
+    rmaxPGluMu = par[100]
+    rmaxPGM = par[101]
+    rmaxPK = par[102]
+    rmaxPTS = par[103]
+    rmaxR5PI = par[104]
+    rmaxRPPK = par[105]
+    rmaxRu5P = par[106]
+    rmaxSerSynth = par[107]
+    rmaxSynth1 = par[108]
+    rmaxSynth2 = par[109]
+    rmaxTA = par[110]
+    rmaxTIS = par[111]
+    rmaxTKa = par[112]
+    rmaxTKb = par[113]
+    VALDOblf = par[115]
+
+    cdhap = init[0]
+    ce4p = init[1]
+    cpg2 = init[2]
+    cpg3 = init[3]
+    cpgp = init[4]
+    crib5p = init[5]
+    cribu5p = init[6]
+    csed7p = init[7]
+    cxyl5p = init[8]
+    cf6p = init[9]
+    cfdp = init[10]
+    cg1p = init[11]
+    cg6p = init[12]
+    cgap = init[13]
+    cglcex = init[14]
+    cpep = init[15]
+    cpg = init[16]
+    cpyr = init[17]
+
+    cadp, camp, catp, cnad, cnadh, cnadp, cnadph = cofactors(t)
+
+    tmp0 = 1/kALDOeq
+    tmp1 = cdhap*cgap
+    tmp2 = tmp0*tmp1
+    tmp3 = -cfdp + tmp2
+    tmp4 = cfdp*cgap
+    tmp5 = 1/VALDOblf
+    tmp6 = cdhap*kALDOgap
+    tmp7 = tmp0*tmp5
+    tmp8 = cgap*kALDOdhap
+    tmp9 = cfdp + kALDOfdp + tmp2*tmp5 + tmp6*tmp7 + tmp7*tmp8 + tmp4/kALDOgapinh
+    tmp10 = rmaxALDO*tmp3/tmp9**2
+    tmp11 = tmp10*tmp7
+    tmp12 = cgap*tmp11
+    tmp13 = tmp1 + tmp6 + tmp8
+    tmp14 = 1/tmp9
+    tmp15 = tmp14*tmp3
+    tmp16 = tmp1 - tmp13*tmp15*tmp5
+    tmp17 = rmaxALDO*tmp14/kALDOeq**2
+    tmp18 = tmp16*tmp17
+    tmp19 = cdhap*tmp11
+    tmp20 = tmp10*tmp4/kALDOgapinh**2
+    tmp21 = -tmp20
+    tmp22 = KG3PDHdhap + cdhap
+    tmp23 = cgap/kTISgap + 1
+    tmp24 = cdhap - cgap/kTISeq
+    tmp25 = cdhap + kTISdhap*tmp23
+    tmp26 = rmaxTIS*tmp24/tmp25**2
+    tmp27 = tmp23*tmp26
+    tmp28 = 1/tmp25
+    tmp29 = cgap*rmaxTIS*tmp28/kTISeq**2
+    tmp30 = cgap*kTISdhap*tmp26/kTISgap**2
+    tmp31 = -tmp15
+    tmp32 = tmp24*tmp28
+    tmp33 = tmp0*tmp10*tmp13/VALDOblf**2
+    tmp34 = -tmp33
+    tmp35 = ce4p**nDAHPSe4p
+    tmp36 = KDAHPSe4p + tmp35
+    tmp37 = cpep**nDAHPSpep
+    tmp38 = KDAHPSpep + tmp37
+    tmp39 = tmp37/tmp38
+    tmp40 = rmaxDAHPS*tmp35*tmp39/tmp36**2
+    tmp41 = tmp35/tmp36
+    tmp42 = rmaxDAHPS*tmp37*tmp41/tmp38**2
+    tmp43 = ce4p*cf6p
+    tmp44 = rmaxTA*tmp43/KTAeq**2
+    tmp45 = cf6p*cgap*rmaxTKb/KTKbeq**2
+    tmp46 = -tmp45
+    tmp47 = tmp39*tmp41
+    tmp48 = rmaxDAHPS*tmp47
+    tmp49 = tmp48*(tmp41 - 1)*np.log(ce4p)
+    tmp50 = tmp48*(tmp39 - 1)*np.log(cpep)
+    tmp51 = -tmp47
+    tmp52 = cgap*csed7p
+    tmp53 = tmp52 - tmp43/KTAeq
+    tmp54 = ce4p*cxyl5p - cf6p*cgap/KTKbeq
+    tmp55 = -tmp54
+    tmp56 = 1 + cpep/KENOpep
+    tmp57 = KENOpg2*tmp56 + cpg2
+    tmp58 = 1/tmp57
+    tmp59 = cpep*rmaxENO
+    tmp60 = tmp58*tmp59/KENOeq**2
+    tmp61 = cpg2 - cpep/KENOeq
+    tmp62 = tmp61/tmp57**2
+    tmp63 = KENOpg2*tmp59*tmp62/KENOpep**2
+    tmp64 = rmaxENO*tmp56*tmp62
+    tmp65 = 1 + cpg2/KPGluMupg2
+    tmp66 = KPGluMupg3*tmp65 + cpg3
+    tmp67 = 1/tmp66
+    tmp68 = cpg2*rmaxPGluMu
+    tmp69 = tmp67*tmp68/KPGluMueq**2
+    tmp70 = cpg3 - cpg2/KPGluMueq
+    tmp71 = tmp70/tmp66**2
+    tmp72 = KPGluMupg3*tmp68*tmp71/KPGluMupg2**2
+    tmp73 = rmaxPGluMu*tmp65*tmp71
+    tmp74 = tmp58*tmp61
+    tmp75 = tmp67*tmp70
+    tmp76 = 1 + catp/KPGKatp
+    tmp77 = KPGKadp*tmp76 + cadp
+    tmp78 = 1 + cpg3/KPGKpg3
+    tmp79 = KPGKpgp*tmp78 + cpgp
+    tmp80 = 1/tmp79
+    tmp81 = catp*cpg3
+    tmp82 = cadp*cpgp - tmp81/KPGKeq
+    tmp83 = tmp80*tmp82
+    tmp84 = rmaxPGK*tmp83/tmp77**2
+    tmp85 = tmp76*tmp84
+    tmp86 = KPGKadp*catp*tmp84/KPGKatp**2
+    tmp87 = 1/tmp77
+    tmp88 = rmaxPGK*tmp87
+    tmp89 = tmp80*tmp81*tmp88/KPGKeq**2
+    tmp90 = tmp82*tmp88/tmp79**2
+    tmp91 = KPGKpgp*cpg3*tmp90/KPGKpg3**2
+    tmp92 = tmp78*tmp90
+    tmp93 = KSerSynthpg3 + cpg3
+    tmp94 = tmp83*tmp87
+    tmp95 = 1 + cnadh/KGAPDHnadh
+    tmp96 = KGAPDHnad*tmp95 + cnad
+    tmp97 = 1/tmp96
+    tmp98 = cnadh*cpgp
+    tmp99 = 1 + cpgp/KGAPDHpgp
+    tmp100 = KGAPDHgap*tmp99 + cgap
+    tmp101 = 1/tmp100
+    tmp102 = rmaxGAPDH*tmp101
+    tmp103 = tmp102*tmp97*tmp98/KGAPDHeq**2
+    tmp104 = cgap*cnad - tmp98/KGAPDHeq
+    tmp105 = tmp104*tmp97
+    tmp106 = rmaxGAPDH*tmp105/tmp100**2
+    tmp107 = tmp106*tmp99
+    tmp108 = tmp102*tmp104/tmp96**2
+    tmp109 = tmp108*tmp95
+    tmp110 = KGAPDHnad*cnadh*tmp108/KGAPDHnadh**2
+    tmp111 = KGAPDHgap*cpgp*tmp106/KGAPDHpgp**2
+    tmp112 = tmp101*tmp105
+    tmp113 = crib5p*rmaxR5PI/KR5PIeq**2
+    tmp114 = KRPPKrib5p + crib5p
+    tmp115 = rmaxTKa*tmp52/KTKaeq**2
+    tmp116 = -tmp115
+    tmp117 = cribu5p - crib5p/KR5PIeq
+    tmp118 = crib5p*cxyl5p - cgap*csed7p/KTKaeq
+    tmp119 = -tmp118
+    tmp120 = 1 + cnadph/KPGDHnadphinh
+    tmp121 = KPGDHpg + cpg
+    tmp122 = 1/tmp121
+    tmp123 = 1 + catp/KPGDHatpinh
+    tmp124 = tmp120*tmp123
+    tmp125 = KPGDHnadp*tmp124 + cnadp
+    tmp126 = cnadp*cpg*rmaxPGDH*tmp122/tmp125**2
+    tmp127 = KPGDHnadp*tmp126
+    tmp128 = catp*tmp120*tmp127/KPGDHatpinh**2
+    tmp129 = tmp124*tmp126
+    tmp130 = cnadph*tmp123*tmp127/KPGDHnadphinh**2
+    tmp131 = cnadp*cpg/tmp125
+    tmp132 = rmaxPGDH*tmp131/tmp121**2
+    tmp133 = cxyl5p*rmaxRu5P/KRu5Peq**2
+    tmp134 = tmp122*tmp131
+    tmp135 = cribu5p - cxyl5p/KRu5Peq
+    tmp136 = -tmp44
+    tmp137 = -tmp53
+    tmp138 = 1 + camp/KPFKampa + cadp/KPFKadpa
+    tmp139 = 1 + cpep/KPFKpep + camp/KPFKampb + cadp/KPFKadpb
+    tmp140 = 1/tmp138
+    tmp141 = KPFKf6ps*tmp140
+    tmp142 = 1/(cf6p + tmp139*tmp141)
+    tmp143 = tmp139*tmp142
+    tmp144 = 1/KPFKf6ps
+    tmp145 = 1/tmp139
+    tmp146 = cf6p*tmp144*tmp145
+    tmp147 = tmp138*tmp146 + 1
+    tmp148 = tmp147**(-nPFK)
+    tmp149 = LPFK*tmp148
+    tmp150 = tmp149 + 1
+    tmp151 = 1/tmp150
+    tmp152 = nPFK*tmp149/tmp147
+    tmp153 = KPFKf6ps*tmp143/tmp138**2 + tmp146*tmp151*tmp152
+    tmp154 = 1 + cadp/KPFKadpc
+    tmp155 = KPFKatps*tmp154 + catp
+    tmp156 = 1/tmp155
+    tmp157 = cf6p*tmp151
+    tmp158 = catp*tmp142*tmp157
+    tmp159 = tmp156*tmp158
+    tmp160 = rmaxPFK*tmp159
+    tmp161 = cadp*tmp160
+    tmp162 = tmp153*tmp161/KPFKadpa**2
+    tmp163 = tmp138*tmp152*tmp157
+    tmp164 = tmp141*tmp142 + tmp144*tmp163/tmp139**2
+    tmp165 = tmp161*tmp164/KPFKadpb**2
+    tmp166 = rmaxPFK*tmp158/tmp155**2
+    tmp167 = KPFKatps*cadp*tmp166/KPFKadpc**2
+    tmp168 = camp*tmp160
+    tmp169 = tmp153*tmp168/KPFKampa**2
+    tmp170 = tmp164*tmp168/KPFKampb**2
+    tmp171 = tmp154*tmp166
+    tmp172 = tmp160*(tmp140*tmp143 + tmp145*tmp163/KPFKf6ps**2)
+    tmp173 = cpep*tmp160*tmp164/KPFKpep**2
+    tmp174 = 1/KPGIf6p
+    tmp175 = 1 + cpg/KPGIf6ppginh
+    tmp176 = cf6p/tmp175
+    tmp177 = tmp174*tmp176 + 1 + cpg/KPGIg6ppginh
+    tmp178 = KPGIg6p*tmp177 + cg6p
+    tmp179 = 1/tmp178
+    tmp180 = cf6p*rmaxPGI
+    tmp181 = tmp179*tmp180/KPGIeq**2
+    tmp182 = cg6p - cf6p/KPGIeq
+    tmp183 = tmp182/tmp178**2
+    tmp184 = rmaxPGI*tmp183
+    tmp185 = KPGIg6p*tmp184
+    tmp186 = tmp176*tmp185/KPGIf6p**2
+    tmp187 = KPGIg6p*cpg*tmp174*tmp180*tmp183/(KPGIf6ppginh**2*tmp175**2)
+    tmp188 = tmp177*tmp184
+    tmp189 = cpg*tmp185/KPGIg6ppginh**2
+    tmp190 = catp*cf6p*rmaxPFK*tmp142*tmp156/tmp150**2
+    tmp191 = tmp148*tmp190
+    tmp192 = tmp149*tmp190*np.log(tmp147)
+    tmp193 = tmp179*tmp182
+    tmp194 = KG1PATatp + catp
+    tmp195 = KG1PATg1p + cg1p
+    tmp196 = 1/tmp195
+    tmp197 = 1/KG1PATfdp
+    tmp198 = cfdp*tmp197
+    tmp199 = tmp198**nG1PATfdp
+    tmp200 = tmp199 + 1
+    tmp201 = catp*cg1p*tmp196*tmp200
+    tmp202 = 1/tmp194
+    tmp203 = catp*cg1p*rmaxG1PAT*tmp202
+    tmp204 = tmp196*tmp199*tmp203
+    tmp205 = 1 + cg1p/KPGMg1p
+    tmp206 = KPGMg6p*tmp205 + cg6p
+    tmp207 = 1/tmp206
+    tmp208 = cg1p*rmaxPGM
+    tmp209 = tmp207*tmp208/KPGMeq**2
+    tmp210 = cg6p - cg1p/KPGMeq
+    tmp211 = tmp210/tmp206**2
+    tmp212 = KPGMg6p*tmp208*tmp211/KPGMg1p**2
+    tmp213 = rmaxPGM*tmp205*tmp211
+    tmp214 = tmp207*tmp210
+    tmp215 = KG6PDHg6p + cg6p
+    tmp216 = 1 + cnadph/KG6PDHnadphg6pinh
+    tmp217 = 1/tmp216
+    tmp218 = 1 + cnadph/KG6PDHnadphnadpinh
+    tmp219 = KG6PDHnadp*tmp218 + cnadp
+    tmp220 = 1/tmp219
+    tmp221 = cg6p*cnadp*tmp217*tmp220
+    tmp222 = rmaxG6PDH*tmp221/tmp215**2
+    tmp223 = 1/tmp215
+    tmp224 = cg6p*cnadp*rmaxG6PDH*tmp223
+    tmp225 = tmp217*tmp224/tmp219**2
+    tmp226 = tmp218*tmp225
+    tmp227 = cnadph*tmp220*tmp224/(KG6PDHnadphg6pinh**2*tmp216**2)
+    tmp228 = KG6PDHnadp*cnadph*tmp225/KG6PDHnadphnadpinh**2
+    tmp229 = cg6p**nPTSg6p
+    tmp230 = tmp229/KPTSg6p
+    tmp231 = tmp230 + 1
+    tmp232 = 1/tmp231
+    tmp233 = cpep/cpyr
+    tmp234 = cglcex*tmp233
+    tmp235 = tmp232*tmp234
+    tmp236 = KPTSa1 + KPTSa2*tmp233 + KPTSa3*cglcex + tmp234
+    tmp237 = rmaxPTS/tmp236**2
+    tmp238 = tmp235*tmp237
+    tmp239 = 64.82759*tmp238
+    tmp240 = -tmp239
+    tmp241 = tmp232*tmp237
+    tmp242 = cglcex*cpep**2*tmp241/cpyr**2
+    tmp243 = 64.82759*tmp242
+    tmp244 = -tmp243
+    tmp245 = cglcex**2*tmp233*tmp241
+    tmp246 = 64.82759*tmp245
+    tmp247 = -tmp246
+    tmp248 = 1/tmp236
+    tmp249 = rmaxPTS*tmp234*tmp248/tmp231**2
+    tmp250 = tmp229*tmp249/KPTSg6p**2
+    tmp251 = 64.82759*tmp250
+    tmp252 = tmp230*tmp249*np.log(cg6p)
+    tmp253 = 64.82759*tmp252
+    tmp254 = -tmp253
+    tmp255 = tmp221*tmp223
+    tmp256 = tmp235*tmp248
+    tmp257 = 64.82759*tmp256
+    tmp258 = 1/KpepCxylasefdp
+    tmp259 = KpepCxylasepep + cpep
+    tmp260 = 1/tmp259
+    tmp261 = cfdp*tmp258
+    tmp262 = tmp261**npepCxylasefdp
+    tmp263 = cpep*rmaxpepCxylase*tmp260*tmp262
+    tmp264 = cpep*(tmp262 + 1)
+    tmp265 = KPKadp + cadp
+    tmp266 = cpep/KPKpep
+    tmp267 = tmp266 + 1
+    tmp268 = tmp267**nPK
+    tmp269 = 1 + catp/KPKatp
+    tmp270 = 1/(1 + cfdp/KPKfdp + camp/KPKamp)
+    tmp271 = tmp269*tmp270
+    tmp272 = tmp271**nPK
+    tmp273 = LPK*tmp272
+    tmp274 = tmp268 + tmp273
+    tmp275 = 1/tmp274
+    tmp276 = nPK - 1
+    tmp277 = tmp267**tmp276
+    tmp278 = cadp*tmp266*tmp275*tmp277
+    tmp279 = rmaxPK*tmp278/tmp265**2
+    tmp280 = 1/tmp265
+    tmp281 = cadp*rmaxPK*tmp277*tmp280
+    tmp282 = tmp266*tmp281/tmp274**2
+    tmp283 = nPK*tmp273*tmp282
+    tmp284 = tmp270*tmp283
+    tmp285 = camp*tmp284/KPKamp**2
+    tmp286 = catp*tmp283/(KPKatp**2*tmp269)
+    tmp287 = cfdp*tmp284/KPKfdp**2
+    tmp288 = tmp266/tmp267
+    tmp289 = -nPK*tmp268*tmp275*tmp288 + tmp276*tmp288 + 1
+    tmp290 = cpep*tmp275*tmp281/KPKpep**2
+    tmp291 = KSynth1pep + cpep
+    tmp292 = tmp272*tmp282
+    tmp293 = np.log(tmp267)
+    tmp294 = -tmp275*(tmp268*tmp293 + tmp273*np.log(tmp271)) + tmp293
+    tmp295 = tmp278*tmp280
+    tmp296 = rmaxPK*tmp295
+    tmp297 = cpyr**nPDH
+    tmp298 = KPDHpyr + tmp297
+    tmp299 = KSynth2pyr + cpyr
+    tmp300 = tmp297/tmp298
+
+    return [
+        tmp12,
+        tmp18,
+        tmp10,
+        tmp19,
+        tmp21,
+        cdhap*rmaxG3PDH/tmp22**2,
+        tmp27,
+        -tmp29,
+        -tmp30,
+        tmp31,
+        -cdhap/tmp22,
+        -tmp32,
+        tmp34,
+        tmp40,
+        tmp42,
+        tmp44,
+        tmp46,
+        tmp49,
+        tmp50,
+        tmp51,
+        tmp53,
+        tmp55,
+        -tmp60,
+        -tmp63,
+        tmp64,
+        tmp69,
+        tmp72,
+        -tmp73,
+        -tmp74,
+        tmp75,
+        -tmp85,
+        tmp86,
+        tmp89,
+        tmp91,
+        -tmp92,
+        -tmp69,
+        -tmp72,
+        tmp73,
+        cpg3*rmaxSerSynth/tmp93**2,
+        tmp94,
+        -tmp75,
+        -cpg3/tmp93,
+        tmp103,
+        -tmp107,
+        -tmp109,
+        tmp110,
+        tmp111,
+        tmp85,
+        -tmp86,
+        -tmp89,
+        -tmp91,
+        tmp92,
+        tmp112,
+        -tmp94,
+        tmp113,
+        crib5p*rmaxRPPK/tmp114**2,
+        tmp116,
+        tmp117,
+        -crib5p/tmp114,
+        tmp119,
+        tmp128,
+        -tmp129,
+        tmp130,
+        -tmp132,
+        -tmp113,
+        -tmp133,
+        tmp134,
+        -tmp117,
+        -tmp135,
+        tmp136,
+        tmp115,
+        tmp137,
+        tmp118,
+        tmp133,
+        tmp116,
+        tmp46,
+        tmp135,
+        tmp119,
+        tmp55,
+        tmp162,
+        -tmp165,
+        -tmp167,
+        tmp169,
+        -tmp170,
+        tmp171,
+        tmp172,
+        -tmp173,
+        tmp181,
+        tmp186,
+        -tmp187,
+        -tmp188,
+        tmp189,
+        tmp44,
+        tmp45,
+        tmp191,
+        -tmp192,
+        -2,
+        -tmp159,
+        tmp193,
+        tmp53,
+        tmp54,
+        -tmp12,
+        -tmp16*tmp17,
+        -tmp10,
+        -tmp19,
+        tmp20,
+        -tmp162,
+        tmp165,
+        tmp167,
+        -tmp169,
+        tmp170,
+        -tmp171,
+        -tmp172,
+        tmp173,
+        -tmp191,
+        tmp192,
+        tmp15,
+        tmp159,
+        tmp33,
+        rmaxG1PAT*tmp201/tmp194**2,
+        nG1PATfdp*tmp197*tmp204,
+        tmp200*tmp203/tmp195**2,
+        tmp209,
+        tmp212,
+        -tmp213,
+        -tmp204*np.log(tmp198),
+        -tmp201*tmp202,
+        tmp214,
+        tmp222,
+        tmp226,
+        -tmp227,
+        -tmp228,
+        -tmp181,
+        -tmp186,
+        tmp187,
+        tmp188,
+        -tmp189,
+        -tmp209,
+        -tmp212,
+        tmp213,
+        tmp240,
+        tmp244,
+        tmp247,
+        tmp251,
+        tmp254,
+        -tmp255,
+        -tmp193,
+        -tmp214,
+        tmp257,
+        tmp12,
+        tmp18,
+        tmp10,
+        tmp19,
+        tmp21,
+        -tmp103,
+        tmp107,
+        tmp109,
+        -tmp110,
+        -tmp111,
+        tmp136,
+        -tmp27,
+        tmp29,
+        tmp30,
+        tmp115,
+        tmp45,
+        tmp31,
+        -tmp112,
+        tmp137,
+        tmp32,
+        tmp118,
+        tmp54,
+        1,
+        tmp34,
+        tmp238,
+        tmp242,
+        tmp245,
+        -tmp250,
+        tmp252,
+        -tmp256,
+        tmp40,
+        tmp42,
+        tmp60,
+        tmp63,
+        -tmp64,
+        npepCxylasefdp*tmp258*tmp263,
+        rmaxpepCxylase*tmp264/tmp259**2,
+        tmp279,
+        tmp285,
+        -tmp286,
+        tmp287,
+        tmp289*tmp290,
+        tmp239,
+        tmp243,
+        tmp246,
+        -tmp251,
+        cpep*rmaxSynth1/tmp291**2,
+        tmp292,
+        tmp49,
+        tmp50,
+        -tmp263*np.log(tmp261),
+        -tmp294*tmp296,
+        tmp253,
+        tmp51,
+        tmp74,
+        -tmp260*tmp264,
+        -tmp295,
+        -tmp257,
+        -cpep/tmp291,
+        -tmp222,
+        -tmp226,
+        tmp227,
+        tmp228,
+        -tmp128,
+        tmp129,
+        -tmp130,
+        tmp132,
+        tmp255,
+        -tmp134,
+        rmaxPDH*tmp297/tmp298**2,
+        -tmp279,
+        -tmp285,
+        tmp286,
+        -tmp287,
+        -tmp289*tmp290,
+        tmp240,
+        tmp244,
+        tmp247,
+        tmp251,
+        cpyr*rmaxSynth2/tmp299**2,
+        -tmp292,
+        rmaxPDH*tmp300*(tmp300 - 1)*np.log(cpyr),
+        tmp294*tmp296,
+        tmp254,
+        1,
+        -tmp300,
+        tmp295,
+        tmp257,
+        -cpyr/tmp299,
+        1,
+    ]
+    # =======================================================
+
+
+# DENSE JACOBIAN
+# =======================================================
+def jac(init, t, par):
+    """
+    Analytical Jacobian of the differential equations of the model, with the same arguments as eqs. It can be
+    passed to odeint as Dfun to avoid building the Jacobian by finite differences
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: array of shape (18, 18), J[i, j] is the derivative of equation i with respect to species j
+    """
+    J = np.zeros((18, 18))
+    J[ROWS, COLS] = entries(init, t, par)
+    return J
+    # =======================================================
+
+
+# SPARSE JACOBIAN
+# =======================================================
+def jac_sparse(init, t, par):
+    """
+    Analytical Jacobian of the differential equations of the model as a sparse matrix, for the solvers of
+    scipy.integrate.solve_ivp (BDF, Radau) that can exploit it
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: scipy.sparse.csc_matrix of shape (18, 18)
+    """
+    return sparse.csc_matrix((entries(init, t, par), (ROWS, COLS)), shape=(18, 18))
+    # =======================================================
+
+
+# BATCHED JACOBIAN
+# =======================================================
+def jac_batch(init, t, par):
+    """
+    Jacobians of many states and parameter sets at once, with the same arguments as equations.eqs_batch
+    :param init: array of shape (N, 18), one state per row
+    :param t: time of the integration, shared by all the rows, or array with the time of every row
+    :param par: array of shape (N, number of parameters), one parameter set per row, or a single parameter set
+    shared by all the rows
+    :return: array of shape (N, 18, 18)
+    """
+    init = np.asarray(init, dtype=float)
+    par = np.asarray(par, dtype=float)
+    # transposed, every entry is evaluated on whole columns of the batch
+    values = np.array(np.broadcast_arrays(*entries(init.T, t, par.T)))
+    J = np.zeros((len(init), 18, 18))
+    J[:, ROWS, COLS] = values.T
+    return J
+    # =======================================================
+
+
+# DERIVATIVES WITH RESPECT TO THE PARAMETERS
+# =======================================================
+def jac_par(init, t, par):
+    """
+    Derivatives of the differential equations of the model with respect to the parameters, with the same arguments
+    as eqs. They are the inhomogeneous term of the forward sensitivity equations, dS/dt = J S + jac_par
+    :param init: concentrations of the species
+    :param t: time of the integration
+    :param par: parameters passed to the model
+    :return: array of shape (18, 116), P[i, k] is the derivative of equation i with respect to parameter k
+    """
+    P = np.zeros((18, 116))
+    P[PAR_ROWS, PAR_COLS] = parameterEntries(init, t, par)
+    return P
+    # =======================================================
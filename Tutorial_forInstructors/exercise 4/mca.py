@@ -0,0 +1,151 @@
+#!/usr/bin/python
+########################################################
+# mca.py
+# Author: Veronica Llorens-Rico
+# Version: 1.0
+# Date: October 2026
+# Description: Metabolic Control Analysis of the model
+#   (elasticities, flux and concentration control
+#   coefficients) computed directly from the rate laws
+#   and the stoichiometry in equations.py, without the
+#   SBML model
+# Reference: Chassagnole et al, 2002
+# Reference: Reder, 1988
+########################################################
+from collections import namedtuple
+
+import numpy as np
+from scipy import linalg
+
+from equations import REACTIONS, SPECIES, STOICHIOMETRY, rates
+from steadyState import find_steady_state
+
+
+# steady state concentrations before the glucose pulse, used as initial guess
+GUESS = [0.169491,    # cdhap
+         0.0988719,   # ce4p
+         0.39666,     # cpg2
+         2.1185,      # cpg3
+         0.00813025,  # cpgp
+         0.398943,    # crib5p
+         0.11126,     # cribu5p
+         0.273191,    # csed7p
+         0.138348,    # cxyl5p
+         0.597874,    # cf6p
+         0.279883,    # cfdp
+         0.64958,     # cg1p
+         3.46767,     # cg6p
+         0.22137,     # cgap
+         0.0552527,   # cglex
+         2.65434,     # cpep
+         0.804284,    # cpg
+         2.66951]     # cpyr
+
+MCAResult = namedtuple('MCAResult', ['species', 'reactions', 'state', 'fluxes', 'N', 'L', 'elasticities',
+                                     'scaledElasticities', 'fcc', 'scaledFcc', 'ccc', 'scaledCcc'])
+
+
+# STOICHIOMETRY
+# =======================================================
+def stoichiometry():
+    """
+    :return: the stoichiometric matrix N (species x reactions) of equations.py, the species names (order of the state
+    vector) and the reaction names (order of the rates returned by equations.rates)
+    """
+    return STOICHIOMETRY, list(SPECIES), list(REACTIONS)
+    # =======================================================
+
+
+# LINK MATRIX
+# =======================================================
+def linkMatrix(N, tol=1e-10):
+    """
+    Splits the stoichiometric matrix into its independent rows, N = L N_R
+    :param N: stoichiometric matrix
+    :param tol: relative tolerance to decide the rank
+    :return: L, N_R and the indices of the independent species
+    """
+    _, R, pivots = linalg.qr(N.T, pivoting=True)
+    diagonal = np.abs(np.diag(R))
+    rank = int(np.sum(diagonal > tol * diagonal[0]))
+    independent = np.sort(pivots[:rank])
+    NR = N[independent]
+    L = linalg.lstsq(NR.T, N.T)[0].T
+    return L, NR, independent
+    # =======================================================
+
+
+# ELASTICITIES
+# =======================================================
+def elasticities(state, par, h=1e-30):
+    """
+    Unscaled elasticities of every reaction with respect to every species, and the reaction rates. The rate laws in
+    equations.rates are differentiated exactly with the complex step, f'(x) = Im(f(x + ih)) / h
+    :param state: steady state concentrations
+    :param par: parameters passed to the model
+    :param h: complex step
+    :return: elasticities (reactions x species) and the reaction rates
+    """
+    state = np.asarray(state, dtype=float)
+    v = rates(state, 0.0, par)
+
+    eps = np.zeros((len(v), len(state)))
+    for j in range(len(state)):
+        perturbed = state.astype(complex)
+        perturbed[j] += 1j * h
+        eps[:, j] = np.imag(rates(perturbed, 0.0, par)) / h
+
+    return eps, v
+    # =======================================================
+
+
+# CONTROL COEFFICIENTS
+# =======================================================
+def mca(par, state=None, guess=GUESS):
+    """
+    Metabolic Control Analysis at the steady state before the glucose pulse. With M = N_R eps L, the control
+    coefficients are C^S = -L M^-1 N_R (concentrations) and C^J = I + eps C^S (fluxes); the scaled versions are
+    relative changes, e.g. (dJ_i / J_i) / (dv_k / v_k)
+    :param par: parameters passed to the model
+    :param state: steady state concentrations. If not given, it is found with steadyState.find_steady_state
+    :param guess: initial guess for the steady state search
+    :return: MCAResult with the names, steady state, fluxes, N, L and the unscaled and scaled elasticities, flux
+    control coefficients (reactions x reactions) and concentration control coefficients (species x reactions)
+    """
+    N, species, reactions = stoichiometry()
+    if state is None:
+        state = find_steady_state(par, guess).state
+    state = np.asarray(state, dtype=float)
+
+    L, NR, _ = linkMatrix(N)
+    eps, v = elasticities(state, par)
+
+    M = NR.dot(eps).dot(L)
+    ccc = -L.dot(linalg.solve(M, NR))
+    fcc = np.eye(len(reactions)) + eps.dot(ccc)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaledEps = eps * state[np.newaxis, :] / v[:, np.newaxis]
+        scaledCcc = ccc * v[np.newaxis, :] / state[:, np.newaxis]
+        scaledFcc = fcc * v[np.newaxis, :] / v[:, np.newaxis]
+
+    return MCAResult(species, reactions, state, v, N, L, eps, scaledEps, fcc, scaledFcc, ccc, scaledCcc)
+    # =======================================================
+
+
+# THEOREMS OF MCA
+# =======================================================
+def checkTheorems(result):
+    """
+    Largest deviations from the summation and connectivity theorems, written on the unscaled coefficients so that
+    reactions without flux do not matter: C^J v = v, C^S v = 0, C^J eps L = 0 and C^S eps L = -L
+    :param result: MCAResult returned by mca
+    :return: dictionary with the deviation of every theorem
+    """
+    v, L, eps = result.fluxes, result.L, result.elasticities
+    scale = np.max(np.abs(v))
+    return {'fluxSummation': np.max(np.abs(result.fcc.dot(v) - v)) / scale,
+            'concentrationSummation': np.max(np.abs(result.ccc.dot(v))) / scale,
+            'fluxConnectivity': np.max(np.abs(result.fcc.dot(eps).dot(L))),
+            'concentrationConnectivity': np.max(np.abs(result.ccc.dot(eps).dot(L) + L))}
+    # =======================================================
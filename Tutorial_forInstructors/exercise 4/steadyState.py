@@ -0,0 +1,299 @@
+#!/usr/bin/python
+########################################################
+# steadyState.py
+# Author: Veronica Llorens-Rico
+# Version: 1.1
+# Date: October 2026
+# Description: Finds the steady state of the model
+#   before the glucose pulse without integrating it
+#   over time, for one parameter set or for many of
+#   them at once
+# Reference: Chassagnole et al, 2002
+########################################################
+from collections import namedtuple
+
+import numpy as np
+
+from equations import eqs, eqs_batch
+from jacobian import jac, jac_batch
+
+
+SteadyState = namedtuple('SteadyState', ['state', 'residual', 'iterations'])
+
+
+def _residual(rhs, x, t, par):
+    F = np.asarray(rhs(x, t, par), dtype=float)
+    return F, np.linalg.norm(F)
+
+
+def _acceptable(x, F):
+    # concentrations must stay positive: the rate laws have fractional powers of them, and the trial state and its
+    # rates must be finite (an overflow or a NaN gives a meaningless norm)
+    return np.all(np.isfinite(x)) and np.all(x > 0) and np.all(np.isfinite(F))
+
+
+# DAMPED NEWTON
+# =======================================================
+def newton(par, guess, t=0.0, rhs=eqs, jacobian=jac, tol=1e-10, maxIter=50):
+    """
+    Damped Newton iterations on the right hand side of the model. Every step is shortened until the residual
+    decreases and all the concentrations stay positive
+    :param par: parameters passed to the model
+    :param guess: initial guess of the steady state concentrations
+    :param t: time at which the equations are evaluated (t <= 0 is the steady state before the pulse)
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param jacobian: Jacobian of rhs, with the same arguments
+    :param tol: the iterations stop when the norm of the residual is below tol
+    :param maxIter: maximum number of iterations
+    :return: SteadyState(state, residual, iterations) and whether it converged
+    """
+    x = np.array(guess, dtype=float)
+    iterations = 0
+    # trial steps may give overflows or NaN rates: they are rejected below instead of warned about
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        F, norm = _residual(rhs, x, t, par)
+        while norm > tol and iterations < maxIter:
+            iterations += 1
+            try:
+                dx = np.linalg.solve(jacobian(x, t, par), -F)
+            except np.linalg.LinAlgError:
+                break
+            if not np.all(np.isfinite(dx)):
+                break
+            step = 1.0
+            while step > 1e-4:
+                xNew = x + step * dx
+                FNew, normNew = _residual(rhs, xNew, t, par)
+                if _acceptable(xNew, FNew) and normNew < (1 - 1e-4 * step) * norm:
+                    break
+                step /= 2.0
+            else:
+                break
+            x, F, norm = xNew, FNew, normNew
+
+    return SteadyState(x, norm, iterations), norm <= tol
+    # =======================================================
+
+
+# PSEUDO-TRANSIENT CONTINUATION
+# =======================================================
+def pseudoTransient(par, guess, t=0.0, rhs=eqs, jacobian=jac, tol=1e-10, maxIter=500, dt=1e-2):
+    """
+    Pseudo-transient continuation: implicit Euler steps of growing size, (I/dt - J) dx = F, which follow the
+    dynamics of the model far from the steady state and become Newton iterations close to it. The step grows as
+    the residual decreases (switched evolution relaxation)
+    :param par: parameters passed to the model
+    :param guess: initial guess of the steady state concentrations
+    :param t: time at which the equations are evaluated (t <= 0 is the steady state before the pulse)
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param jacobian: Jacobian of rhs, with the same arguments
+    :param tol: the iterations stop when the norm of the residual is below tol
+    :param maxIter: maximum number of iterations
+    :param dt: initial pseudo time step
+    :return: SteadyState(state, residual, iterations) and whether it converged
+    """
+    x = np.array(guess, dtype=float)
+    identity = np.eye(len(x))
+    iterations = 0
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        F, norm = _residual(rhs, x, t, par)
+        # a guess with NaN rates cannot be improved
+        while norm > tol and np.isfinite(norm) and iterations < maxIter:
+            iterations += 1
+            try:
+                dx = np.linalg.solve(identity / dt - jacobian(x, t, par), F)
+            except np.linalg.LinAlgError:
+                dt /= 10.0
+                continue
+            xNew = x + dx
+            if not np.all(np.isfinite(xNew)):
+                dt /= 10.0
+                continue
+            FNew, normNew = _residual(rhs, xNew, t, par)
+            if not _acceptable(xNew, FNew):
+                dt /= 10.0
+                continue
+            dt = min(dt * norm / max(normNew, 1e-300), 1e12)
+            x, F, norm = xNew, FNew, normNew
+
+    return SteadyState(x, norm, iterations), norm <= tol
+    # =======================================================
+
+
+# STEADY STATE
+# =======================================================
+def find_steady_state(par, guess, t=0.0, rhs=eqs, jacobian=jac, tol=1e-10, maxIter=50, ptcMaxIter=500):
+    """
+    Finds the steady state of the model with damped Newton iterations from the guess, falling back to
+    pseudo-transient continuation when Newton does not converge
+    :param par: parameters passed to the model
+    :param guess: initial guess of the steady state concentrations
+    :param t: time at which the equations are evaluated (t <= 0 is the steady state before the pulse)
+    :param rhs: right hand side of the model, with the arguments of eqs
+    :param jacobian: Jacobian of rhs, with the same arguments
+    :param tol: tolerance on the norm of the residual
+    :param maxIter: maximum number of Newton iterations
+    :param ptcMaxIter: maximum number of pseudo-transient continuation iterations
+    :return: SteadyState(state, residual, iterations): the concentrations, the norm of the right hand side there
+    and the total number of iterations. If neither method converges, the residual is above tol and the state is the
+    best one found
+    """
+    result, converged = newton(par, guess, t, rhs, jacobian, tol, maxIter)
+    if converged:
+        return result
+
+    fallback, converged = pseudoTransient(par, guess, t, rhs, jacobian, tol, ptcMaxIter)
+    best = fallback if converged or fallback.residual < result.residual else result
+    return SteadyState(best.state, best.residual, result.iterations + fallback.iterations)
+    # =======================================================
+
+
+# MANY PARAMETER SETS
+# =======================================================
+def newton_batch(par, guess, t=0.0, rhs=eqs_batch, jacobian=jac_batch, tol=1e-10, maxIter=50):
+    """
+    Damped Newton iterations as in newton, for N parameter sets at once: every iteration makes one call of rhs and
+    of jacobian for all the sets that have not converged yet and solves the stacked linear systems together. The
+    steps of every set are shortened separately
+    :param par: parameters, array of shape (N, 116)
+    :param guess: initial guess, a single state shared by all the sets or an array of shape (N, 18)
+    :param t: time at which the equations are evaluated (t <= 0 is the steady state before the pulse)
+    :param rhs: batched right hand side, with the arguments of equations.eqs_batch
+    :param jacobian: batched Jacobian of rhs, with the same arguments, returning an array of shape (N, 18, 18)
+    :param tol: the iterations of a set stop when the norm of its residual is below tol
+    :param maxIter: maximum number of iterations
+    :return: SteadyState(state, residual, iterations) with one row (or entry) per set, and a boolean array telling
+    which sets converged
+    """
+    par = np.atleast_2d(np.asarray(par, dtype=float))
+    X = np.array(np.broadcast_to(np.asarray(guess, dtype=float), (len(par), np.shape(guess)[-1])))
+    iterations = np.zeros(len(par), dtype=int)
+    stopped = np.zeros(len(par), dtype=bool)
+
+    # trial steps that leave the positive concentrations are never evaluated, but the guess may give NaN rates
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        F = np.asarray(rhs(X, t, par), dtype=float)
+        norm = np.linalg.norm(F, axis=1)
+        stopped |= ~np.isfinite(norm)
+        for _ in range(maxIter):
+            active = np.where((norm > tol) & ~stopped)[0]
+            if not len(active):
+                break
+            iterations[active] += 1
+            J = jacobian(X[active], t, par[active])
+            try:
+                dX = np.linalg.solve(J, -F[active][:, :, np.newaxis])[:, :, 0]
+            except np.linalg.LinAlgError:
+                # a singular matrix somewhere in the block: solve the sets one by one
+                dX = np.full(F[active].shape, np.nan)
+                for k in range(len(active)):
+                    try:
+                        dX[k] = np.linalg.solve(J[k], -F[active[k]])
+                    except np.linalg.LinAlgError:
+                        pass
+
+            step = np.ones(len(active))
+            pending = np.isfinite(dX).all(axis=1)
+            stopped[active[~pending]] = True
+            while np.any(pending):
+                local = np.where(pending)[0]
+                members = active[local]
+                XNew = X[members] + step[local, np.newaxis] * dX[local]
+                positive = np.all(XNew > 0, axis=1)
+                normNew = np.full(len(local), np.inf)
+                FNew = np.full(XNew.shape, np.nan)
+                if np.any(positive):
+                    FNew[positive] = rhs(XNew[positive], t, par[members[positive]])
+                    normNew[positive] = np.linalg.norm(FNew[positive], axis=1)
+                ok = np.isfinite(normNew) & (normNew < (1 - 1e-4 * step[local]) * norm[members])
+                X[members[ok]], F[members[ok]], norm[members[ok]] = XNew[ok], FNew[ok], normNew[ok]
+                pending[local[ok]] = False
+                step[local[~ok]] /= 2.0
+                exhausted = local[~ok][step[local[~ok]] <= 1e-4]
+                stopped[active[exhausted]] = True
+                pending[exhausted] = False
+
+    return SteadyState(X, norm, iterations), norm <= tol
+    # =======================================================
+
+
+def pseudoTransient_batch(par, guess, t=0.0, rhs=eqs_batch, jacobian=jac_batch, tol=1e-10, maxIter=500, dt=1e-2):
+    """
+    Pseudo-transient continuation as in pseudoTransient, for N parameter sets at once, every one with its own pseudo
+    time step
+    :param par: parameters, array of shape (N, 116)
+    :param guess: initial guess, a single state shared by all the sets or an array of shape (N, 18)
+    :param t: time at which the equations are evaluated (t <= 0 is the steady state before the pulse)
+    :param rhs: batched right hand side, with the arguments of equations.eqs_batch
+    :param jacobian: batched Jacobian of rhs, with the same arguments, returning an array of shape (N, 18, 18)
+    :param tol: the iterations of a set stop when the norm of its residual is below tol
+    :param maxIter: maximum number of iterations
+    :param dt: initial pseudo time step
+    :return: SteadyState(state, residual, iterations) with one row (or entry) per set, and a boolean array telling
+    which sets converged
+    """
+    par = np.atleast_2d(np.asarray(par, dtype=float))
+    X = np.array(np.broadcast_to(np.asarray(guess, dtype=float), (len(par), np.shape(guess)[-1])))
+    identity = np.eye(X.shape[1])
+    dt = np.full(len(par), float(dt))
+    iterations = np.zeros(len(par), dtype=int)
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        F = np.asarray(rhs(X, t, par), dtype=float)
+        norm = np.linalg.norm(F, axis=1)
+        for _ in range(maxIter):
+            # sets whose step became hopelessly small are given up
+            active = np.where((norm > tol) & np.isfinite(norm) & (dt > 1e-300))[0]
+            if not len(active):
+                break
+            iterations[active] += 1
+            W = identity / dt[active, np.newaxis, np.newaxis] - jacobian(X[active], t, par[active])
+            try:
+                dX = np.linalg.solve(W, F[active][:, :, np.newaxis])[:, :, 0]
+            except np.linalg.LinAlgError:
+                dX = np.full(F[active].shape, np.nan)
+                for k in range(len(active)):
+                    try:
+                        dX[k] = np.linalg.solve(W[k], F[active[k]])
+                    except np.linalg.LinAlgError:
+                        pass
+            XNew = X[active] + dX
+            ok = np.all(XNew > 0, axis=1)
+            FNew = np.full(XNew.shape, np.nan)
+            if np.any(ok):
+                FNew[ok] = rhs(XNew[ok], t, par[active[ok]])
+            normNew = np.linalg.norm(FNew, axis=1)
+            ok &= np.isfinite(normNew)
+            members = active[ok]
+            dt[members] = np.minimum(dt[members] * norm[members] / np.maximum(normNew[ok], 1e-300), 1e12)
+            dt[active[~ok]] /= 10.0
+            X[members], F[members], norm[members] = XNew[ok], FNew[ok], normNew[ok]
+
+    return SteadyState(X, norm, iterations), norm <= tol
+    # =======================================================
+
+
+def find_steady_states(par, guess, t=0.0, tol=1e-10, maxIter=50, ptcMaxIter=500):
+    """
+    Steady states of the model for many parameter sets: damped Newton iterations on all of them at once
+    (newton_batch), and pseudo-transient continuation (pseudoTransient_batch) on those that do not converge
+    :param par: parameters, array of shape (N, 116)
+    :param guess: initial guess, a single state shared by all the sets or an array of shape (N, 18)
+    :param t: time at which the equations are evaluated (t <= 0 is the steady state before the pulse)
+    :param tol: tolerance on the norm of the residual
+    :param maxIter: maximum number of Newton iterations
+    :param ptcMaxIter: maximum number of pseudo-transient continuation iterations
+    :return: SteadyState(state, residual, iterations) with one row (or entry) per set, as in find_steady_state
+    """
+    par = np.atleast_2d(np.asarray(par, dtype=float))
+    result, converged = newton_batch(par, guess, t, tol=tol, maxIter=maxIter)
+    failed = np.where(~converged)[0]
+    if len(failed):
+        guesses = np.broadcast_to(np.asarray(guess, dtype=float), result.state.shape)[failed]
+        fallback, _ = pseudoTransient_batch(par[failed], guesses, t, tol=tol, maxIter=ptcMaxIter)
+        result.iterations[failed] += fallback.iterations
+        better = (fallback.residual < result.residual[failed]) | ~np.isfinite(result.residual[failed])
+        result.state[failed[better]] = fallback.state[better]
+        result.residual[failed[better]] = fallback.residual[better]
+    return result
+    # =======================================================